@@ -0,0 +1,310 @@
+import atexit
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from job_store import extract_job_id
+from log_writer import CLOSE_TIMEOUT
+
+# Sort keys of query(), with the SQL expression each one orders by
+SORTS = {
+    "timestamp": "timestamp",
+    "company": "company",
+    "status": "status",
+    "job_title": "job_title",
+    "time_taken": "COALESCE(time_taken_sec, -1)",
+}
+
+JOB_COLUMNS = ("timestamp", "job_id", "job_title", "company", "location", "job_link", "status", "reason",
+               "time_taken_sec", "pacing_profile", "error", "screenshot")
+QUESTION_COLUMNS = ("timestamp", "question_type", "question_text", "context", "job_title", "company", "job_link")
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    The [sort value, id] pair of a cursor made by encode_cursor.
+
+    Raises:
+        ValueError for anything else
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if (not isinstance(values, list) or len(values) != 2 or isinstance(values[1], bool)
+            or not isinstance(values[1], int) or not isinstance(values[0], (str, int, float, type(None)))):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+
+class ActivityStore:
+    """
+    Indexed store of the bot's job events, unprepared questions and runs.
+
+    SQLite in WAL mode, so the web app reads while the bot writes. Job events are indexed on
+    timestamp, status, company and job ID, and query() filters, sorts and pages them in SQL with
+    keyset pagination (a cursor holding the last row's sort value and id), so a page costs the
+    same however many entries there are. Each event keeps its full log entry as JSON for the
+    details view. The activity log (JSONL) still receives every entry, other events included
+    (spans have a log of their own); the first time the store is opened, the job events and
+    questions already in it are imported.
+
+    add_job_event() and add_question() only queue the entry: a background thread, started on the
+    first of them, inserts the entries in batches and commits each batch, once batch_size entries
+    are waiting or flush_interval seconds after the first of them. close() writes out what is
+    queued; it is also registered with atexit.
+    """
+
+    def __init__(self, db_path=os.path.join("logs", "activity.db"), legacy_log_path=None, batch_size=100,
+                 flush_interval=1.0):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "id INTEGER PRIMARY KEY, started_at TEXT NOT NULL, ended_at TEXT, pid INTEGER, metadata TEXT, summary TEXT);"
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "id INTEGER PRIMARY KEY, run_id INTEGER, timestamp TEXT NOT NULL DEFAULT '', job_id TEXT, "
+            "job_title TEXT NOT NULL DEFAULT '', company TEXT NOT NULL DEFAULT '', location TEXT, job_link TEXT, "
+            "status TEXT NOT NULL DEFAULT '', reason TEXT, time_taken_sec REAL, pacing_profile TEXT, error TEXT, "
+            "screenshot TEXT, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_job_events_timestamp ON job_events (timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_job_events_status ON job_events (status, timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_job_events_company ON job_events (company, timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_job_events_job_id ON job_events (job_id);"
+            "CREATE TABLE IF NOT EXISTS unprepared_questions ("
+            "id INTEGER PRIMARY KEY, run_id INTEGER, timestamp TEXT NOT NULL DEFAULT '', question_type TEXT, "
+            "question_text TEXT, context TEXT, job_title TEXT, company TEXT, job_link TEXT);"
+            "CREATE INDEX IF NOT EXISTS idx_unprepared_questions_timestamp ON unprepared_questions (timestamp);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self._conn.commit()
+        self.run_id = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._writer = None
+        self._closed = threading.Event()
+        if legacy_log_path:
+            self._import_log(legacy_log_path)
+
+    def _import_log(self, path):
+        """Import the job events and questions of an existing activity log, once per store."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM meta WHERE key = 'log_imported'").fetchone() is None:
+                    imported = 0
+                    if os.path.exists(path):
+                        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                            for line in f:
+                                try:
+                                    entry = json.loads(line)
+                                except ValueError:
+                                    continue
+                                if entry.get("event"):
+                                    continue
+                                if entry.get("status"):
+                                    self._insert_job(entry)
+                                    imported += 1
+                                elif entry.get("question_text"):
+                                    self._insert_question(entry)
+                                    imported += 1
+                    self._conn.execute("INSERT INTO meta (key, value) VALUES ('log_imported', ?)",
+                                       (f"{imported} entries from {path} at {datetime.utcnow().isoformat()}",))
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def start_run(self, metadata=None):
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at, pid, metadata) VALUES (?, ?, ?)",
+                (datetime.utcnow().isoformat(), os.getpid(), json.dumps(metadata or {}, ensure_ascii=False)))
+            self._conn.commit()
+            self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def end_run(self, summary=None):
+        if self.run_id is None:
+            return
+        with self._lock:
+            self._conn.execute("UPDATE runs SET ended_at = ?, summary = ? WHERE id = ?",
+                               (datetime.utcnow().isoformat(), json.dumps(summary or {}, ensure_ascii=False), self.run_id))
+            self._conn.commit()
+
+    def _insert_job(self, entry, run_id=None):
+        values = dict(entry, job_id=entry.get("job_id") or extract_job_id(entry.get("job_link")))
+        row = [values.get(column) for column in JOB_COLUMNS]
+        for i, column in enumerate(JOB_COLUMNS):
+            if column in ("timestamp", "job_title", "company", "status") and row[i] is None:
+                row[i] = ""
+        self._conn.execute(
+            f"INSERT INTO job_events (run_id, {', '.join(JOB_COLUMNS)}, data) VALUES ({', '.join('?' * (len(JOB_COLUMNS) + 2))})",
+            [run_id] + row + [json.dumps(entry, ensure_ascii=False)])
+
+    def _insert_question(self, entry, run_id=None):
+        self._conn.execute(
+            f"INSERT INTO unprepared_questions (run_id, {', '.join(QUESTION_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(QUESTION_COLUMNS) + 1))})",
+            [run_id] + [entry.get(column) for column in QUESTION_COLUMNS])
+
+    def add_job_event(self, entry):
+        self._enqueue(self._insert_job, entry)
+
+    def add_question(self, entry):
+        self._enqueue(self._insert_question, entry)
+
+    def _enqueue(self, insert, entry):
+        if self._closed.is_set():
+            self._write_batch([(insert, entry, self.run_id)])
+            return
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run, name="activity-store-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.close)
+        self._queue.put((insert, entry, self.run_id))
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                if self._closed.is_set():
+                    break
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._closed.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+                except queue.Empty:
+                    continue
+            self._write_batch(batch)
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        with self._lock:
+            try:
+                for insert, entry, run_id in batch:
+                    try:
+                        insert(entry, run_id)
+                    except sqlite3.IntegrityError as e:
+                        print(f"Could not store {entry!r}: {e}")  # Only this entry, the batch goes on
+                self._conn.commit()
+            except Exception as e:
+                try:
+                    self._conn.rollback()
+                except sqlite3.Error:
+                    pass
+                print(f"Error writing to the activity store: {e}")
+
+    def _filters(self, status=None, company=None, job_id=None, search=None, since=None, until=None):
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if company:
+            clauses.append("company = ?")
+            params.append(company)
+        if job_id:
+            clauses.append("job_id = ?")
+            params.append(str(job_id))
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if search:
+            clauses.append("(job_title LIKE ? OR company LIKE ? OR status LIKE ? OR reason LIKE ? OR error LIKE ?)")
+            params.extend([f"%{search}%"] * 5)
+        return clauses, params
+
+    def query(self, status=None, company=None, job_id=None, search=None, since=None, until=None,
+              sort="timestamp", order="desc", limit=100, cursor=None):
+        """
+        Return a page of job events, newest first by default.
+
+        Args:
+            status, company, job_id: Exact matches
+            search: Substring of the title, company, status, reason or error
+            since, until: ISO timestamps, since included and until excluded
+            sort: A key of SORTS
+            order: "asc" or "desc"
+            cursor: next_cursor of the previous page
+
+        Returns:
+            {"entries": [...], "next_cursor": str or None, "counts": {status: count}}, counts
+            covering every filter but status
+
+        Raises:
+            ValueError for an unknown sort or order or an invalid cursor
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        expression = SORTS[sort]
+        clauses, params = self._filters(status, company, job_id, search, since, until)
+        page_clauses, page_params = list(clauses), list(params)
+        if cursor:
+            value, last_id = decode_cursor(cursor)
+            comparison = "<" if order == "desc" else ">"
+            page_clauses.append(f"({expression} {comparison} ? OR ({expression} = ? AND id {comparison} ?))")
+            page_params.extend([value, value, last_id])
+        where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+        direction = order.upper()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {expression} AS sort_value, data FROM job_events {where} "
+                f"ORDER BY {expression} {direction}, id {direction} LIMIT ?",
+                page_params + [limit + 1]).fetchall()
+            count_clauses, count_params = self._filters(None, company, job_id, search, since, until)
+            count_where = f"WHERE {' AND '.join(count_clauses)}" if count_clauses else ""
+            counts = dict(self._conn.execute(
+                f"SELECT status, COUNT(*) FROM job_events {count_where} GROUP BY status", count_params).fetchall())
+        entries = []
+        for row in rows[:limit]:
+            entry = json.loads(row["data"])
+            entry["id"] = row["id"]
+            entries.append(entry)
+        next_cursor = encode_cursor([rows[limit - 1]["sort_value"], rows[limit - 1]["id"]]) if len(rows) > limit else None
+        return {"entries": entries, "next_cursor": next_cursor, "counts": counts}
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Write out the queued entries and close the database. Safe to call more than once."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._writer is not None:
+            self._writer.join(timeout)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from question_rules import normalize_question
+
+
+def profile_fingerprint(*parts):
+    """Hash of everything the AI answers depend on besides the question (profile, resume text)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Persistent cache of AI-generated answers.
+
+    Entries are keyed by the normalised question text, the response type, the sorted option set
+    and a fingerprint of the candidate profile, so changing the resume or the config invalidates
+    them. The cache is kept in SQLite (WAL mode) and mirrored in an in-memory LRU; entries expire
+    after ttl_seconds and the least recently used ones are evicted beyond max_entries.
+    Concurrent lookups of the same key are coalesced so only one of them calls the API.
+    """
+
+    def __init__(self, db_path=os.path.join("logs", "answer_cache.db"), max_entries=5000, ttl_seconds=30 * 24 * 3600):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, "
+            "question TEXT NOT NULL, "
+            "response_type TEXT NOT NULL, "
+            "answer TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_used REAL NOT NULL, "
+            "hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+        self._entries = OrderedDict()
+        for key, answer, created_at in self._conn.execute(
+                "SELECT key, answer, created_at FROM answers ORDER BY last_used"):
+            self._entries[key] = (json.loads(answer), created_at)
+        self._evict()
+
+    @staticmethod
+    def make_key(question_text, response_type, options, fingerprint):
+        option_texts = sorted(normalize_question(str(text)) for _, text in options) if options else []
+        raw = json.dumps([normalize_question(question_text), response_type, option_texts, fingerprint], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            answer = self._get_locked(key)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return answer
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        answer, created_at = entry
+        now = time.time()
+        if now - created_at > self.ttl_seconds:
+            del self._entries[key]
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._entries.move_to_end(key)
+        self._conn.execute("UPDATE answers SET hits = hits + 1, last_used = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return answer
+
+    def put(self, key, question_text, response_type, answer):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (answer, now)
+            self._entries.move_to_end(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, question, response_type, answer, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, question_text, response_type, json.dumps(answer, ensure_ascii=False), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+
+    def get_or_compute(self, key, question_text, response_type, compute):
+        """
+        Return the cached answer for key, or call compute() once to produce it.
+
+        If another thread is already computing the same key, wait for its result instead of
+        making a second API call. None results are returned but not cached.
+        """
+        with self._lock:
+            answer = self._get_locked(key)
+            if answer is not None:
+                self.hits += 1
+                return answer
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = {"event": threading.Event(), "answer": None}
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            pending["event"].wait()
+            with self._lock:
+                self.hits += 1
+            return pending["answer"]
+
+        try:
+            answer = compute()
+            if answer is not None:
+                self.put(key, question_text, response_type, answer)
+            pending["answer"] = answer
+            return answer
+        finally:
+            with self._lock:
+                self.misses += 1
+                del self._inflight[key]
+            pending["event"].set()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "entries": len(self._entries),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
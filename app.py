@@ -8,11 +8,16 @@ import logging
 import uvicorn
 from pathlib import Path
 from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from metrics import MetricsAggregator
+from activity_store import ActivityStore
+from log_tail import read_since, tail
+from event_stream import EventHub, format_sse
+from log_writer import CLOSE_TIMEOUT
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -41,9 +46,17 @@ bot_status = "stopped"
 bot_output = []
 config_path = "config.yaml"
 logs_dir = Path("logs")
+# Seconds a stopped bot gets to shut down before it is killed: both log closes plus the browsers
+STOP_GRACE_SECONDS = 2 * CLOSE_TIMEOUT + 10
 
 # Create logs directory if it doesn't exist
 logs_dir.mkdir(exist_ok=True)
+metrics_aggregator = MetricsAggregator(logs_dir / "activity.log.jsonl", logs_dir / "spans.log.jsonl")
+activity_store = ActivityStore(logs_dir / "activity.db", legacy_log_path=logs_dir / "activity.log.jsonl")
+# Live stream of activity entries, bot output lines and status transitions, see /api/stream
+event_hub = EventHub()
+activity_follower = None
+activity_follower_lock = threading.Lock()
 
 class ConfigUpdate(BaseModel):
     config_yaml: str
@@ -65,6 +78,21 @@ def save_config(config_data):
         logger.error(f"Error saving config: {str(e)}")
         return False
 
+def set_bot_status(status, running=None):
+    """Change the bot status and publish the transition to the live stream."""
+    global bot_running, bot_status
+    bot_status = status
+    if running is not None:
+        bot_running = running
+    event_hub.publish("status", {"running": bot_running, "status": bot_status})
+
+def add_bot_output(line):
+    global bot_output
+    bot_output.append(line)
+    if len(bot_output) > 1000:  # Limit output buffer
+        bot_output = bot_output[-1000:]
+    event_hub.publish("output", {"line": line})
+
 def start_bot_process(background_tasks: BackgroundTasks):
     global bot_process, bot_running, bot_status, bot_output
     
@@ -72,8 +100,7 @@ def start_bot_process(background_tasks: BackgroundTasks):
         return {"status": "already_running", "message": "Bot is already running"}
     
     bot_output = []
-    bot_running = True
-    bot_status = "starting"
+    set_bot_status("starting", running=True)
     
     # Start the bot in a separate thread to not block the API
     background_tasks.add_task(run_bot)
@@ -98,24 +125,20 @@ def run_bot():
             env=env
         )
         
-        bot_status = "running"
+        set_bot_status("running")
         
         # Read output in real-time
         for line in bot_process.stdout:
-            bot_output.append(line.strip())
-            if len(bot_output) > 1000:  # Limit output buffer
-                bot_output = bot_output[-1000:]
+            add_bot_output(line.strip())
         
         # Process has finished
         exit_code = bot_process.wait()
-        bot_running = False
-        bot_status = f"stopped (exit code: {exit_code})"
+        set_bot_status(f"stopped (exit code: {exit_code})", running=False)
         
     except Exception as e:
         logger.error(f"Error running bot: {str(e)}")
-        bot_running = False
-        bot_status = f"error: {str(e)}"
-        bot_output.append(f"ERROR: {str(e)}")
+        set_bot_status(f"error: {str(e)}", running=False)
+        add_bot_output(f"ERROR: {str(e)}")
 
 def stop_bot():
     global bot_process, bot_running, bot_status
@@ -125,9 +148,10 @@ def stop_bot():
     
     try:
         bot_process.terminate()
-        # Give it 5 seconds to terminate gracefully
+        # Give it time to terminate gracefully: quit the browsers, save the cookies and close the
+        # log writer and the activity store, each of which may wait CLOSE_TIMEOUT seconds
         time_waited = 0
-        while bot_process.poll() is None and time_waited < 5:
+        while bot_process.poll() is None and time_waited < STOP_GRACE_SECONDS:
             time.sleep(0.5)
             time_waited += 0.5
             
@@ -135,32 +159,57 @@ def stop_bot():
         if bot_process.poll() is None:
             bot_process.kill()
             
-        bot_running = False
-        bot_status = "stopped (terminated)"
+        set_bot_status("stopped (terminated)", running=False)
         return {"status": "stopped", "message": "Bot has been stopped"}
     
     except Exception as e:
         logger.error(f"Error stopping bot: {str(e)}")
         return {"status": "error", "message": f"Error stopping bot: {str(e)}"}
 
-def read_logs(max_entries=1000):
+def read_logs(max_entries=1000, since=None):
+    """
+    The newest max_entries of the activity log, or with since (a previous cursor) only those
+    appended after it, read from the end of the file rather than the start.
+    """
+    log_file = logs_dir / "activity.log.jsonl"
     try:
-        log_file = logs_dir / "activity.log.jsonl"
+        if since is not None:
+            return read_since(log_file, since, max_entries)
         if not log_file.exists():
-            return []
-        logs = []
-        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                try:
-                    logs.append(json.loads(line.strip()))
-                    if len(logs) >= max_entries:
-                        break
-                except Exception:
-                    pass
-        return logs
+            return {"entries": [], "cursor": 0, "reset": False}
+        entries, cursor = tail(log_file, max_entries)
+        return {"entries": entries, "cursor": cursor, "reset": False}
     except Exception as e:
         logger.error(f"Error reading logs: {str(e)}")
-        return []
+        return {"entries": [], "cursor": since or 0, "reset": False}
+
+def follow_activity_log(interval=0.5):
+    """Publish the entries appended to the activity log to the live stream."""
+    log_file = logs_dir / "activity.log.jsonl"
+    cursor = tail(log_file, 0)[1] if log_file.exists() else 0
+    while True:
+        time.sleep(interval)
+        try:
+            result = read_since(log_file, cursor)
+            cursor = result["cursor"]
+            for entry in result["entries"]:
+                event_hub.publish("activity", entry)
+        except Exception as e:
+            logger.error(f"Error following activity log: {str(e)}")
+
+def start_activity_follower():
+    global activity_follower
+    with activity_follower_lock:
+        if activity_follower is None:
+            activity_follower = threading.Thread(target=follow_activity_log, name="activity-follower", daemon=True)
+            activity_follower.start()
+
+def status_snapshot():
+    return {
+        "running": bot_running,
+        "status": bot_status,
+        "output": bot_output[-100:] if bot_output else []  # Return last 100 lines
+    }
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -171,11 +220,7 @@ async def index(request: Request):
 
 @app.get("/api/status")
 async def get_status():
-    return {
-        "running": bot_running,
-        "status": bot_status,
-        "output": bot_output[-100:] if bot_output else []  # Return last 100 lines
-    }
+    return status_snapshot()
 
 @app.post("/api/start")
 async def start_bot_api(background_tasks: BackgroundTasks):
@@ -208,8 +253,66 @@ async def update_config(config_update: ConfigUpdate):
         raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
 
 @app.get("/api/logs")
-async def get_logs(limit: int = 1000):
-    return read_logs(limit)
+def get_logs(status: str = None, company: str = None, job_id: str = None, q: str = None, since: str = None,
+             until: str = None, sort: str = "timestamp", order: str = "desc", limit: int = 100, cursor: str = None):
+    """
+    A page of job events from the activity store, filtered and sorted in SQL.
+
+    Pass the returned next_cursor as cursor to get the following page; counts gives the number of
+    events per status matching every filter but status.
+    """
+    try:
+        return activity_store.query(status=status, company=company, job_id=job_id, search=q, since=since, until=until,
+                                    sort=sort, order=order, limit=max(1, min(limit, 1000)), cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/activity")
+def get_activity(limit: int = 1000, since: int = None):
+    """
+    The raw activity log, events included: the newest limit entries, or those
+    appended after since, the cursor of the previous response.
+    """
+    return read_logs(max(0, min(limit, 10000)), since)
+
+@app.get("/api/stream")
+async def stream_events(request: Request, last_event_id: int = None):
+    """
+    Server-sent events: "activity" (an activity log entry), "output" (a line of bot output) and
+    "status" (a status transition), each with its sequence number as id.
+
+    A client reconnecting with Last-Event-ID (sent by EventSource itself, or last_event_id) gets
+    the events it missed. A new client, or one whose events are no longer all kept, first gets a
+    "snapshot" with the bot status and recent output, after which it should reload the logs.
+    """
+    start_activity_follower()
+    if last_event_id is None:
+        header = request.headers.get("last-event-id", "")
+        last_event_id = int(header) if header.isdigit() else None
+
+    async def events():
+        after = last_event_id
+        if after is None or not event_hub.since(after)[1]:
+            after = event_hub.seq
+            yield format_sse(after, "snapshot", status_snapshot())
+        async for seq, event, data in event_hub.follow(after):
+            if seq is None:
+                yield ": keepalive\n\n"
+            elif event == "reset":
+                yield format_sse(seq, "snapshot", status_snapshot())
+            else:
+                yield format_sse(seq, event, data)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/log-viewer", response_class=HTMLResponse)
+async def log_viewer():
+    return FileResponse("log_viewer.html")
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics_aggregator.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,235 @@
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+
+def find_free_port(exclude=()):
+    """Return a local TCP port nothing is listening on, other than the ports in exclude."""
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        if port not in exclude:
+            return port
+
+
+class BrowserSession:
+    """A launched browser together with its debugging port, profile directory and the jobs it ran."""
+
+    def __init__(self, driver, port, user_data_dir):
+        self.driver = driver
+        self.port = port
+        self.user_data_dir = user_data_dir
+        self.jobs = 0
+        self.created_at = time.monotonic()
+
+    def rss_mb(self):
+        """
+        Resident memory of the driver and all the browser processes it started, in MB.
+
+        Returns None when psutil is not installed or the processes cannot be inspected.
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return None
+        rss = 0
+        for child in processes:
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / (1024 * 1024)
+
+    def healthy(self):
+        try:
+            if self.driver.service.process.poll() is not None:
+                return False
+        except AttributeError:
+            pass
+        try:
+            self.driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Could not quit the browser on port {self.port}: {e}")
+
+
+class BrowserPool:
+    """
+    Warm browser sessions handed to bot runs.
+
+    Sessions are launched ahead of time in background threads, each with its own remote debugging
+    port and a fresh user-data-dir under profile_root, so several bots and their spares never
+    collide, whichever process they run in. A session's profile is deleted when it is retired; the
+    login comes from the cookies file, not from the profile. acquire() hands over an idle session
+    after a health check, without waiting for a cold browser start, and launches a replacement so
+    that `warm` sessions stay ready. A session is recycled, i.e. quit and replaced, once it has run
+    max_jobs applications or its processes use more than max_rss_mb of memory.
+
+    Args:
+        launcher: Called as launcher(debugging_port=..., user_data_dir=...) to start a WebDriver
+    """
+
+    def __init__(self, launcher, warm=1, max_jobs=100, max_rss_mb=2048, profile_root="chrome_pool"):
+        self.launcher = launcher
+        self.warm = warm
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.profile_root = profile_root
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._launching = 0
+        self._ports = set()
+        self._closed = False
+
+    def start(self):
+        """Launch the warm sessions in the background and return the pool."""
+        self._top_up()
+        return self
+
+    def _top_up(self):
+        with self._lock:
+            if self._closed:
+                return
+            missing = max(self.warm - self._idle.qsize() - self._launching, 0)
+            self._launching += missing
+        for _ in range(missing):
+            threading.Thread(target=self._launch_warm, name="browser-pool-launch", daemon=True).start()
+
+    def _launch_warm(self):
+        session = None
+        try:
+            session = self._launch()
+        except Exception as e:
+            print(f"Could not launch a browser for the pool: {e}")
+        finally:
+            with self._lock:
+                self._launching -= 1
+                closed = self._closed
+        if session is not None:
+            if closed:
+                self._retire(session)
+            else:
+                self._idle.put(session)
+
+    def _launch(self):
+        with self._lock:
+            port = find_free_port(exclude=self._ports)
+            self._ports.add(port)
+        user_data_dir = None
+        try:
+            os.makedirs(self.profile_root, exist_ok=True)
+            # Unique across processes: Chrome refuses a profile another Chrome is using
+            user_data_dir = tempfile.mkdtemp(prefix="session-", dir=self.profile_root)
+            driver = self.launcher(debugging_port=port, user_data_dir=os.path.abspath(user_data_dir))
+        except Exception:
+            self._release_resources(port, user_data_dir)
+            raise
+        print(f"Launched a browser on port {port} with profile {user_data_dir}")
+        return BrowserSession(driver, port, user_data_dir)
+
+    def _release_resources(self, port, user_data_dir):
+        with self._lock:
+            self._ports.discard(port)
+        if user_data_dir is not None:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    def _retire(self, session):
+        session.quit()
+        self._release_resources(session.port, session.user_data_dir)
+
+    def acquire(self, timeout=120):
+        """
+        Return a healthy session, launching one on the spot only if none is idle or on its way.
+
+        Raises:
+            TimeoutError if the sessions being launched are not ready within timeout seconds
+        """
+        started = time.monotonic()
+        while True:
+            try:
+                session = self._idle.get(timeout=0.1)
+            except queue.Empty:
+                with self._lock:
+                    launching = self._launching
+                if launching == 0:
+                    session = self._launch()
+                elif time.monotonic() - started > timeout:
+                    raise TimeoutError(f"No browser session became available within {timeout} s")
+                else:
+                    continue
+            if session.healthy():
+                break
+            print(f"Discarding the unresponsive browser on port {session.port}")
+            self._retire(session)
+        self._top_up()
+        print(f"Browser on port {session.port} handed over in {(time.monotonic() - started) * 1000:.0f} ms")
+        return session
+
+    def recycle_reason(self, session):
+        """Why session should be recycled, or None if it can keep running."""
+        if session.jobs >= self.max_jobs:
+            return f"ran {session.jobs} jobs"
+        rss_mb = session.rss_mb()
+        if rss_mb is not None and rss_mb > self.max_rss_mb:
+            return f"uses {rss_mb:.0f} MB"
+        if not session.healthy():
+            return "stopped responding"
+        return None
+
+    def recycle(self, session):
+        """Return session if it can keep running, otherwise a fresh session replacing it."""
+        reason = self.recycle_reason(session)
+        if reason is None:
+            return session
+        return self.replace(session, reason)
+
+    def replace(self, session, reason):
+        """
+        Quit session and return a fresh one in its place.
+
+        The replacement is acquired before session is quit, so a failed launch leaves the bot
+        with the browser it had.
+        """
+        print(f"Recycling the browser on port {session.port}: it {reason}")
+        try:
+            replacement = self.acquire()
+        except Exception as e:
+            print(f"Could not replace the browser, keeping it: {e}")
+            return session
+        self._retire(session)
+        return replacement
+
+    def release(self, session):
+        """Give a session back at the end of a run; it is kept warm unless it is due for recycling."""
+        with self._lock:
+            closed = self._closed
+        if closed or self.recycle_reason(session) is not None:
+            self._retire(session)
+        else:
+            self._idle.put(session)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(session)
@@ -0,0 +1,78 @@
+import json
+import os
+import time
+
+LINKEDIN_URLS = ["https://www.linkedin.com/", "https://linkedin.com/"]
+SESSION_COOKIE = "li_at"
+
+# Cookie-Editor's sameSite values and the Chrome DevTools Protocol ones
+SAME_SITE_TO_CDP = {"no_restriction": "None", "lax": "Lax", "strict": "Strict"}
+SAME_SITE_FROM_CDP = {value: key for key, value in SAME_SITE_TO_CDP.items()}
+
+
+def read_cookie_file(path):
+    """Return the cookies of a JSON export (Cookie-Editor or similar), or None if there is no such file."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_cookie_file(path, cookies):
+    """Write cookies in the export format; the file is replaced atomically."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cookies, f, indent=4)
+    os.replace(temp_path, path)
+
+
+def to_cdp(cookie):
+    """Convert an exported cookie to a Network.setCookies CookieParam."""
+    param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+    if cookie.get("expirationDate") and not cookie.get("session"):
+        param["expires"] = float(cookie["expirationDate"])
+    same_site = SAME_SITE_TO_CDP.get(str(cookie.get("sameSite")).lower())
+    if same_site:
+        param["sameSite"] = same_site
+    return param
+
+
+def to_export(cookie):
+    """Convert a cookie read from the browser (Network.getCookies or get_cookies) to the export format."""
+    expires = cookie.get("expires", cookie.get("expiry", -1))
+    session = cookie.get("session", expires <= 0)
+    exported = {
+        "domain": cookie["domain"],
+        "hostOnly": not cookie["domain"].startswith("."),
+        "httpOnly": cookie.get("httpOnly", False),
+        "name": cookie["name"],
+        "path": cookie.get("path", "/"),
+        "sameSite": SAME_SITE_FROM_CDP.get(cookie.get("sameSite")),
+        "secure": cookie.get("secure", False),
+        "session": session,
+        "storeId": None,
+        "value": cookie["value"],
+    }
+    if not session:
+        exported["expirationDate"] = expires
+    return exported
+
+
+def to_webdriver(cookie):
+    """Convert an exported cookie to a WebDriver add_cookie dict."""
+    webdriver_cookie = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+    if cookie.get("expirationDate"):
+        webdriver_cookie["expiry"] = int(cookie["expirationDate"])
+    return webdriver_cookie
+
+
+def has_session(cookies, now=None):
+    """Whether cookies (CDP or WebDriver dicts) include an unexpired LinkedIn session cookie."""
+    now = time.time() if now is None else now
+    for cookie in cookies:
+        if cookie.get("name") != SESSION_COOKIE or not cookie.get("value"):
+            continue
+        expires = cookie.get("expires", cookie.get("expiry"))
+        if expires is None or expires <= 0 or expires > now:
+            return True
+    return False
@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+def format_sse(seq, event, data):
+    """One server-sent event, its id being the sequence number."""
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class EventHub:
+    """
+    Numbered events for the web app's live stream (/api/stream).
+
+    publish() may be called from any thread: the bot's output reader, the activity log follower,
+    the start and stop handlers. Every event gets the next sequence number and the last history
+    events are kept, so a client reconnecting with the number of the last event it received is
+    sent only what it missed. Stream readers wait on an asyncio event of their own loop, set
+    whenever something is published, and cost nothing while the bot is idle.
+    """
+
+    def __init__(self, history=5000):
+        self.seq = 0
+        self._events = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._waiters = set()  # (loop, asyncio.Event) of each stream reader
+
+    def publish(self, event, data):
+        with self._lock:
+            self.seq += 1
+            self._events.append((self.seq, event, data))
+            waiters = list(self._waiters)
+            seq = self.seq
+        for loop, flag in waiters:
+            try:
+                loop.call_soon_threadsafe(flag.set)
+            except RuntimeError:
+                pass  # Loop closed, the reader is gone
+        return seq
+
+    def since(self, seq):
+        """
+        The events published after seq.
+
+        Returns:
+            (events, complete): complete is false when events after seq were already dropped
+            from the history, or seq was never issued (the app restarted since)
+        """
+        with self._lock:
+            if seq > self.seq or seq < 0:
+                return [], False
+            if not self._events or seq >= self.seq:
+                return [], True
+            first = self._events[0][0]
+            if seq + 1 < first:
+                return [], False
+            return list(itertools.islice(self._events, seq + 1 - first, None)), True
+
+    @contextmanager
+    def subscribe(self):
+        """An asyncio event set whenever something is published, for the duration of the block."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            yield waiter[1]
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    async def follow(self, after, keepalive=15.0):
+        """
+        Yield (seq, event, data) for each event after seq after, as they are published.
+
+        (None, None, None) is yielded after keepalive idle seconds, and (seq, "reset", {}) in
+        place of events that were dropped before this reader got to them.
+        """
+        with self.subscribe() as flag:
+            while True:
+                flag.clear()
+                events, complete = self.since(after)
+                if not complete:
+                    after = self.seq
+                    yield after, "reset", {}
+                    continue
+                for event in events:
+                    after = event[0]
+                    yield event
+                if events:
+                    continue
+                try:
+                    await asyncio.wait_for(flag.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None, None, None
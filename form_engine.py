@@ -0,0 +1,224 @@
+import re
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+
+# The Easy Apply modal is handled in three steps:
+#   1. snapshot_form serialises every question of the current form step in one script call,
+#   2. the bot plans an answer for each question record in pure Python,
+#   3. apply_form_actions writes all planned answers back in one script call.
+# Only fields that react to real keystrokes (date pickers, autocomplete inputs) fall back to
+# WebDriver send_keys.
+
+# arguments[0]: the <form> element of the Easy Apply modal
+# Every interactive node is tagged with a data-ea-id attribute so later calls can find it
+# again without another lookup.
+SNAPSHOT_FORM_JS = """
+const form = arguments[0];
+let counter = Number(document.body.getAttribute('data-ea-counter') || 0);
+const tag = (el) => {
+    if (!el.hasAttribute('data-ea-id')) {
+        el.setAttribute('data-ea-id', 'ea-' + (++counter));
+    }
+    return el.getAttribute('data-ea-id');
+};
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const isRequired = (el) => !!el && (el.required || el.getAttribute('aria-required') === 'true');
+const labelFor = (input) => (input.id && form.querySelector('label[for="' + CSS.escape(input.id) + '"]')) || input.closest('label');
+const questions = [];
+form.querySelectorAll('.fb-dash-form-element').forEach((container, index) => {
+    const record = {index: index, kind: null, label: '', options: [], id: null, required: false,
+                    input_type: null, value: '', element: null};
+    const radios = container.querySelectorAll('input[type=radio]');
+    const checkboxes = container.querySelectorAll('input[type=checkbox]');
+    const datePicker = container.querySelector('.artdeco-datepicker__input');
+    const select = container.querySelector('select');
+    const field = container.querySelector('input:not([type=radio]):not([type=checkbox]):not([type=hidden]), textarea');
+    const choices = radios.length ? radios : checkboxes;
+    if (choices.length) {
+        const legend = container.querySelector('.fb-dash-form-element__label');
+        record.kind = radios.length ? 'radio' : 'checkbox';
+        record.label = text(legend ? (legend.querySelector('span') || legend) : labelFor(choices[0]));
+        choices.forEach((input) => {
+            const label = labelFor(input) || input;
+            record.options.push({id: tag(label), text: text(label), checked: input.checked});
+            record.required = record.required || isRequired(input);
+        });
+    } else if (datePicker) {
+        record.kind = 'date';
+        record.label = text(container.querySelector('label'));
+        record.id = tag(datePicker);
+        record.required = isRequired(datePicker);
+        record.value = datePicker.value;
+        record.element = datePicker;
+    } else if (select) {
+        record.kind = 'select';
+        record.label = text(container.querySelector('label'));
+        record.id = tag(select);
+        record.required = isRequired(select);
+        record.value = select.selectedIndex >= 0 ? text(select.options[select.selectedIndex]) : '';
+        Array.from(select.options).forEach((option) => record.options.push({text: text(option)}));
+    } else if (field) {
+        record.kind = 'text';
+        record.label = text(container.querySelector('label'));
+        record.id = tag(field);
+        record.required = isRequired(field);
+        record.value = field.value;
+        if (/numeric/i.test(field.id || '')) {
+            // For decimal and integer response fields, the id contains 'numeric' while the type remains 'text'
+            record.input_type = 'numeric';
+        } else if (field.tagName === 'TEXTAREA' || /text/i.test(field.type || '')) {
+            record.input_type = 'text';
+        }
+        if (field.getAttribute('role') === 'combobox' || field.getAttribute('aria-autocomplete')) {
+            // Autocomplete inputs only show suggestions for real keystrokes
+            record.element = field;
+        }
+    } else {
+        return;
+    }
+    questions.push(record);
+});
+document.body.setAttribute('data-ea-counter', counter);
+return questions;
+"""
+
+# arguments[0]: list of {id, op, value} actions, op being 'set', 'select' or 'click'
+# Values are written through the native setters and followed by input/change events so that
+# the page's framework picks them up exactly as if they had been typed.
+# Returns the ids of the actions that could not be applied.
+APPLY_FORM_ACTIONS_JS = """
+const actions = arguments[0];
+const failed = [];
+const prototypes = {INPUT: HTMLInputElement.prototype, TEXTAREA: HTMLTextAreaElement.prototype,
+                    SELECT: HTMLSelectElement.prototype};
+const setValue = (el, value) => Object.getOwnPropertyDescriptor(prototypes[el.tagName], 'value').set.call(el, value);
+const fire = (el, type) => el.dispatchEvent(new Event(type, {bubbles: true}));
+for (const action of actions) {
+    const el = document.querySelector('[data-ea-id="' + action.id + '"]');
+    if (!el) {
+        failed.push(action.id);
+        continue;
+    }
+    try {
+        if (action.op === 'click') {
+            el.click();
+        } else if (action.op === 'set') {
+            el.focus();
+            setValue(el, String(action.value));
+            fire(el, 'input');
+            fire(el, 'change');
+            el.blur();
+        } else if (action.op === 'select') {
+            const wanted = String(action.value).trim();
+            const options = Array.from(el.options);
+            const option = options.find((o) => o.text.trim() === wanted) ||
+                           options.find((o) => o.text.trim().toLowerCase() === wanted.toLowerCase());
+            if (!option) {
+                failed.push(action.id);
+                continue;
+            }
+            setValue(el, option.value);
+            fire(el, 'input');
+            fire(el, 'change');
+        } else {
+            failed.push(action.id);
+        }
+    } catch (e) {
+        failed.push(action.id);
+    }
+}
+return failed;
+"""
+
+# Validation messages LinkedIn shows in the Easy Apply modal, in the languages seen so far
+FORM_ERROR_MESSAGES = [
+    'enter a valid',
+    'enter a decimal',
+    'enter a whole number',
+    'enter a whole number between 0 and 99',
+    'file is required',
+    'whole number',
+    'make a selection',
+    'select checkbox to proceed',
+    'saisissez un numéro',
+    '请输入whole编号',
+    '请输入decimal编号',
+    '长度超过 0.0',
+    'numéro de téléphone',
+    'introduce un número de whole entre',
+    'inserisci un numero whole compreso',
+    'preguntas adicionales',
+    'insira um um número',
+    'cuántos años',
+    'use the format',
+    'a file is required',
+    '请选择',
+    '请 选 择',
+    'inserisci',
+    'wholenummer',
+    'wpisz liczb',
+    'zakresu od',
+    'tussen',
+]
+FORM_ERROR_PATTERN = re.compile('|'.join(re.escape(message) for message in FORM_ERROR_MESSAGES), re.IGNORECASE)
+
+
+def matching_errors(texts):
+    """The texts among the modal's errors (waits.MODAL_STATE_JS) that match FORM_ERROR_PATTERN."""
+    return [text for text in texts if FORM_ERROR_PATTERN.search(text)]
+
+
+def snapshot_form(browser, form):
+    """
+    Serialise all questions of an Easy Apply form step in one script call.
+
+    Returns:
+        A list of question records (dicts) with kind ('radio', 'checkbox', 'date', 'select' or 'text'),
+        label, options, id, required, input_type ('numeric' or 'text' for text fields), value and,
+        for fields that need real keystrokes, element
+    """
+    return browser.execute_script(SNAPSHOT_FORM_JS, form) or []
+
+
+def set_action(question, value):
+    if question.get('element') is not None:
+        return {"id": question['id'], "op": "keys", "value": value, "element": question['element']}
+    return {"id": question['id'], "op": "set", "value": value}
+
+
+def select_action(question, option_text):
+    return {"id": question['id'], "op": "select", "value": option_text}
+
+
+def click_action(option_id):
+    return {"id": option_id, "op": "click"}
+
+
+def apply_form_actions(browser, actions):
+    """
+    Apply planned answers to the form.
+
+    All 'set', 'select' and 'click' actions are applied in a single script call; 'keys' actions
+    are typed through WebDriver because the page only reacts to real key events for them.
+
+    Returns:
+        The list of action ids that could not be applied
+    """
+    batched = [{"id": a['id'], "op": a['op'], "value": a.get('value')} for a in actions if a['op'] != 'keys']
+    failed = browser.execute_script(APPLY_FORM_ACTIONS_JS, batched) if batched else []
+    for action in actions:
+        if action['op'] != 'keys':
+            continue
+        try:
+            element = action['element']
+            element.clear()
+            element.send_keys(action['value'])
+            if action.get('submit'):
+                # Confirm only once the picker has taken the typed value
+                WebDriverWait(browser, 2, poll_frequency=0.05).until(
+                    lambda driver: element.get_attribute('value'))
+                element.send_keys(Keys.RETURN)
+        except Exception as e:
+            print(f"Could not type into field {action['id']}: {e}")
+            failed.append(action['id'])
+    return failed
@@ -0,0 +1,248 @@
+import asyncio
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from resume_index import tokenize
+
+# Most frequent words of the languages job posts are usually written in, used to tell which
+# language a description is in without calling a model
+STOPWORDS = {
+    "english": {"the", "and", "of", "to", "in", "with", "for", "you", "our", "we", "will", "are", "is", "your", "on"},
+    "french": {"le", "la", "les", "et", "des", "du", "de", "en", "vous", "nous", "pour", "une", "dans", "sur", "avec"},
+    "german": {"und", "der", "die", "das", "mit", "für", "sie", "wir", "ist", "ein", "eine", "zu", "den", "von", "auf"},
+    "spanish": {"el", "los", "las", "y", "con", "para", "por", "una", "del", "que", "en", "es", "tu", "nuestro", "se"},
+    "italian": {"il", "di", "che", "e", "per", "con", "una", "della", "sono", "nel", "gli", "alla", "del", "lavoro", "si"},
+    "dutch": {"de", "het", "een", "en", "van", "je", "met", "voor", "wij", "ons", "zijn", "op", "te", "naar", "bij"},
+    "portuguese": {"o", "os", "e", "do", "da", "com", "para", "uma", "em", "que", "você", "nosso", "na", "no", "por"},
+}
+
+# Names the languages configuration may give the languages of STOPWORDS, in those languages
+# themselves and in each other, with and without accents
+LANGUAGE_NAMES = {
+    "english": {"english", "anglais", "englisch", "inglés", "ingles", "inglese", "engels", "inglês", "en"},
+    "french": {"french", "français", "francais", "französisch", "franzosisch", "francés", "frances", "francese",
+               "frans", "francês", "fr"},
+    "german": {"german", "allemand", "deutsch", "alemán", "aleman", "tedesco", "duits", "alemão", "alemao", "de"},
+    "spanish": {"spanish", "espagnol", "spanisch", "español", "espanol", "spagnolo", "spaans", "espanhol", "es"},
+    "italian": {"italian", "italien", "italienisch", "italiano", "italiaans", "it"},
+    "dutch": {"dutch", "néerlandais", "neerlandais", "niederländisch", "niederlandisch", "neerlandés",
+              "neerlandes", "olandese", "nederlands", "holandês", "holandes", "nl"},
+    "portuguese": {"portuguese", "portugais", "portugiesisch", "portugués", "portugues", "portoghese",
+                   "portugees", "português", "pt"},
+}
+
+
+class FitEvaluator:
+    """
+    Runs job-fit evaluations concurrently while the browser keeps working.
+
+    Evaluations run on an asyncio loop in a background thread, through the async OpenAI client
+    of an AIResponseGenerator, with at most `concurrency` requests in flight. submit() returns a
+    concurrent.futures.Future resolving to True (apply) or False (skip), so the caller can apply
+    to approved jobs in completion order while the rest are still being scored.
+    """
+
+    def __init__(self, ai_response_generator, concurrency=4):
+        self.ai_response_generator = ai_response_generator
+        self.concurrency = max(1, int(concurrency))
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fit-evaluator", daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._create_semaphore(), self._loop).result()
+
+    async def _create_semaphore(self):
+        # Created on the evaluator loop so it is bound to it on every Python version
+        return asyncio.Semaphore(self.concurrency)
+
+    async def _evaluate(self, job_title, job_description):
+        async with self._semaphore:
+            return await self.ai_response_generator.evaluate_job_fit_async(job_title, job_description)
+
+    def submit(self, job_title, job_description):
+        """
+        Schedule a fit evaluation.
+
+        Returns:
+            concurrent.futures.Future: resolves to True if the job should be applied to
+        """
+        return asyncio.run_coroutine_threadsafe(self._evaluate(job_title, job_description), self._loop)
+
+    def close(self):
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+
+class FitCascade:
+    """
+    Cheap local job-fit checks run before asking the model.
+
+    Stage 1 ("rules") skips jobs whose title or description contains an excluded keyword, or whose
+    description is written in a language the candidate does not speak. Stage 2 ("score") compares
+    the description with the resume using hashed TF-IDF vectors: jobs scoring below skip_below are
+    skipped, jobs scoring at least apply_above are applied to, and only the band in between is left
+    to the model.
+
+    resume_text may be a function returning the text, so that the resume is only read when the
+    first description is scored.
+
+    The IDF weights come from the resume paragraphs and the descriptions of earlier runs, read
+    from corpus_path, and stay fixed for the whole run, so a job gets the same score whichever
+    jobs were scored before it. The descriptions scored during the run are added to the corpus by
+    save_corpus(), for the next run.
+    """
+
+    def __init__(self, resume_text, languages=(), title_exclude=(), description_exclude=(),
+                 check_language=True, skip_below=0.05, apply_above=0.3, n_features=2 ** 16,
+                 corpus_path=os.path.join("logs", "cache", "fit_corpus.npz")):
+        self.languages = self.known_languages(languages)
+        self.title_exclude = self._compile(title_exclude)
+        self.description_exclude = self._compile(description_exclude)
+        self.check_language = check_language and bool(languages)
+        self.skip_below = skip_below
+        self.apply_above = apply_above
+        self.n_features = n_features
+        self._resume_text = resume_text
+        self._resume_counts = None
+        self._resume_vector = None
+        self.corpus_path = corpus_path
+        # Document frequencies the IDF is computed from: the resume paragraphs and the corpus
+        self._documents = 0
+        self._document_frequency = np.zeros(n_features)
+        # Descriptions scored during this run, added to the corpus by save_corpus()
+        self._new_documents = 0
+        self._new_document_frequency = np.zeros(n_features)
+
+    @property
+    def resume_counts(self):
+        if self._resume_counts is None:
+            documents, document_frequency = self._load_corpus()
+            self._documents += documents
+            self._document_frequency += document_frequency
+            resume_text = (self._resume_text() if callable(self._resume_text) else self._resume_text) or ''
+            for paragraph in re.split(r'\n\s*\n', resume_text):
+                if paragraph.strip():
+                    counts = self._counts(tokenize(paragraph))
+                    self._documents += 1
+                    self._document_frequency += counts > 0
+            self._resume_counts = self._counts(tokenize(resume_text))
+        return self._resume_counts
+
+    def _load_corpus(self):
+        """The (documents, document frequencies) of the descriptions scored in earlier runs."""
+        if not self.corpus_path or not os.path.exists(self.corpus_path):
+            return 0, np.zeros(self.n_features)
+        try:
+            with np.load(self.corpus_path) as corpus:
+                document_frequency = corpus["document_frequency"].astype(float)
+                if document_frequency.shape == (self.n_features,):
+                    return int(corpus["documents"]), document_frequency
+        except Exception as e:
+            print(f"Error reading the job fit corpus: {str(e)}")
+        return 0, np.zeros(self.n_features)
+
+    def save_corpus(self):
+        """Add the descriptions scored during this run to the corpus of the next runs."""
+        if not self.corpus_path or not self._new_documents:
+            return
+        documents, document_frequency = self._load_corpus()
+        directory = os.path.dirname(self.corpus_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = self.corpus_path + ".tmp.npz"
+        np.savez_compressed(temporary, documents=documents + self._new_documents,
+                            document_frequency=(document_frequency + self._new_document_frequency).astype(np.int32))
+        os.replace(temporary, self.corpus_path)
+        self._new_documents = 0
+        self._new_document_frequency[:] = 0
+
+    @staticmethod
+    def _compile(keywords):
+        keywords = [keyword.strip().lower() for keyword in keywords or [] if keyword and keyword.strip()]
+        if not keywords:
+            return None
+        return re.compile(r'\b(' + '|'.join(map(re.escape, keywords)) + r')\b')
+
+    def _counts(self, tokens):
+        buckets = np.fromiter((zlib.crc32(token.encode('utf-8')) % self.n_features for token in tokens),
+                              dtype=np.int64, count=len(tokens))
+        return np.bincount(buckets, minlength=self.n_features).astype(float)
+
+    def _tfidf(self, counts):
+        idf = np.log((1 + self._documents) / (1 + self._document_frequency)) + 1
+        vector = np.log1p(counts) * idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def known_languages(languages):
+        """
+        The STOPWORDS keys of the configured languages, English always included as it was before
+        the check existed. Names LANGUAGE_NAMES does not know are left out: a description is only
+        skipped for a language it recognises.
+        """
+        known = {"english"}
+        for language in languages:
+            name = str(language).strip().lower()
+            known.update(key for key, names in LANGUAGE_NAMES.items() if name in names)
+        return known
+
+    def detect_language(self, text):
+        words = tokenize(text)
+        if not words:
+            return None
+        hits = {language: sum(word in stopwords for word in words) for language, stopwords in STOPWORDS.items()}
+        language = max(hits, key=hits.get)
+        return language if hits[language] >= 3 else None
+
+    def check_title(self, job_title):
+        """
+        Stage 1 on the tile data alone.
+
+        Returns:
+            The reason to skip the job, or None
+        """
+        match = self.title_exclude.search(job_title.lower()) if self.title_exclude else None
+        return f"title contains '{match.group(1)}'" if match else None
+
+    def score(self, job_description):
+        """Cosine similarity between the description and the resume, between 0 and 1."""
+        if self._resume_vector is None:
+            self._resume_vector = self._tfidf(self.resume_counts)
+        counts = self._counts(tokenize(job_description))
+        self._new_documents += 1
+        self._new_document_frequency += counts > 0
+        return float(np.dot(self._tfidf(counts), self._resume_vector))
+
+    def evaluate(self, job_title, job_description):
+        """
+        Run both stages on a job.
+
+        Returns:
+            (decision, stage, reason): decision is True to apply, False to skip, or None when
+            the job is ambiguous and should be sent to the model
+        """
+        reason = self.check_title(job_title)
+        if reason:
+            return False, "rules", reason
+        if self.description_exclude:
+            match = self.description_exclude.search(job_description.lower())
+            if match:
+                return False, "rules", f"description contains '{match.group(1)}'"
+        if self.check_language:
+            language = self.detect_language(job_description)
+            if language is not None and language not in self.languages:
+                return False, "rules", f"description is in {language}"
+        if not self.resume_counts.any():
+            return None, "score", "no resume text to compare with"
+
+        score = self.score(job_description)
+        if score < self.skip_below:
+            return False, "score", f"relevance {score:.3f} < {self.skip_below}"
+        if score >= self.apply_above:
+            return True, "score", f"relevance {score:.3f} >= {self.apply_above}"
+        return None, "score", f"relevance {score:.3f}"
@@ -0,0 +1,180 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Deadlines used until a step has enough history, in seconds
+DEFAULT_STEP_DEADLINES = {
+    "open_application": 20.0,
+    "form_step": 45.0,
+    "confirmation": 15.0,
+}
+
+
+class StepDeadlineExceeded(Exception):
+    pass
+
+
+class StepTimings:
+    """
+    Durations of the steps of past applications, used to give each step a deadline.
+
+    The last `window` durations of every step are kept in SQLite (WAL mode) and mirrored in memory;
+    new ones are written in batches of flush_every, and the rest by close(). Once a step has
+    min_samples of them, its deadline is their 99th percentile times margin, clamped between
+    minimum and growth times the step's default deadline (and maximum); before that the default
+    deadline applies.
+
+    A step that timed out is recorded at the deadline it was given, flagged as timed out: how long
+    it would have taken is unknown. When such a duration is the 99th percentile, it becomes the
+    deadline as is, without the margin, so that stuck applications do not push the deadlines up.
+    """
+
+    def __init__(self, db_path=os.path.join("logs", "step_times.db"), window=500, min_samples=20, margin=1.5,
+                 minimum=5.0, maximum=180.0, growth=2.0, flush_every=50, defaults=None):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.minimum = minimum
+        self.maximum = maximum
+        self.growth = growth
+        self.flush_every = flush_every
+        self.defaults = dict(DEFAULT_STEP_DEADLINES, **(defaults or {}))
+        self._lock = threading.Lock()
+        self._pending = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS step_times ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "step TEXT NOT NULL, "
+            "duration REAL NOT NULL, "
+            "recorded_at REAL NOT NULL, "
+            "timed_out INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(step_times)").fetchall()]
+        if "timed_out" not in columns:
+            self._conn.execute("ALTER TABLE step_times ADD COLUMN timed_out INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS step_times_step ON step_times (step, id)")
+        self._durations = {}
+        for (step,) in self._conn.execute("SELECT DISTINCT step FROM step_times").fetchall():
+            rows = self._conn.execute(
+                "SELECT id, duration, timed_out FROM step_times WHERE step = ? ORDER BY id DESC LIMIT ?",
+                (step, window)).fetchall()
+            self._durations[step] = deque(((duration, bool(timed_out)) for _, duration, timed_out in reversed(rows)),
+                                          maxlen=window)
+            if len(rows) == window:
+                self._conn.execute("DELETE FROM step_times WHERE step = ? AND id < ?", (step, rows[-1][0]))
+        self._conn.commit()
+
+    def record(self, step, duration, timed_out=False):
+        with self._lock:
+            self._durations.setdefault(step, deque(maxlen=self.window)).append((duration, timed_out))
+            self._pending.append((step, duration, time.time(), int(timed_out)))
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        self._conn.executemany("INSERT INTO step_times (step, duration, recorded_at, timed_out) VALUES (?, ?, ?, ?)",
+                               self._pending)
+        self._conn.commit()
+        self._pending = []
+
+    def p99(self, step):
+        """The 99th percentile of the step's durations and whether it is a timed-out one, or None."""
+        durations = sorted(self._durations.get(step, ()))
+        if len(durations) < self.min_samples:
+            return None
+        return durations[math.ceil(0.99 * len(durations)) - 1]
+
+    def deadline(self, step):
+        default = self.defaults.get(step, self.maximum)
+        p99 = self.p99(step)
+        if p99 is None:
+            return default
+        duration, timed_out = p99
+        deadline = duration if timed_out else duration * self.margin
+        return min(max(deadline, self.minimum), default * self.growth, self.maximum)
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+
+class JobRun:
+    """
+    Cooperative deadline tracking for one application.
+
+    The application is split into named steps; each gets the deadline StepTimings derives for it.
+    The code driving the browser calls check() between actions and bounds its waits with
+    remaining(), so an application that runs late stops at the next check instead of being
+    abandoned while it still drives the browser. Durations of completed steps are recorded, and
+    steps that time out are recorded at their deadline, flagged as timed out, so that the deadlines
+    do not only learn from the steps fast enough to finish.
+    """
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.step_name = None
+        self._step_started = None
+        self._deadline = None
+        self._limit = None
+
+    def start(self, step_name):
+        self.finish()
+        self.step_name = step_name
+        self._step_started = time.monotonic()
+        self._limit = self.timings.deadline(step_name)
+        self._deadline = self._step_started + self._limit
+
+    def finish(self):
+        """Mark the current step as completed and record how long it took."""
+        if self.step_name is not None:
+            self.timings.record(self.step_name, time.monotonic() - self._step_started)
+        self.step_name = None
+        self._deadline = None
+
+    def expire(self):
+        """Mark the current step as timed out and record it at its deadline."""
+        if self.step_name is not None:
+            self.timings.record(self.step_name, self._limit, timed_out=True)
+        self.step_name = None
+        self._deadline = None
+
+    def remaining(self, cap=None):
+        """Seconds left before the current step's deadline, at most cap."""
+        if self._deadline is None:
+            return cap
+        left = max(self._deadline - time.monotonic(), 0.1)
+        return min(left, cap) if cap is not None else left
+
+    def check(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            step_name, limit = self.step_name, self._limit
+            self.expire()
+            raise StepDeadlineExceeded(f"Step {step_name} exceeded its deadline of {limit:.0f} s")
+
+
+def set_command_timeouts(browser, command_timeout=60, page_load_timeout=30, script_timeout=15):
+    """
+    Bound every WebDriver call so a hung browser cannot block the bot.
+
+    command_timeout applies to the HTTP connection to this browser's driver (its client config,
+    so other browsers of the process keep their own), page_load_timeout to navigation and
+    script_timeout to execute_async_script.
+    """
+    browser.set_page_load_timeout(page_load_timeout)
+    browser.set_script_timeout(script_timeout)
+    try:
+        browser.command_executor.client_config.timeout = command_timeout
+    except AttributeError:
+        pass  # Selenium before 4.26 has no per-connection client config
@@ -0,0 +1,87 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+APPLIED = "applied"
+FAILED = "failed"
+SKIPPED_FIT = "skipped_fit"
+BLACKLISTED = "blacklisted"
+
+JOB_ID_PATTERNS = [
+    re.compile(r'/jobs/view/(\d+)'),
+    re.compile(r'[?&]currentJobId=(\d+)'),
+]
+
+
+def extract_job_id(link):
+    """
+    Extract the numeric LinkedIn job ID from a job link.
+
+    Returns the ID as a string, or None if the link does not contain one.
+    """
+    if not link:
+        return None
+    for pattern in JOB_ID_PATTERNS:
+        match = pattern.search(link)
+        if match:
+            return match.group(1)
+    return None
+
+
+class SeenJobStore:
+    """
+    Persistent index of jobs the bot has already handled, keyed by LinkedIn job ID.
+
+    Outcomes are kept in SQLite (WAL mode) so they survive restarts, and mirrored in an
+    in-memory dict so that membership checks in the hot loop are O(1) and never touch disk.
+    """
+
+    def __init__(self, db_path=os.path.join("logs", "seen_jobs.db")):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_jobs ("
+            "job_id TEXT PRIMARY KEY, "
+            "outcome TEXT NOT NULL, "
+            "title TEXT, "
+            "company TEXT, "
+            "link TEXT, "
+            "updated_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._outcomes = dict(self._conn.execute("SELECT job_id, outcome FROM seen_jobs"))
+
+    def __contains__(self, job_id):
+        return job_id is not None and job_id in self._outcomes
+
+    def __len__(self):
+        return len(self._outcomes)
+
+    def outcome(self, job_id):
+        return self._outcomes.get(job_id)
+
+    def record(self, job_id, outcome, title="", company="", link=""):
+        """
+        Record the outcome for a job, replacing any earlier outcome for the same ID.
+        """
+        if job_id is None:
+            return
+        with self._lock:
+            self._outcomes[job_id] = outcome
+            self._conn.execute(
+                "INSERT OR REPLACE INTO seen_jobs (job_id, outcome, title, company, link, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, outcome, title, company, link, datetime.utcnow().isoformat())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,123 +1,433 @@
-import time, random, csv, traceback, os, re
+import time, random, csv, traceback, os, re, io
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import StaleElementReferenceException
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 from datetime import date, datetime
 from itertools import product
 from pypdf import PdfReader
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import threading
+import concurrent.futures
 import sys
 import logging
 import json
+from page_scripts import EXTRACT_JOB_TILES_JS, PAGE_STATUS_JS, SCROLL_UNTIL_LOADED_JS
+from pacing import Pacing
+from metrics import SpanRecorder, WebDriverProfiler
+from question_rules import QuestionAnswerer, normalize_question
+from answer_cache import AnswerCache, profile_fingerprint
+from resume_index import ResumeIndex, estimate_tokens
+from resume_cache import ResumeCache
+from form_engine import snapshot_form, apply_form_actions, set_action, select_action, click_action, matching_errors
+from waits import modal_state, wait_for, wait_for_job_details, modal_ready, primary_enabled, step_changed, suggestions_visible, confirmation_shown
+from job_fit import FitEvaluator, FitCascade
+from job_runner import JobRun, StepTimings, StepDeadlineExceeded, set_command_timeouts
+from job_store import SeenJobStore, extract_job_id, APPLIED, FAILED, SKIPPED_FIT, BLACKLISTED
+from navigation import Navigator
+from log_writer import LogWriter
+from activity_store import ActivityStore
+import cookie_jar
 
 class BotLogger:
-    def __init__(self, log_dir="logs"):
+    """
+    The bot's log files: the activity log, the output and failed CSVs and the unprepared questions.
+
+    Lines go through a LogWriter, so logging an entry only queues it and the files are written
+    in batches by a background thread. settings is the logWriter block of the configuration.
+    Job events and unprepared questions also go to the ActivityStore the web app queries.
+    """
+
+    def __init__(self, log_dir="logs", settings=None):
         os.makedirs(log_dir, exist_ok=True)
+        settings = settings or {}
+        self.writer = LogWriter(
+            batch_size=int(settings.get('batchSize', 100)),
+            flush_interval=float(settings.get('flushInterval', 1)),
+            max_queue=int(settings.get('queueSize', 10000)),
+            fsync=settings.get('fsync', 'interval'),
+            fsync_interval=float(settings.get('fsyncInterval', 5)),
+            max_bytes=int(float(settings.get('rotateMb', 50)) * 1024 * 1024),
+            daily=bool(settings.get('rotateDaily', False))
+        )
         self.activity_log_path = os.path.join(log_dir, "activity.log.jsonl")
+        self.spans_log_path = os.path.join(log_dir, "spans.log.jsonl")
         self.output_csv_path = os.path.join(log_dir, "output.csv")
         self.failed_csv_path = os.path.join(log_dir, "failed.csv")
         self.unprepared_csv_path = os.path.join(log_dir, "unprepared_questions.csv")
-        # Write headers if files are new
+        # Headers are written at the top of new files, rotated ones included
+        self.writer.register(self.activity_log_path)
+        self.writer.register(self.spans_log_path)
         for path, headers in [
             (self.output_csv_path, ["timestamp","job_title","company","location","job_link","status","reason","answers","ai_answers","time_taken_sec"]),
             (self.failed_csv_path, ["timestamp","job_title","company","location","job_link","status","reason","answers","ai_answers","time_taken_sec","error","screenshot"]),
             (self.unprepared_csv_path, ["timestamp","question_type","question_text","context","job_title","company","job_link"])
         ]:
-            if not os.path.exists(path):
-                with open(path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(headers)
+            self.writer.register(path, header=self.csv_line(headers))
+        self.store = ActivityStore(os.path.join(log_dir, "activity.db"), legacy_log_path=self.activity_log_path)
+
+    @staticmethod
+    def csv_line(row):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(row)
+        return buffer.getvalue()
 
     def log_activity(self, entry):
-        with open(self.activity_log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.writer.write(self.activity_log_path, json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def log_span(self, entry):
+        self.writer.write(self.spans_log_path, json.dumps(entry, ensure_ascii=False) + "\n")
 
     def log_output(self, **kwargs):
-        with open(self.output_csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                kwargs.get('timestamp'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('location'),
-                kwargs.get('job_link'), kwargs.get('status'), kwargs.get('reason'),
-                json.dumps(kwargs.get('answers', []), ensure_ascii=False),
-                json.dumps(kwargs.get('ai_answers', []), ensure_ascii=False),
-                kwargs.get('time_taken_sec')
-            ])
+        self.store.add_job_event(kwargs)
+        self.writer.write(self.output_csv_path, self.csv_line([
+            kwargs.get('timestamp'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('location'),
+            kwargs.get('job_link'), kwargs.get('status'), kwargs.get('reason'),
+            json.dumps(kwargs.get('answers', []), ensure_ascii=False),
+            json.dumps(kwargs.get('ai_answers', []), ensure_ascii=False),
+            kwargs.get('time_taken_sec')
+        ]))
 
     def log_failed(self, **kwargs):
-        with open(self.failed_csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                kwargs.get('timestamp'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('location'),
-                kwargs.get('job_link'), kwargs.get('status'), kwargs.get('reason'),
-                json.dumps(kwargs.get('answers', []), ensure_ascii=False),
-                json.dumps(kwargs.get('ai_answers', []), ensure_ascii=False),
-                kwargs.get('time_taken_sec'), kwargs.get('error'), kwargs.get('screenshot')
-            ])
+        self.store.add_job_event(kwargs)
+        self.writer.write(self.failed_csv_path, self.csv_line([
+            kwargs.get('timestamp'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('location'),
+            kwargs.get('job_link'), kwargs.get('status'), kwargs.get('reason'),
+            json.dumps(kwargs.get('answers', []), ensure_ascii=False),
+            json.dumps(kwargs.get('ai_answers', []), ensure_ascii=False),
+            kwargs.get('time_taken_sec'), kwargs.get('error'), kwargs.get('screenshot')
+        ]))
 
     def log_unprepared(self, **kwargs):
-        with open(self.unprepared_csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                kwargs.get('timestamp'), kwargs.get('question_type'), kwargs.get('question_text'),
-                kwargs.get('context'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('job_link')
-            ])
+        self.store.add_question(kwargs)
+        self.writer.write(self.unprepared_csv_path, self.csv_line([
+            kwargs.get('timestamp'), kwargs.get('question_type'), kwargs.get('question_text'),
+            kwargs.get('context'), kwargs.get('job_title'), kwargs.get('company'), kwargs.get('job_link')
+        ]))
+
+    def close(self):
+        """Write out the queued lines and store entries, and close the files and the store."""
+        self.writer.close()
+        self.store.close()
 
 class AIResponseGenerator:
-    def __init__(self, api_key, personal_info, experience, languages, resume_path, text_resume_path=None, debug=False):
+    def __init__(self, api_key, personal_info, experience, languages, resume_path, text_resume_path=None, debug=False, cache=None,
+                 context_token_budget=1500, max_skills=30, resume_cache=None, metrics=None):
         self.personal_info = personal_info
         self.experience = experience
         self.languages = languages
         self.pdf_resume_path = resume_path
         self.text_resume_path = text_resume_path
         self._resume_content = None
-        self._client = OpenAI(api_key=api_key) if api_key else None
+        self._resume_chunks = None
+        self._resume_lock = threading.RLock()
+        self.resume_cache = resume_cache
+        self.metrics = metrics or SpanRecorder()
+        self._profile_fingerprint = None
+        # Bounded so a stalled request cannot hold up an application past its step deadline
+        self._client = OpenAI(api_key=api_key, timeout=30, max_retries=1) if api_key else None
+        self._async_client = AsyncOpenAI(api_key=api_key, timeout=30, max_retries=1) if api_key else None
         self.debug = debug
+        self.cache = cache
+        self.context_token_budget = context_token_budget
+        self.max_skills = max_skills
+        self._candidate_context = None
+        self._resume_index = None
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self._usage_lock = threading.Lock()  # Fit evaluations record usage from their own thread
     @property
     def resume_content(self):
         if self._resume_content is None:
-            # First try to read from text resume if available
-            if self.text_resume_path:
-                try:
-                    with open(self.text_resume_path, 'r', encoding='utf-8') as f:
-                        self._resume_content = f.read()
-                        print("Successfully loaded text resume")
-                        return self._resume_content
-                except Exception as e:
-                    print(f"Could not read text resume: {str(e)}")
+            with self._resume_lock:
+                if self._resume_content is None:
+                    self._load_resume()
+        return self._resume_content
 
-            # Fall back to PDF resume if text resume fails or isn't available
+    def _load_resume(self):
+        # First try to read from text resume if available
+        if self.text_resume_path:
             try:
-                content = []
-                reader = PdfReader(self.pdf_resume_path)
-                for page in reader.pages:
-                    content.append(page.extract_text())
-                self._resume_content = "\n".join(content)
-                print("Successfully loaded PDF resume")
+                entry = self._load_resume_file(self.text_resume_path, self._read_text_resume)
+                self._resume_chunks = entry['chunks']
+                self._resume_content = entry['text']
+                print("Successfully loaded text resume")
+                return
             except Exception as e:
-                print(f"Could not extract text from resume PDF: {str(e)}")
-                self._resume_content = ""
-        return self._resume_content
+                print(f"Could not read text resume: {str(e)}")
+
+        # Fall back to PDF resume if text resume fails or isn't available
+        try:
+            entry = self._load_resume_file(self.pdf_resume_path, self._extract_pdf_text)
+            self._resume_chunks = entry['chunks']
+            self._resume_content = entry['text']
+            print("Successfully loaded PDF resume")
+        except Exception as e:
+            print(f"Could not extract text from resume PDF: {str(e)}")
+            self._resume_content = ""
+
+    def _load_resume_file(self, path, extract):
+        if self.resume_cache is None:
+            return {"text": extract(path), "chunks": None}
+        return self.resume_cache.load(path, extract)
+
+    @staticmethod
+    def _read_text_resume(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    @staticmethod
+    def _extract_pdf_text(path):
+        content = []
+        reader = PdfReader(path)
+        for page in reader.pages:
+            content.append(page.extract_text())
+        return "\n".join(content)
+
+    def warm_up(self):
+        """
+        Load the resume and build its index in a background thread, so no application waits for PDF parsing.
+        """
+        def warm():
+            try:
+                self.resume_index
+                self.profile_fingerprint
+            except Exception as e:
+                print(f"Could not prepare the resume: {str(e)}")
+
+        thread = threading.Thread(target=warm, name="resume-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def resume_index(self):
+        if self._resume_index is None:
+            content = self.resume_content
+            with self._resume_lock:
+                if self._resume_index is None:
+                    self._resume_index = ResumeIndex(content, chunks=self._resume_chunks)
+        return self._resume_index
+
+    @property
+    def candidate_context(self):
+        """
+        Static description of the candidate, built once per profile.
+
+        It is sent as the first message of every request so that the prompt starts with the same
+        prefix each time, which lets the provider reuse its prompt cache. The whole resume is part
+        of it when it fits in the token budget; otherwise only the chunks relevant to each question
+        are sent after it (see _build_messages).
+        """
+        if self._candidate_context is None:
+            skills = sorted(((years, skill) for skill, years in self.experience.items() if skill != 'default' and years),
+                            key=lambda item: (-item[0], item[1]))[:self.max_skills]
+            context = f"""Candidate background:
+- Name: {self.personal_info['First Name']} {self.personal_info['Last Name']}
+- Current Role: {self.experience.get('currentRole', '')}
+- Skills (years of experience): {', '.join(f'{skill} ({years})' for years, skill in skills)}
+- Languages: {', '.join(f'{lang}: {level}' for lang, level in self.languages.items())}
+- Professional Summary: {self.personal_info.get('MessageToManager', '')}
+"""
+            if self.resume_content and estimate_tokens(self.resume_content) <= self.context_token_budget:
+                context += f"\nResume Content (Give the greatest weight to this information, if specified):\n{self.resume_content}\n"
+            self._candidate_context = context
+        return self._candidate_context
+
+    def _build_messages(self, instructions, request, query):
+        """
+        Assemble the messages for a request: the static candidate context first, then the task.
 
-    def _build_context(self):
-        return f"""
-        Personal Information:
-        - Name: {self.personal_info['First Name']} {self.personal_info['Last Name']}
-        - Current Role: {self.experience.get('currentRole', '')}
-        - Skills: {', '.join(self.experience.keys())}
-        - Languages: {', '.join(f'{lang}: {level}' for lang, level in self.languages.items())}
-        - Professional Summary: {self.personal_info.get('MessageToManager', '')}
-
-        Resume Content (Give the greatest weight to this information, if specified):
-        {self.resume_content}
+        When the resume is too long to send whole, the chunks most relevant to query are added
+        to the request, within the configured token budget.
         """
+        if self.resume_content and estimate_tokens(self.resume_content) > self.context_token_budget:
+            excerpt = self.resume_index.excerpt(query, self.context_token_budget)
+            request = f"Relevant resume excerpts (Give the greatest weight to this information, if specified):\n{excerpt}\n\n{request}"
+        return [
+            {"role": "system", "content": self.candidate_context},
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": request}
+        ]
+
+    def _record_usage(self, response):
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', 0) or 0
+        with self._usage_lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.cached_prompt_tokens += cached
+            average = self.prompt_tokens // self.calls
+        if self.debug:
+            print(f"AI call used {usage.prompt_tokens} prompt tokens ({cached} cached), "
+                  f"average {average} per call")
+
+    @property
+    def profile_fingerprint(self):
+        if self._profile_fingerprint is None:
+            self._profile_fingerprint = profile_fingerprint(
+                self.personal_info, self.experience, self.languages, self.resume_content)
+        return self._profile_fingerprint
 
     def generate_response(self, question_text, response_type="text", options=None, max_tokens=100):
+        """
+        Generate a response using OpenAI's API, or return the cached answer to the same question
+
+        Args:
+            question_text: The application question to answer
+            response_type: "text", "numeric", or "choice"
+            options: For "choice" type, a list of tuples containing (index, text) of possible answers
+            max_tokens: Maximum length of response
+
+        Returns:
+            - For text: Generated text response or None
+            - For numeric: Integer value or None
+            - For choice: Integer index of selected option or None
+        """
+        if not self._client:
+            return None
+        if self.cache is None:
+            return self._generate_response(question_text, response_type, options, max_tokens)
+
+        key = self.cache.make_key(question_text, response_type, options, self.profile_fingerprint)
+
+        def compute():
+            return self._to_cached(self._generate_response(question_text, response_type, options, max_tokens), response_type, options)
+
+        return self._from_cached(self.cache.get_or_compute(key, question_text, response_type, compute), response_type, options)
+
+    @staticmethod
+    def _to_cached(answer, response_type, options):
+        if response_type == "choice" and answer is not None:
+            # Options may come back in a different order, so cache the chosen text rather than its index
+            return dict(options)[answer]
+        return answer
+
+    @staticmethod
+    def _from_cached(answer, response_type, options):
+        if response_type == "choice" and answer is not None:
+            return next((index for index, text in options
+                         if normalize_question(str(text)) == normalize_question(str(answer))), None)
+        return answer
+
+    def generate_responses(self, requests):
+        """
+        Answer several questions of a form step with a single API call
+
+        Args:
+            requests: A list of dicts with id, question_text, response_type and options, as for generate_response
+
+        Returns:
+            A dict mapping each request id to its answer, in the same format as generate_response
+        """
+        answers = {request['id']: None for request in requests}
+        if not self._client or not requests:
+            return answers
+
+        missing = []
+        for request in requests:
+            if self.cache is not None:
+                request = dict(request, key=self.cache.make_key(
+                    request['question_text'], request['response_type'], request.get('options'), self.profile_fingerprint))
+                cached = self.cache.get(request['key'])
+                if cached is not None:
+                    answers[request['id']] = self._from_cached(cached, request['response_type'], request.get('options'))
+                    continue
+            missing.append(request)
+
+        if len(missing) > 1:
+            batched = self._generate_batch(missing)
+        else:
+            batched = {}
+
+        for request in missing:
+            response_type = request['response_type']
+            options = request.get('options')
+            answer = batched.get(request['id'])
+            if answer is None:
+                # Invalid or missing in the batch: ask for this question on its own
+                answer = self._generate_response(request['question_text'], response_type, options)
+            answers[request['id']] = answer
+            if self.cache is not None and answer is not None:
+                self.cache.put(request['key'], request['question_text'], response_type,
+                               self._to_cached(answer, response_type, options))
+        return answers
+
+    def _generate_batch(self, requests):
+        """
+        Ask for all requests in one JSON-mode call and return the valid answers keyed by request id.
+        """
+        questions = []
+        for request in requests:
+            entry = {"id": str(request['id']), "question": request['question_text'], "type": request['response_type']}
+            if request['response_type'] == "choice" and request.get('options'):
+                entry["options"] = {str(idx): text for idx, text in request['options']}
+            questions.append(entry)
+
+        system_prompt = ("You are a helpful assistant answering job application questions professionally and concisely. "
+                         "Use the candidate's background information and resume to personalize responses. "
+                         "Answer every question of the list and return a JSON object mapping each question id to its answer: "
+                         "a short string for \"text\" questions, a single number for \"numeric\" questions and, "
+                         "for \"choice\" questions, the index of the most appropriate option as an integer. No explanation needed.")
+        try:
+            with self.metrics.span("ai_call", kind="batch", questions=len(requests)):
+                response = self._client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=self._build_messages(system_prompt, json.dumps({"questions": questions}, ensure_ascii=False),
+                                                  " ".join(request['question_text'] for request in requests)),
+                    max_tokens=sum(100 if request['response_type'] == "text" else 10 for request in requests) + 20 * len(requests),
+                    temperature=0.7,
+                    response_format={"type": "json_object"}
+                )
+            self._record_usage(response)
+            content = response.choices[0].message.content
+            if self.debug:
+                print(f"AI batch response: {content}")
+            raw = json.loads(content)
+        except Exception as e:
+            print(f"Error using AI to answer {len(requests)} questions at once: {str(e)}")
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+
+        answers = {}
+        for request in requests:
+            answer = self._validate_answer(raw.get(str(request['id'])), request['response_type'], request.get('options'))
+            if answer is not None:
+                answers[request['id']] = answer
+        return answers
+
+    @staticmethod
+    def _validate_answer(value, response_type, options):
+        """Coerce a batched answer to the generate_response format, or return None if it is invalid."""
+        if isinstance(value, bool) or value is None:
+            return None
+        if response_type == "text":
+            return value.strip() if isinstance(value, str) and value.strip() else None
+        if isinstance(value, str):
+            numbers = re.findall(r'\d+', value)
+            if not numbers:
+                return None
+            value = numbers[0]
+        try:
+            number = int(float(value))
+        except (TypeError, ValueError):
+            return None
+        if response_type == "numeric":
+            return number
+        if response_type == "choice" and options and number in dict(options):
+            return number
+        return None
+
+    def _generate_response(self, question_text, response_type="text", options=None, max_tokens=100):
         """
         Generate a response using OpenAI's API
         
@@ -136,28 +446,25 @@ class AIResponseGenerator:
             return None
             
         try:
-            context = self._build_context()
-            
             system_prompt = {
                 "text": "You are a helpful assistant answering job application questions professionally and concisely. Use the candidate's background information and resume to personalize responses.",
                 "numeric": "You are a helpful assistant providing numeric answers to job application questions. Based on the candidate's experience, provide a single number as your response. No explanation needed.",
                 "choice": "You are a helpful assistant selecting the most appropriate answer choice for job application questions. Based on the candidate's background, select the best option by returning only its index number. No explanation needed."
             }[response_type]
 
-            user_content = f"Using this candidate's background and resume:\n{context}\n\nPlease answer this job application question: {question_text}"
+            user_content = f"Please answer this job application question: {question_text}"
             if response_type == "choice" and options:
                 options_text = "\n".join([f"{idx}: {text}" for idx, text in options])
                 user_content += f"\n\nSelect the most appropriate answer by providing its index number from these options:\n{options_text}"
 
-            response = self._client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_content}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
+            with self.metrics.span("ai_call", kind=response_type):
+                response = self._client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=self._build_messages(system_prompt, user_content, question_text),
+                    max_tokens=max_tokens,
+                    temperature=0.7
+                )
+            self._record_usage(response)
             
             answer = response.choices[0].message.content.strip()
             print(f"AI response: {answer}")  # TODO: Put logging behind a debug flag
@@ -184,6 +491,47 @@ class AIResponseGenerator:
             print(f"Error using AI to generate response: {str(e)}")
             return None
 
+    def _job_fit_request(self, job_title, job_description):
+        system_prompt = """You are evaluating job fit for technical roles. 
+        Recommend APPLY if:
+        - Candidate meets 65 percent of the core requirements
+        - Experience gap is 2 years or less
+        - Has relevant transferable skills
+        
+        Return SKIP if:
+        - Experience gap is greater than 2 years
+        - Missing multiple core requirements
+        - Role is clearly more senior
+        - The role is focused on an uncommon technology or skill that is required and that the candidate does not have experience with
+        - The role is a leadership role or a role that requires managing people and the candidate has no experience leading or managing people
+
+        """
+        #Consider the candidate's education level when evaluating whether they meet the core requirements. Having higher education than required should allow for greater flexibility in the required experience.
+        
+        if self.debug:
+            system_prompt += """
+            You are in debug mode. Return a detailed explanation of your reasoning for each requirement.
+
+            Return APPLY or SKIP followed by a brief explanation.
+
+            Format response as: APPLY/SKIP: [brief reason]"""
+        else:
+            system_prompt += """Return only APPLY or SKIP."""
+
+        return dict(
+            model="gpt-3.5-turbo",
+            messages=self._build_messages(system_prompt, f"Job: {job_title}\n{job_description}",
+                                          f"{job_title}\n{job_description}"),
+            max_tokens=250 if self.debug else 1,  # Allow more tokens when debug is enabled
+            temperature=0.2  # Lower temperature for more consistent decisions
+        )
+
+    def _job_fit_decision(self, job_title, response):
+        self._record_usage(response)
+        answer = response.choices[0].message.content.strip()
+        print(f"AI evaluation for {job_title}: {answer}")
+        return answer.upper().startswith('A')  # True for APPLY, False for SKIP
+
     def evaluate_job_fit(self, job_title, job_description):
         """
         Evaluate whether a job is worth applying to based on the candidate's experience and the job requirements
@@ -199,55 +547,33 @@ class AIResponseGenerator:
             return True  # Proceed with application if AI not available
             
         try:
-            context = self._build_context()
-            
-            system_prompt = """You are evaluating job fit for technical roles. 
-            Recommend APPLY if:
-            - Candidate meets 65 percent of the core requirements
-            - Experience gap is 2 years or less
-            - Has relevant transferable skills
-            
-            Return SKIP if:
-            - Experience gap is greater than 2 years
-            - Missing multiple core requirements
-            - Role is clearly more senior
-            - The role is focused on an uncommon technology or skill that is required and that the candidate does not have experience with
-            - The role is a leadership role or a role that requires managing people and the candidate has no experience leading or managing people
-
-            """
-            #Consider the candidate's education level when evaluating whether they meet the core requirements. Having higher education than required should allow for greater flexibility in the required experience.
-            
-            if self.debug:
-                system_prompt += """
-                You are in debug mode. Return a detailed explanation of your reasoning for each requirement.
+            with self.metrics.span("ai_call", kind="job_fit"):
+                response = self._client.chat.completions.create(**self._job_fit_request(job_title, job_description))
+            return self._job_fit_decision(job_title, response)
+        except Exception as e:
+            print(f"Error evaluating job fit: {str(e)}")
+            return True  # Proceed with application if evaluation fails
 
-                Return APPLY or SKIP followed by a brief explanation.
+    async def evaluate_job_fit_async(self, job_title, job_description):
+        """
+        Same as evaluate_job_fit, through the async client so several jobs can be scored at once.
+        """
+        if not self._async_client:
+            return True
 
-                Format response as: APPLY/SKIP: [brief reason]"""
-            else:
-                system_prompt += """Return only APPLY or SKIP."""
-
-            response = self._client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Job: {job_title}\n{job_description}\n\nCandidate:\n{context}"}
-                ],
-                max_tokens=250 if self.debug else 1,  # Allow more tokens when debug is enabled
-                temperature=0.2  # Lower temperature for more consistent decisions
-            )
-            
-            answer = response.choices[0].message.content.strip()
-            print(f"AI evaluation: {answer}")
-            return answer.upper().startswith('A')  # True for APPLY, False for SKIP
-            
+        try:
+            with self.metrics.span("ai_call", kind="fit"):
+                response = await self._async_client.chat.completions.create(**self._job_fit_request(job_title, job_description))
+            return self._job_fit_decision(job_title, response)
         except Exception as e:
             print(f"Error evaluating job fit: {str(e)}")
-            return True  # Proceed with application if evaluation fails
+            return True
 
 class LinkedinEasyApply:
-    def __init__(self, parameters, driver):
+    def __init__(self, parameters, driver, browser_session=None, browser_pool=None):
         self.browser = driver
+        self.browser_session = browser_session
+        self.browser_pool = browser_pool
         self.email = parameters['email']
         self.password = parameters['password']
         self.openai_api_key = parameters.get('openaiApiKey', '')  # Get API key with empty default
@@ -259,7 +585,8 @@ class LinkedinEasyApply:
         self.locations = parameters.get('locations', [])
         self.residency = parameters.get('residentStatus', [])
         self.base_search_url = self.get_base_search_url(parameters)
-        self.seen_jobs = []
+        self.seen_jobs = SeenJobStore()
+        print(f"Loaded {len(self.seen_jobs)} previously seen jobs.")
         self.file_name = "output"
         self.unprepared_questions_file_name = "unprepared_questions"
         self.output_file_directory = parameters['outputFileDirectory']
@@ -280,6 +607,23 @@ class LinkedinEasyApply:
         self.experience_default = int(self.experience['default'])
         self.debug = parameters.get('debug', False)
         self.evaluate_job_fit = parameters.get('evaluateJobFit', True)
+        self.logger = BotLogger(settings=parameters.get('logWriter'))
+        self.metrics = SpanRecorder(sink=self.logger.log_span)
+        self.profiler = WebDriverProfiler() if parameters.get('profileWebDriver', False) else None
+        pacing_settings = parameters.get('pacing') or {}
+        self.pacing = Pacing(pacing_settings.get('profile', 'fast'), pacing_settings.get('delays'), metrics=self.metrics)
+        self.application_times = []
+        timeout_settings = parameters.get('timeouts') or {}
+        self.step_timings = StepTimings(defaults=timeout_settings.get('stepDeadlines'))
+        self.max_form_steps = int(timeout_settings.get('maxFormSteps', 15))
+        self.command_timeouts = {
+            "command_timeout": float(timeout_settings.get('command', 60)),
+            "page_load_timeout": float(timeout_settings.get('pageLoad', 30)),
+            "script_timeout": float(timeout_settings.get('script', 15))
+        }
+        self.navigator = Navigator(timeout=float(timeout_settings.get('pageReady', 20)))
+        self.attach_browser(driver)
+        ai_cache_settings = parameters.get('aiCache') or {}
         self.ai_response_generator = AIResponseGenerator(
             api_key=self.openai_api_key,
             personal_info=self.personal_info,
@@ -287,64 +631,155 @@ class LinkedinEasyApply:
             languages=self.languages,
             resume_path=self.resume_dir,
             text_resume_path=self.text_resume,
-            debug=self.debug
+            debug=self.debug,
+            context_token_budget=int(parameters.get('aiContextTokenBudget', 1500)),
+            cache=AnswerCache(
+                max_entries=int(ai_cache_settings.get('maxEntries', 5000)),
+                ttl_seconds=float(ai_cache_settings.get('ttlDays', 30)) * 24 * 3600
+            ) if ai_cache_settings.get('enabled', True) else None,
+            resume_cache=ResumeCache(),
+            metrics=self.metrics
+        )
+        self.ai_response_generator.warm_up()
+        self.fit_evaluator = FitEvaluator(
+            self.ai_response_generator,
+            concurrency=int(parameters.get('fitEvaluationConcurrency', 4))
+        ) if self.evaluate_job_fit and self.openai_api_key else None
+        fit_cascade_settings = parameters.get('fitCascade') or {}
+        self.fit_cascade = FitCascade(
+            lambda: self.ai_response_generator.resume_content,
+            languages=list(self.languages.keys()) if isinstance(self.languages, dict) else [],
+            title_exclude=fit_cascade_settings.get('titleExclude') or [],
+            description_exclude=fit_cascade_settings.get('descriptionExclude') or [],
+            check_language=fit_cascade_settings.get('checkLanguage', True),
+            skip_below=float(fit_cascade_settings.get('skipBelow', 0.05)),
+            apply_above=float(fit_cascade_settings.get('applyAbove', 0.3))
+        ) if self.evaluate_job_fit and fit_cascade_settings.get('enabled', True) else None
+        self.answerer = QuestionAnswerer(
+            checkboxes=self.checkboxes,
+            experience=self.experience,
+            languages=self.languages,
+            personal_info=self.personal_info,
+            residency=self.residency,
+            university_gpa=self.university_gpa,
+            salary_minimum=self.salary_minimum,
+            notice_period=self.notice_period,
+            on_unprepared=self.record_unprepared_question
         )
-        self.logger = BotLogger()
         # Try to load cookies if available
         self.cookies_loaded = self.load_cookies()
 
     def load_cookies(self, cookies_path="linkedin_cookies.json"):
         """
-        Load cookies from a JSON file (exported from Cookie-Editor or similar) and add them to the browser.
+        Load cookies from a JSON file (exported from Cookie-Editor or similar) into the browser.
+
+        The cookies are set through the DevTools protocol (Network.setCookies), without loading
+        any page, so the first navigation of the run is already signed in. Drivers without
+        DevTools access get them through add_cookie, which needs a linkedin.com page first.
         Returns True if cookies were loaded, False otherwise.
         """
-        if not os.path.exists(cookies_path):
+        try:
+            cookies = cookie_jar.read_cookie_file(cookies_path)
+        except Exception as e:
+            print(f"Error reading cookies: {e}")
+            return False
+        if cookies is None:
             print(f"No cookie file found at {cookies_path}, proceeding with normal login.")
             return False
         try:
-            with open(cookies_path, "r", encoding="utf-8") as f:
-                cookies = json.load(f)
-            self.browser.get("https://www.linkedin.com")
+            self.browser.execute_cdp_cmd("Network.setCookies", {"cookies": [cookie_jar.to_cdp(cookie) for cookie in cookies]})
+            print(f"Loaded {len(cookies)} cookies from file.")
+            return True
+        except (AttributeError, WebDriverException) as e:
+            print(f"Could not set cookies through DevTools ({e}), adding them on linkedin.com instead.")
+        try:
+            self.navigator.open(self.browser, "https://www.linkedin.com", "linkedin")
             for cookie in cookies:
-                # Remove fields not accepted by Selenium
-                cookie.pop('sameSite', None)
-                cookie.pop('storeId', None)
-                cookie.pop('hostOnly', None)
-                # Selenium expects expiry as int, not float
-                if 'expirationDate' in cookie:
-                    cookie['expiry'] = int(cookie['expirationDate'])
-                    cookie.pop('expirationDate')
-                # Remove unsupported fields
-                cookie = {k: v for k, v in cookie.items() if k in ['name', 'value', 'domain', 'path', 'expiry', 'secure', 'httpOnly']}
+                cookie = cookie_jar.to_webdriver(cookie)
                 try:
                     self.browser.add_cookie(cookie)
                 except Exception as e:
                     print(f"Failed to add cookie: {cookie.get('name', '')}: {e}")
-            self.browser.refresh()
-            print("Loaded cookies from file and refreshed page.")
+            print("Loaded cookies from file.")
             return True
         except Exception as e:
             print(f"Error loading cookies: {e}")
             return False
 
+    def browser_cookies(self):
+        """The browser's LinkedIn cookies, read without loading a page when DevTools is available."""
+        try:
+            return self.browser.execute_cdp_cmd("Network.getCookies", {"urls": cookie_jar.LINKEDIN_URLS})["cookies"]
+        except (AttributeError, WebDriverException):
+            return self.browser.get_cookies()
+
+    def has_session(self):
+        """Cheap session-validity probe: whether the browser holds an unexpired session cookie."""
+        try:
+            return cookie_jar.has_session(self.browser_cookies())
+        except Exception as e:
+            print(f"Could not read the browser cookies: {e}")
+            return False
+
+    def save_cookies(self, cookies_path="linkedin_cookies.json"):
+        """
+        Write the browser's LinkedIn cookies back to the cookie file, so the next run starts with the
+        session as LinkedIn last refreshed it. Nothing is written unless the session cookie is there.
+        """
+        try:
+            cookies = self.browser_cookies()
+            if not cookie_jar.has_session(cookies):
+                return False
+            cookie_jar.write_cookie_file(cookies_path, [cookie_jar.to_export(cookie) for cookie in cookies])
+            print(f"Saved {len(cookies)} cookies to {cookies_path}.")
+            return True
+        except Exception as e:
+            print(f"Error saving cookies: {e}")
+            return False
+
+    def attach_browser(self, driver):
+        """Make driver the bot's browser: hook the span recorder and profiler into it and bound its commands."""
+        self.browser = driver
+        self.metrics.attach(driver)
+        if self.profiler is not None:
+            self.profiler.attach(driver)
+        set_command_timeouts(driver, **self.command_timeouts)
+
+    def recycle_browser_if_needed(self):
+        """
+        Swap the browser for a warm one from the pool once it has run too many jobs or grown too large.
+
+        Called between result pages only, when no element of the current page is held anymore.
+        The cookies of the old browser are saved first and set in the new one before the search
+        resumes.
+        """
+        if self.browser_pool is None or self.browser_session is None:
+            return
+        reason = self.browser_pool.recycle_reason(self.browser_session)
+        if reason is None:
+            return
+        self.save_cookies()
+        session = self.browser_pool.replace(self.browser_session, reason)
+        if session is self.browser_session:
+            return
+        self.browser_session = session
+        self.attach_browser(session.driver)
+        self.cookies_loaded = self.load_cookies()
+        self.login()
+
     def login(self):
-        if self.cookies_loaded:
-            print("Cookies loaded, skipping login.")
+        """
+        Log in with the credentials unless the browser already holds a session cookie.
+
+        The probe reads the cookie jar instead of loading the feed. A session LinkedIn has revoked
+        anyway is caught when the first search page lands on the login wall (see next_job_page).
+        """
+        if self.has_session():
+            print("Session cookie found, skipping login.")
             return
         try:
-            # Check if the "chrome_bot" directory exists
-            print("Attempting to restore previous session...")
-            if os.path.exists("chrome_bot"):
-                self.browser.get("https://www.linkedin.com/feed/")
-                time.sleep(random.uniform(0.1, 0.3))
-
-                # Check if the current URL is the feed page
-                if self.browser.current_url != "https://www.linkedin.com/feed/":
-                    print("Feed page not loaded, proceeding to login.")
-                    self.load_login_page_and_login()
-            else:
-                print("No session found, proceeding to login.")
-                self.load_login_page_and_login()
+            print("No session found, proceeding to login.")
+            self.load_login_page_and_login()
 
         except TimeoutException:
             print("Timeout occurred, checking for security challenges...")
@@ -352,20 +787,28 @@ class LinkedinEasyApply:
             # raise Exception("Could not login!")
 
     def security_check(self):
-        current_url = self.browser.current_url
-        page_source = self.browser.page_source
+        status = self.page_status('security check', 'quick verification')
 
-        if '/checkpoint/challenge/' in current_url or 'security check' in page_source or 'quick verification' in page_source:
+        if '/checkpoint/challenge/' in status['url'] or any(status['phrases'].values()):
             print("Security check required, but cannot prompt for input in cloud environment. Skipping and continuing...")
             time.sleep(5)  # Wait a few seconds to allow for any possible automated challenge resolution
 
-    def load_login_page_and_login(self):
-        self.browser.get("https://www.linkedin.com/login")
+    def page_status(self, *phrases):
+        """
+        Check the current page for lowercase phrases without transferring its source.
 
-        # Wait for the username field to be present
-        WebDriverWait(self.browser, 10).until(
-            EC.presence_of_element_located((By.ID, "username"))
-        )
+        Returns:
+            A dict with the page url and a phrases dict telling which phrases are present
+        """
+        return self.browser.execute_script(PAGE_STATUS_JS, list(phrases))
+
+    def load_login_page_and_login(self):
+        page = self.navigator.open(self.browser, "https://www.linkedin.com/login", "login", timeout=10)
+        if page == "feed":
+            print("LinkedIn went straight to the feed, already logged in.")
+            return
+        if page is None:
+            raise TimeoutException("The login form did not load")
 
         self.browser.find_element(By.ID, "username").send_keys(self.email)
         self.browser.find_element(By.ID, "password").send_keys(self.password)
@@ -386,25 +829,52 @@ class LinkedinEasyApply:
         minimum_time = 0  # minimum time bot should run before taking a break
         minimum_page_time = time.time() + minimum_time
 
-        for (position, location) in searches:
-            location_url = "&location=" + location
-            job_page_number = -1
+        self.logger.store.start_run({
+            "positions": self.positions,
+            "locations": self.locations,
+            "pacing_profile": self.pacing.profile
+        })
+        try:
+            for (position, location) in searches:
+                location_url = "&location=" + location
+                job_page_number = -1
 
-            print("Starting the search for " + position + " in " + location + ".")
+                print("Starting the search for " + position + " in " + location + ".")
 
-            try:
-                while True:
-                    page_sleep += 1
-                    job_page_number += 1
-                    print("Going to job page " + str(job_page_number))
-                    self.next_job_page(position, location_url, job_page_number)
-                    time.sleep(random.uniform(0.1, 0.3))
-                    print("Starting the application process for this page...")
-                    self.apply_jobs(location)
-                    print("Job applications on this page have been successfully completed.")
-            except:
-                traceback.print_exc()
-                pass
+                try:
+                    while True:
+                        page_sleep += 1
+                        job_page_number += 1
+                        self.recycle_browser_if_needed()
+                        print("Going to job page " + str(job_page_number))
+                        with self.metrics.span("search_page", page=job_page_number):
+                            self.next_job_page(position, location_url, job_page_number)
+                        self.pacing.pause("results_page")
+                        print("Starting the application process for this page...")
+                        try:
+                            self.apply_jobs(location)
+                        finally:
+                            self.log_ai_stats()
+                        print("Job applications on this page have been successfully completed.")
+                except Exception:
+                    traceback.print_exc()
+                    pass
+        finally:
+            self.log_navigation_stats()
+            self.logger.store.end_run({
+                "applications": len(self.application_times),
+                "average_application_sec": round(sum(self.application_times) / len(self.application_times), 1)
+                    if self.application_times else None,
+                "navigation": self.navigator.stats()
+            })
+            self.save_cookies()
+            if self.profiler is not None:
+                self.profiler.write_report(applications=len(self.application_times))
+            if self.fit_evaluator is not None:
+                self.fit_evaluator.close()
+            if self.fit_cascade is not None:
+                self.fit_cascade.save_corpus()
+            self.step_timings.close()
 
     def apply_jobs(self, location):
         no_jobs_text = ""
@@ -412,12 +882,12 @@ class LinkedinEasyApply:
             no_jobs_element = self.browser.find_element(By.CLASS_NAME,
                                                         'jobs-search-two-pane__no-results-banner--expand')
             no_jobs_text = no_jobs_element.text
-        except:
+        except Exception:
             pass
         if 'No matching jobs found' in no_jobs_text:
             raise Exception("No more jobs on this page.")
 
-        if 'unfortunately, things are' in self.browser.page_source.lower():
+        if self.page_status('unfortunately, things are')['phrases']['unfortunately, things are']:
             raise Exception("No more jobs on this page.")
 
         job_results_header = ""
@@ -450,53 +920,36 @@ class LinkedinEasyApply:
             job_results_by_class = self.browser.find_element(By.CSS_SELECTOR, f".{random_class}")
             print(f"job_results: {job_results_by_class}")
             print("Successfully located the element using the random class name.")
-            self.scroll_slow(job_results_by_class)  # Scroll down
-            self.scroll_slow(job_results_by_class, step=300, reverse=True)  # Scroll up
-            job_list = self.browser.find_elements(By.CLASS_NAME, ul_element_class)[0].find_elements(By.CLASS_NAME, 'scaffold-layout__list-item')
+            with self.metrics.span("scroll_results"):
+                self.scroll_until_loaded(job_results_by_class, '.job-card-list__title--link', pacing_action="scroll_results")
+            with self.metrics.span("extract_tiles") as span:
+                job_list = self.extract_job_tiles(ul_element)
+                span["tiles"] = len(job_list)
             print(f"Found {len(job_list)} jobs on this page")
             if len(job_list) == 0:
                 raise Exception("No more jobs on this page.")
         except NoSuchElementException:
             print("No job results found using the specified XPaths or class.")
             print(f"Current URL: {self.browser.current_url}")
-            print(f"Page source snippet: {self.browser.page_source[:1000]}")
+            print(f"Page source snippet: {self.browser.execute_script('return document.documentElement.outerHTML.slice(0, 1000)')}")
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+        candidates = []
         for job_tile in job_list:
-            job_title, company, poster, job_location, apply_method, link = "", "", "", "", "", ""
-
-            try:
-                ## patch to incorporate new 'verification' crap by LinkedIn
-                # job_title = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title').text # original code
-                job_title_element = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link')
-                job_title = job_title_element.find_element(By.TAG_NAME, 'strong').text
-
-                link = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link').get_attribute('href').split('?')[0]
-            except:
-                pass
-            try:
-                # company = job_tile.find_element(By.CLASS_NAME, 'job-card-container__primary-description').text # original code
-                company = job_tile.find_element(By.CLASS_NAME, 'artdeco-entity-lockup__subtitle').text
-            except:
-                pass
-            try:
-                # get the name of the person who posted for the position, if any is listed
-                hiring_line = job_tile.find_element(By.XPATH, '//span[contains(.,\' is hiring for this\')]')
-                hiring_line_text = hiring_line.text
-                name_terminating_index = hiring_line_text.find(' is hiring for this')
-                if name_terminating_index != -1:
-                    poster = hiring_line_text[:name_terminating_index]
-            except:
-                pass
-            try:
-                job_location = job_tile.find_element(By.CLASS_NAME, 'job-card-container__metadata-item').text
-            except:
-                pass
-            try:
-                apply_method = job_tile.find_element(By.CLASS_NAME, 'job-card-container__apply-method').text
-            except:
-                pass
+            job_title = job_tile['title']
+            company = job_tile['company']
+            poster = job_tile['poster']
+            link = job_tile['link']
+
+            job_id = job_tile['job_id'] = job_tile['job_id'] or extract_job_id(link)
+            if job_id in self.seen_jobs:
+                print(f"Skipping job {job_id} at {company}: already seen ({self.seen_jobs.outcome(job_id)}).")
+                continue
+            if job_tile['applied']:
+                print(f"Skipping job {job_id} at {company}: already marked as applied on LinkedIn.")
+                self.seen_jobs.record(job_id, APPLIED, job_title, company, link)
+                continue
 
             contains_blacklisted_keywords = False
             job_title_parsed = job_title.lower().split(' ')
@@ -508,22 +961,22 @@ class LinkedinEasyApply:
 
             if company.lower() not in [word.lower() for word in self.company_blacklist] and \
                     poster.lower() not in [word.lower() for word in self.poster_blacklist] and \
-                    contains_blacklisted_keywords is False and link not in self.seen_jobs:
-                try:
-                    # Click the job to load description
-                    max_retries = 3
-                    retries = 0
-                    while retries < max_retries:
-                        try:
-                            # TODO: This is throwing an exception when running out of jobs on a page
-                            job_el = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link')
-                            job_el.click()
-                            break
-                        except StaleElementReferenceException:
-                            retries += 1
-                            continue
+                    contains_blacklisted_keywords is False:
+                reason = self.fit_cascade.check_title(job_title) if self.fit_cascade is not None else None
+                if reason:
+                    self.log_fit_decision(job_tile, False, "rules", reason)
+                    continue
+                candidates.append(job_tile)
+            else:
+                print(f"Job {job_title} for {company} by {poster} matches the blacklist.")
+                self.seen_jobs.record(job_id, BLACKLISTED, job_title, company, link)
 
-                    time.sleep(random.uniform(0.1, 0.3))
+        if self.evaluate_job_fit and self.fit_evaluator is not None:
+            self.apply_with_fit_pipeline(candidates, location)
+        else:
+            for job_tile in candidates:
+                try:
+                    self.open_job_tile(job_tile)
 
                     # TODO: Check if the job is already applied or the application has been reached
                     # "You've reached the Easy Apply application limit for today. Save this job and come back tomorrow to continue applying."
@@ -534,158 +987,325 @@ class LinkedinEasyApply:
                             # Get job description
                             job_description = self.browser.find_element(
                                 By.ID, 'job-details'
-                            ).text  
-
-                            # Evaluate if we should apply
-                            if not self.ai_response_generator.evaluate_job_fit(job_title, job_description):
-                                print("Skipping application: Job requirements not aligned with candidate profile per AI evaluation.")
+                            ).text
+
+                            # Evaluate if we should apply, asking the AI only when the local checks are not conclusive
+                            should_apply = self.local_fit_decision(job_tile, job_description)
+                            if should_apply is None:
+                                with self.metrics.span("fit_evaluation", stage="llm", job_id=job_tile['job_id']):
+                                    should_apply = self.ai_response_generator.evaluate_job_fit(job_tile['title'], job_description)
+                                self.log_fit_decision(job_tile, should_apply, "llm")
+                            if not should_apply:
                                 continue
-                        except:
+                        except Exception:
                             print("Could not load job description")
 
-                    def process_job():
-                        try:
-                            done_applying = self.apply_to_job()
-                            if done_applying:
-                                print(f"Application sent to {company} for the position of {job_title}.")
-                            else:
-                                print(f"An application for a job at {company} has been submitted earlier.")
-                        except:
-                            temp = self.file_name
-                            self.file_name = "failed"
-                            print("Failed to apply to job. Please submit a bug report with this link: " + link)
-                            try:
-                                self.write_to_file(company, job_title, link, job_location, location)
-                            except:
-                                pass
-                            self.file_name = temp
-                            print(f'updated {temp}.')
-                        try:
-                            self.write_to_file(company, job_title, link, job_location, location)
-                        except Exception:
-                            print(
-                                f"Unable to save the job information in the file. The job title {job_title} or company {company} cannot contain special characters,")
-                            traceback.print_exc()
-
-                    # Timeout logic: skip job if stuck for more than 3 minutes
-                    thread = threading.Thread(target=process_job)
-                    thread.daemon = True
-                    thread.start()
-                    thread.join(timeout=180)  # 3 minutes
-                    if thread.is_alive():
-                        print(f"Timeout: Skipping job at {company} for {job_title} after 3 minutes.")
-                        # Optionally, try to close any open modals or dialogs here
-                        continue
-                except:
+                    self.apply_to_tile(job_tile, location)
+                except Exception:
                     traceback.print_exc()
-                    print(f"Could not apply to the job in {company}")
-                    pass
-            else:
-                print(f"Job for {company} by {poster} contains a blacklisted word {word}.")
+                    print(f"Could not apply to the job in {job_tile['company']}")
+
+    def apply_with_fit_pipeline(self, candidates, location):
+        """
+        Apply to the candidate jobs of a page while their fit is evaluated concurrently.
+
+        The browser reads one description at a time and submits it to the fit evaluator, which
+        scores several jobs at once in the background. Between two descriptions, the jobs whose
+        evaluation has completed are applied to, so applications and evaluations overlap. Jobs the
+        local checks approve are applied to straight away, on the description already open. After
+        submitting a description the browser waits for its evaluation as long as reopening the job
+        would take on average, so a job approved by the model is only reopened if the evaluation
+        took longer than that.
+        """
+        pending = {}
+        remaining = list(candidates)
+        open_job_id = None
+        open_seconds = []
+
+        def apply(job_tile):
+            nonlocal open_job_id
+            try:
+                if open_job_id != job_tile['job_id']:
+                    self.open_job_tile(job_tile)
+                open_job_id = None  # The details pane changes once the application is done
+                self.apply_to_tile(job_tile, location)
+            except Exception:
+                traceback.print_exc()
+                print(f"Could not apply to the job in {job_tile['company']}")
+
+        while remaining or pending:
+            completed = [future for future in pending if future.done()]
+            if not completed and not remaining:
+                # Time the browser spends idle waiting for the next evaluation
+                with self.metrics.span("fit_wait"):
+                    completed = list(concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED).done)
+            # The open job first, while its description is still on screen
+            completed.sort(key=lambda future: pending[future]['job_id'] != open_job_id)
+            for future in completed:
+                job_tile = pending.pop(future)
+                try:
+                    should_apply = future.result()
+                except Exception as e:
+                    print(f"Error evaluating job fit: {str(e)}")
+                    should_apply = True
+                self.log_fit_decision(job_tile, should_apply, "llm")
+                if should_apply:
+                    apply(job_tile)
+            if not remaining:
+                continue
+
+            job_tile = remaining.pop(0)
+            try:
+                started = time.monotonic()
+                self.open_job_tile(job_tile)
+                open_seconds.append(time.monotonic() - started)
+                open_job_id = job_tile['job_id']
+                job_description = self.browser.find_element(By.ID, 'job-details').text
+            except Exception:
+                print(f"Could not load job description for {job_tile['title']} at {job_tile['company']}")
+                job_description = None
+            # Apply without an evaluation when the description cannot be read
+            should_apply = self.local_fit_decision(job_tile, job_description) if job_description is not None else True
+            if should_apply is None:
+                future = self.fit_evaluator.submit(job_tile['title'], job_description)
+                pending[future] = job_tile
+                if open_seconds:
+                    with self.metrics.span("fit_wait"):
+                        concurrent.futures.wait([future], timeout=sum(open_seconds) / len(open_seconds))
+            elif should_apply:
+                apply(job_tile)
+
+    def open_job_tile(self, job_tile):
+        # Click the job to load description
+        max_retries = 3
+        retries = 0
+        job_el = job_tile['title_element']
+        while retries < max_retries:
+            try:
+                # TODO: This is throwing an exception when running out of jobs on a page
+                job_el.click()
+                break
+            except StaleElementReferenceException:
+                retries += 1
+                job_el = job_tile['title_element'] = self.browser.find_element(
+                    By.CSS_SELECTOR, f"[data-job-id='{job_tile['job_id']}'] .job-card-list__title--link")
+                continue
+
+        try:
+            wait_for_job_details(self.browser, job_tile['job_id'])
+        except TimeoutException:
+            print(f"Details of {job_tile['title']} did not load in time")
+        self.pacing.pause("open_job")
+
+    def local_fit_decision(self, job_tile, job_description):
+        """
+        Run the local fit cascade on a job and log its decision.
+
+        Returns:
+            True to apply, False to skip, or None if the job should be evaluated by the AI
+        """
+        if self.fit_cascade is None:
+            return None
+        with self.metrics.span("fit_evaluation", stage="local", job_id=job_tile['job_id']) as span:
+            should_apply, stage, reason = self.fit_cascade.evaluate(job_tile['title'], job_description)
+            span["decided_by"] = stage if should_apply is not None else None
+        if should_apply is not None:
+            self.log_fit_decision(job_tile, should_apply, stage, reason)
+        return should_apply
+
+    def log_fit_decision(self, job_tile, should_apply, stage, reason=""):
+        """
+        Log a job-fit decision with the stage that made it ('rules', 'score' or 'llm'), recording skipped jobs as seen.
+        """
+        if stage == "llm" and not self.openai_api_key:
+            reason = "AI not available"
+        self.logger.log_activity({
+            "timestamp": datetime.utcnow().isoformat(),
+            "event": "fit_decision",
+            "job_id": job_tile['job_id'],
+            "job_title": job_tile['title'],
+            "company": job_tile['company'],
+            "job_link": job_tile['link'],
+            "decision": "apply" if should_apply else "skip",
+            "stage": stage,
+            "reason": reason
+        })
+        if should_apply:
+            print(f"Fit check ({stage}) passed for {job_tile['title']} at {job_tile['company']}. {reason}")
+            return
+        print(f"Skipping application to {job_tile['title']} at {job_tile['company']}: "
+              f"Job requirements not aligned with candidate profile per {stage} evaluation. {reason}")
+        self.seen_jobs.record(job_tile['job_id'], SKIPPED_FIT, job_tile['title'], job_tile['company'], job_tile['link'])
+
+    def apply_to_tile(self, job_tile, location):
+        """
+        Run the Easy Apply flow for the job currently open in the details pane.
+
+        Each step of the application has its own deadline (see JobRun); if any step fails or runs
+        late, the application modal is dismissed before moving on to the next job.
+        """
+        job_title = job_tile['title']
+        company = job_tile['company']
+        job_location = job_tile['location']
+        link = job_tile['link']
+        job_id = job_tile['job_id']
+
+        started = time.monotonic()
+        status = "success"
+        run = JobRun(self.step_timings)
+        with self.metrics.span("job", job_id=job_id) as span:
+            try:
+                done_applying = self.apply_to_job(run)
+                if done_applying:
+                    print(f"Application sent to {company} for the position of {job_title}.")
+                else:
+                    print(f"An application for a job at {company} has been submitted earlier.")
+                self.seen_jobs.record(job_id, APPLIED, job_title, company, link)
+            except (StepDeadlineExceeded, TimeoutException) as e:
+                status = "failed"
+                run.expire()
+                print(f"Timeout: Skipping job at {company} for {job_title}. {e}")
+                self.seen_jobs.record(job_id, FAILED, job_title, company, link)
+            except Exception:
+                status = "failed"
+                traceback.print_exc()
+                self.seen_jobs.record(job_id, FAILED, job_title, company, link)
+                print("Failed to apply to job. Please submit a bug report with this link: " + link)
+            finally:
+                if status != "success":
+                    self.dismiss_application()
+            span["outcome"] = status
+        if self.browser_session is not None:
+            self.browser_session.jobs += 1
+        time_taken = round(time.monotonic() - started, 1)
+        if status == "success":
+            self.application_times.append(time_taken)
+            print(f"Application took {time_taken} s with the {self.pacing.profile} pacing profile "
+                  f"(average {sum(self.application_times) / len(self.application_times):.1f} s "
+                  f"over {len(self.application_times)} applications)")
+        try:
+            self.write_to_file(company, job_title, link, job_location, location, status=status, time_taken_sec=time_taken)
+        except Exception:
+            print(
+                f"Unable to save the job information in the file. The job title {job_title} or company {company} cannot contain special characters,")
+            traceback.print_exc()
+
+    def extract_job_tiles(self, job_list_element=None):
+        """
+        Read every job tile on the current results page with a single execute_script call.
+
+        Args:
+            job_list_element: The <ul> element holding the tiles; the whole document is searched if omitted
 
-            self.seen_jobs += link
+        Returns:
+            A list of dicts with job_id, title, company, poster, location, apply_method, link,
+            applied (True if LinkedIn shows an "Applied" badge) and title_element (the link to click)
+        """
+        return self.browser.execute_script(EXTRACT_JOB_TILES_JS, job_list_element) or []
 
-    def apply_to_job(self):
+    def apply_to_job(self, run):
         easy_apply_button = None
 
         try:
             easy_apply_button = self.browser.find_element(By.CLASS_NAME, 'jobs-apply-button')
-        except:
+        except Exception:
             return False
 
-        try:
-            job_description_area = self.browser.find_element(By.ID, "job-details")
-            print (f"{job_description_area}")
-            self.scroll_slow(job_description_area, end=1600)
-            self.scroll_slow(job_description_area, end=1600, step=400, reverse=True)
-        except:
-            pass
+        run.start("open_application")
+        with self.metrics.span("open_application"):
+            try:
+                job_description_area = self.browser.find_element(By.ID, "job-details")
+                print (f"{job_description_area}")
+                self.scroll_until_loaded(job_description_area, pacing_action="read_description")
+            except Exception:
+                pass
 
-        print("Starting the job application...")
-        easy_apply_button.click()
+            run.check()
+            print("Starting the job application...")
+            easy_apply_button.click()
+            state = wait_for(self.browser, modal_ready, timeout=run.remaining())
 
         button_text = ""
         submit_application_text = 'submit application'
+        form_steps = 0
         while submit_application_text not in button_text.lower():
-            try:
+            form_steps += 1
+            if form_steps > self.max_form_steps:
+                raise Exception(f"Application still not submitted after {self.max_form_steps} steps.")
+            run.start("form_step")
+            with self.metrics.span("modal_step", step=form_steps):
                 self.fill_up()
+                run.check()
+                state = wait_for(self.browser, primary_enabled, timeout=run.remaining(5))
                 next_button = self.browser.find_element(By.CLASS_NAME, "artdeco-button--primary")
-                button_text = next_button.text.lower()
+                button_text = state['primary_text'].lower()
                 if submit_application_text in button_text:
                     try:
                         self.unfollow()
-                    except:
+                    except Exception:
                         print("Failed to unfollow company.")
-                time.sleep(random.uniform(0.1, 0.3))
+                # Validation on blur shows its message before the click, which then neither moves
+                # the step on nor adds an error for step_changed to notice
+                errors = matching_errors(state['errors'])
+                if errors:
+                    raise Exception(f"Failed answering required questions or uploading required files: {errors}")
+                self.pacing.pause("step")
+                run.check()
                 next_button.click()
-                time.sleep(random.uniform(0.1, 0.3))
-
-                # Newer error handling
-                error_messages = [
-                    'enter a valid',
-                    'enter a decimal',
-                    'Enter a whole number'
-                    'Enter a whole number between 0 and 99',
-                    'file is required',
-                    'whole number',
-                    'make a selection',
-                    'select checkbox to proceed',
-                    'saisissez un numéro',
-                    '请输入whole编号',
-                    '请输入decimal编号',
-                    '长度超过 0.0',
-                    'Numéro de téléphone',
-                    'Introduce un número de whole entre',
-                    'Inserisci un numero whole compreso',
-                    'Preguntas adicionales',
-                    'Insira um um número',
-                    'Cuántos años'
-                    'use the format',
-                    'A file is required',
-                    '请选择',
-                    '请 选 择',
-                    'Inserisci',
-                    'wholenummer',
-                    'Wpisz liczb',
-                    'zakresu od',
-                    'tussen'
-                ]
-
-                if any(error in self.browser.page_source.lower() for error in error_messages):
-                    raise Exception("Failed answering required questions or uploading required files.")
-            except:
-                traceback.print_exc()
-                self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
-                time.sleep(random.uniform(0.1, 0.3))
-                self.browser.find_elements(By.CLASS_NAME, 'artdeco-modal__confirm-dialog-btn')[0].click()
-                time.sleep(random.uniform(0.1, 0.3))
-                raise Exception("Failed to apply to job!")
+                state = wait_for(self.browser, step_changed(state), timeout=run.remaining())
 
-        closed_notification = False
-        time.sleep(random.uniform(0.1, 0.3))
-        try:
-            self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
-            closed_notification = True
-        except:
-            pass
-        try:
-            self.browser.find_element(By.CLASS_NAME, 'artdeco-toast-item__dismiss').click()
-            closed_notification = True
-        except:
-            pass
-        try:
-            self.browser.find_element(By.CSS_SELECTOR, 'button[data-control-name="save_application_btn"]').click()
-            closed_notification = True
-        except:
-            pass
+                errors = matching_errors(state['errors'])
+                if errors:
+                    raise Exception(f"Failed answering required questions or uploading required files: {errors}")
 
-        time.sleep(random.uniform(0.1, 0.3))
+        run.start("confirmation")
+        closed_notification = False
+        with self.metrics.span("confirmation"):
+            try:
+                wait_for(self.browser, confirmation_shown, timeout=run.remaining())
+            except TimeoutException:
+                run.expire()
+                print("No confirmation shown after submitting the application.")
+            try:
+                self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
+                closed_notification = True
+            except Exception:
+                pass
+            try:
+                self.browser.find_element(By.CLASS_NAME, 'artdeco-toast-item__dismiss').click()
+                closed_notification = True
+            except Exception:
+                pass
+            try:
+                self.browser.find_element(By.CSS_SELECTOR, 'button[data-control-name="save_application_btn"]').click()
+                closed_notification = True
+            except Exception:
+                pass
+        run.finish()
 
         if closed_notification is False:
             raise Exception("Could not close the applied confirmation window!")
 
         return True
 
+    def dismiss_application(self):
+        """
+        Close the Easy Apply modal after a failed application, discarding the draft.
+
+        Never raises, so it can always run before moving on to the next job.
+        """
+        try:
+            state = modal_state(self.browser)
+            if not state['open'] and not state['dialog']:
+                return
+            self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
+            WebDriverWait(self.browser, 5, poll_frequency=0.05).until(
+                EC.element_to_be_clickable((By.CLASS_NAME, 'artdeco-modal__confirm-dialog-btn'))).click()
+            wait_for(self.browser, lambda state: not state['open'], timeout=5)
+        except Exception as e:
+            print(f"Could not close the application window: {e}")
+
     def home_address(self, form):
         print("Trying to fill up home address fields")
         try:
@@ -698,7 +1318,10 @@ class LinkedinEasyApply:
                         self.enter_text(input_field, self.personal_info['Street address'])
                     elif 'city' in lb:
                         self.enter_text(input_field, self.personal_info['City'])
-                        time.sleep(0.2)
+                        try:
+                            wait_for(self.browser, suggestions_visible, timeout=3, input_field=input_field)
+                        except TimeoutException:
+                            print("No city suggestions shown")
                         input_field.send_keys(Keys.DOWN)
                         input_field.send_keys(Keys.RETURN)
                     elif 'zip' in lb or 'zip / postal code' in lb or 'postal' in lb:
@@ -707,7 +1330,7 @@ class LinkedinEasyApply:
                         self.enter_text(input_field, self.personal_info['State'])
                     else:
                         pass
-        except:
+        except Exception:
             pass
 
     def get_answer(self, question):
@@ -719,472 +1342,170 @@ class LinkedinEasyApply:
     def additional_questions(self, form):
         print("Trying to fill up additional questions")
 
-        questions = form.find_elements(By.CLASS_NAME, 'fb-dash-form-element')
+        questions = snapshot_form(self.browser, form)
+        planned = []
         for question in questions:
             try:
-                # Radio check
-                radio_fieldset = question.find_element(By.TAG_NAME, 'fieldset')
-                question_span = radio_fieldset.find_element(By.CLASS_NAME, 'fb-dash-form-element__label').find_elements(By.TAG_NAME, 'span')[0]
-                radio_text = question_span.text.lower()
-                print(f"Radio question text: {radio_text}")
-
-                radio_labels = radio_fieldset.find_elements(By.TAG_NAME, 'label')
-                radio_options = [(i, text.text.lower()) for i, text in enumerate(radio_labels)]
-                print(f"radio options: {[opt[1] for opt in radio_options]}")
-                
-                if len(radio_options) == 0:
-                    raise Exception("No radio options found in question")
-
-                answer = None
-
-                # Try to determine answer using existing logic
-                if 'driver\'s licence' in radio_text or 'driver\'s license' in radio_text:
-                    answer = self.get_answer('driversLicence')
-                elif any(keyword in radio_text.lower() for keyword in
-                         [
-                             'Aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
-                             'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
-                             'aborigine', 'ancestral', 'native peoples', 'original people',
-                             'first people', 'gender', 'race', 'disability', 'latino', 'torres',
-                             'do you identify'
-                         ]):
-                    negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none', 'no']
-                    answer = next((option for option in radio_options if
-                                   any(neg_keyword in option[1].lower() for neg_keyword in negative_keywords)), None)
-
-                elif 'assessment' in radio_text:
-                    answer = self.get_answer("assessment")
-
-                elif 'clearance' in radio_text:
-                    answer = self.get_answer("securityClearance")
-
-                elif 'north korea' in radio_text:
-                    answer = 'no'
-
-                elif 'previously employ' in radio_text or 'previous employ' in radio_text:
-                    answer = 'no'
-
-                elif 'authorized' in radio_text or 'authorised' in radio_text or 'legally' in radio_text:
-                    answer = self.get_answer('legallyAuthorized')
-
-                elif any(keyword in radio_text.lower() for keyword in
-                         ['certified', 'certificate', 'cpa', 'chartered accountant', 'qualification']):
-                    answer = self.get_answer('certifiedProfessional')
-
-                elif 'urgent' in radio_text:
-                    answer = self.get_answer('urgentFill')
-
-                elif 'commut' in radio_text or 'on-site' in radio_text or 'hybrid' in radio_text or 'onsite' in radio_text:
-                    answer = self.get_answer('commute')
-
-                elif 'remote' in radio_text:
-                    answer = self.get_answer('remote')
-
-                elif 'background check' in radio_text:
-                    answer = self.get_answer('backgroundCheck')
-
-                elif 'drug test' in radio_text:
-                    answer = self.get_answer('drugTest')
-
-                elif 'currently living' in radio_text or 'currently reside' in radio_text or 'right to live' in radio_text:
-                    answer = self.get_answer('residency')
-
-                elif 'level of education' in radio_text:
-                    for degree in self.checkboxes['degreeCompleted']:
-                        if degree.lower() in radio_text:
-                            answer = "yes"
-                            break
-
-                elif 'experience' in radio_text:
-                    if self.experience_default > 0:
-                        answer = 'yes'
-                    else:
-                        for experience in self.experience:
-                            if experience.lower() in radio_text:
-                                answer = "yes"
-                                break
-
-                elif 'data retention' in radio_text:
-                    answer = 'no'
-
-                elif 'sponsor' in radio_text:
-                    answer = self.get_answer('requireVisa')
-                
-                to_select = None
-                if answer is not None:
-                    print(f"Choosing answer: {answer}")
-                    i = 0
-                    for radio in radio_labels:
-                        if answer in radio.text.lower():
-                            to_select = radio_labels[i]
-                            break
-                        i += 1
-                    if to_select is None:
-                        print("Answer not found in radio options")
-
-                if to_select is None:
-                    print("No answer determined")
-                    self.record_unprepared_question("radio", radio_text)
-
-                    # Since no response can be determined, we use AI to identify the best responseif available, falling back to the final option if the AI response is not available
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="choice",
-                        options=radio_options
-                    )
-                    if ai_response is not None:
-                        to_select = radio_labels[ai_response]
-                    else:
-                        to_select = radio_labels[len(radio_labels) - 1]
-                to_select.click()
-
-                if radio_labels:
-                    continue
+                action = self.plan_answer(question)
             except Exception as e:
-                print("An exception occurred while filling up radio field")
+                print(f"An exception occurred while planning an answer for {question['kind']} field: {e}")
+                continue
+            if action is not None:
+                planned.append(action)
 
-            # Questions check
-            try:
-                question_text = question.find_element(By.TAG_NAME, 'label').text.lower()
-                print( question_text )  # TODO: Put logging behind debug flag
+        # Questions the rules could not answer are sent to the AI together in one request
+        deferred = [action['request'] for action in planned if action['op'] == 'ai']
+        ai_answers = self.ai_response_generator.generate_responses(deferred) if deferred else {}
 
-                txt_field_visible = False
+        actions = []
+        for action in planned:
+            if action['op'] == 'ai':
                 try:
-                    txt_field = question.find_element(By.TAG_NAME, 'input')
-                    txt_field_visible = True
-                except:
-                    try:
-                        txt_field = question.find_element(By.TAG_NAME, 'textarea')  # TODO: Test textarea
-                        txt_field_visible = True
-                    except:
-                        raise Exception("Could not find textarea or input tag for question")
-
-                if 'numeric' in txt_field.get_attribute('id').lower():
-                    # For decimal and integer response fields, the id contains 'numeric' while the type remains 'text' 
-                    text_field_type = 'numeric'
-                elif 'text' in txt_field.get_attribute('type').lower():
-                    text_field_type = 'text'
-                else:
-                    raise Exception("Could not determine input type of input field!")
-
-                to_enter = ''
-                if 'experience' in question_text or 'how many years in' in question_text:
-                    no_of_years = None
-                    for experience in self.experience:
-                        if experience.lower() in question_text:
-                            no_of_years = int(self.experience[experience])
-                            break
-                    if no_of_years is None:
-                        self.record_unprepared_question(text_field_type, question_text)
-                        # Use 4 as the default fallback for experience questions
-                        no_of_years = 4
-                    to_enter = no_of_years
-
-                elif 'grade point average' in question_text:
-                    to_enter = self.university_gpa
-
-                elif 'first name' in question_text:
-                    to_enter = self.personal_info['First Name']
-
-                elif 'last name' in question_text:
-                    to_enter = self.personal_info['Last Name']
-
-                elif 'name' in question_text:
-                    to_enter = self.personal_info['First Name'] + " " + self.personal_info['Last Name']
-
-                elif 'pronouns' in question_text:
-                    to_enter = self.personal_info['Pronouns']
-
-                elif 'phone' in question_text:
-                    to_enter = self.personal_info['Mobile Phone Number']
-
-                elif 'linkedin' in question_text:
-                    to_enter = self.personal_info['Linkedin']
+                    action = action['resolve'](ai_answers.get(action['request']['id']))
+                except Exception as e:
+                    print(f"An exception occurred while using the AI answer to {action['request']['question_text']}: {e}")
+                    continue
+            if action is not None:
+                actions.append(action)
 
-                elif 'message to hiring' in question_text or 'cover letter' in question_text:
-                    to_enter = self.personal_info['MessageToManager']
+        failed = apply_form_actions(self.browser, actions)
+        if failed:
+            print(f"Could not fill {len(failed)} of {len(actions)} fields: {failed}")
 
-                elif 'website' in question_text or 'github' in question_text or 'portfolio' in question_text:
-                    to_enter = self.personal_info['Website']
+    def plan_answer(self, question):
+        """
+        Decide how to answer one question record from snapshot_form.
 
-                elif 'notice' in question_text or 'weeks' in question_text:
-                    if text_field_type == 'numeric':
-                        to_enter = int(self.notice_period)
-                    else:
-                        to_enter = str(self.notice_period)
+        Returns:
+            A form action for apply_form_actions, or None if the question should be left as is
+        """
+        kind = question['kind']
+        if kind == 'radio':
+            return self.plan_radio_answer(question)
+        elif kind == 'text':
+            return self.plan_text_answer(question)
+        elif kind == 'date':
+            return dict(set_action(question, date.today().strftime("%m/%d/%y")), submit=True)
+        elif kind == 'select':
+            return self.plan_dropdown_answer(question)
+        elif kind == 'checkbox':
+            return self.plan_checkbox_answer(question)
+        return None
+
+    def ask_ai(self, question, question_text, response_type, resolve, options=None):
+        """
+        Defer a question to the AI so all of a form step's unhandled questions can be answered in one call.
 
-                elif 'salary' in question_text or 'expectation' in question_text or 'compensation' in question_text or 'CTC' in question_text:
-                    if text_field_type == 'numeric':
-                        to_enter = int(self.salary_minimum)
-                    else:
-                        to_enter = float(self.salary_minimum)
-                    self.record_unprepared_question(text_field_type, question_text)
-
-                # Since no response can be determined, we use AI to generate a response if available, falling back to 0 or empty string if the AI response is not available
-                if text_field_type == 'numeric':
-                    if not isinstance(to_enter, (int, float)):
-                        ai_response = self.ai_response_generator.generate_response(
-                            question_text,
-                            response_type="numeric"
-                        )
-                        # Use 4 as the fallback if AI response is not available
-                        to_enter = ai_response if ai_response is not None else 4
-                elif to_enter == '':
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="text"
-                    )
-                    to_enter = ai_response if ai_response is not None else " ‏‏‎ "
-
-                self.enter_text(txt_field, to_enter)
-                continue
-            except:
-                print("An exception occurred while filling up text field")  # TODO: Put logging behind debug flag
+        Args:
+            resolve: Called with the AI answer (None if unavailable), returns the form action to apply
 
-            # Date Check
-            try:
-                date_picker = question.find_element(By.CLASS_NAME, 'artdeco-datepicker__input ')
-                date_picker.clear()
-                date_picker.send_keys(date.today().strftime("%m/%d/%y"))
-                time.sleep(0.2)
-                date_picker.send_keys(Keys.RETURN)
-                time.sleep(0.2)
-                continue
-            except:
-                print("An exception occurred while filling up date picker field")  # TODO: Put logging behind debug flag
+        Returns:
+            A pending action that additional_questions resolves once the answers are in
+        """
+        request = {"id": question['index'], "question_text": question_text, "response_type": response_type, "options": options}
+        return {"id": question['index'], "op": "ai", "request": request, "resolve": resolve}
+
+    def plan_radio_answer(self, question):
+        radio_text = normalize_question(question['label'])
+        radio_options = [(i, option['text'].lower()) for i, option in enumerate(question['options'])]
+        print(f"Radio question text: {radio_text}")
+        print(f"radio options: {[opt[1] for opt in radio_options]}")
+
+        if len(radio_options) == 0:
+            raise Exception("No radio options found in question")
+
+        def choose(index):
+            option = question['options'][index]
+            print(f"Choosing answer: {option['text']}")
+            if option['checked']:
+                return None
+            return click_action(option['id'])
+
+        index = self.answerer.choose_radio_option(radio_text, radio_options)
+        if index is None:
+            print("No answer determined")
+            self.record_unprepared_question("radio", radio_text)
+
+            # Since no response can be determined, we use AI to identify the best response if available, falling back to the final option if the AI response is not available
+            return self.ask_ai(
+                question, radio_text, "choice",
+                lambda ai_response: choose(ai_response if ai_response is not None else len(radio_options) - 1),
+                options=radio_options
+            )
 
-            # Dropdown check
-            try:
-                question_text = question.find_element(By.TAG_NAME, 'label').text.lower()
-                print(f"Dropdown question text: {question_text}")  # TODO: Put logging behind debug flag
-                dropdown_field = question.find_element(By.TAG_NAME, 'select')
-
-                select = Select(dropdown_field)
-                options = [options.text for options in select.options]
-                print(f"Dropdown options: {options}")  # TODO: Put logging behind debug flag
-
-                if 'proficiency' in question_text:
-                    proficiency = "None"
-                    for language in self.languages:
-                        if language.lower() in question_text:
-                            proficiency = self.languages[language]
-                            break
-                    self.select_dropdown(dropdown_field, proficiency)
-
-                elif 'clearance' in question_text:
-                    answer = self.get_answer('securityClearance')
-
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        self.record_unprepared_question(text_field_type, question_text)
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'assessment' in question_text:
-                    answer = self.get_answer('assessment')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    # if choice == "":
-                    #    choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
+        return choose(index)
+
+    def plan_text_answer(self, question):
+        question_text = normalize_question(question['label'])
+        print(question_text)  # TODO: Put logging behind debug flag
+
+        text_field_type = question['input_type']
+        if text_field_type is None:
+            raise Exception("Could not determine input type of input field!")
+
+        to_enter = self.answerer.choose_text_answer(question_text, text_field_type)
+
+        # Since no response can be determined, we use AI to generate a response if available, falling back to 0 or empty string if the AI response is not available
+        if text_field_type == 'numeric':
+            if not isinstance(to_enter, (int, float)):
+                # Use 4 as the fallback if AI response is not available
+                return self.ask_ai(
+                    question, question_text, "numeric",
+                    lambda ai_response: set_action(question, ai_response if ai_response is not None else 4)
+                )
+        elif to_enter == '':
+            return self.ask_ai(
+                question, question_text, "text",
+                lambda ai_response: set_action(question, ai_response if ai_response is not None else " ‏‏‎ ")
+            )
 
-                elif 'commut' in question_text or 'on-site' in question_text or 'hybrid' in question_text or 'onsite' in question_text:
-                    answer = self.get_answer('commute')
+        return set_action(question, to_enter)
 
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    # if choice == "":
-                    #    choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'country code' in question_text:
-                    self.select_dropdown(dropdown_field, self.personal_info['Phone Country Code'])
-
-                elif 'north korea' in question_text:
-                    choice = ""
-                    for option in options:
-                        if 'no' in option.lower():
-                            choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
+    def plan_dropdown_answer(self, question):
+        question_text = normalize_question(question['label'])
+        options = [option['text'] for option in question['options']]
+        print(f"Dropdown question text: {question_text}")  # TODO: Put logging behind debug flag
+        print(f"Dropdown options: {options}")  # TODO: Put logging behind debug flag
 
-                elif 'previously employed' in question_text or 'previous employment' in question_text:
-                    choice = ""
-                    for option in options:
-                        if 'no' in option.lower():
-                            choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
+        if self.answerer.is_skipped('select', question_text):
+            return None  # assume email address is filled in properly by default
 
-                elif 'sponsor' in question_text:
-                    answer = self.get_answer('requireVisa')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'above 18' in question_text.lower():  # Check for "above 18" in the question text
-                    choice = ""
-                    for option in options:
-                        if 'yes' in option.lower():  # Select 'yes' option
-                            choice = option
-                    if choice == "":
-                        choice = options[0]  # Default to the first option if 'yes' is not found
-                    self.select_dropdown(dropdown_field, choice)
+        choice = self.answerer.choose_dropdown_option(question_text, options)
+        if choice is None:
+            print(f"Unhandled dropdown question: {question_text}")
+            self.record_unprepared_question("dropdown", question_text)
 
-                elif 'currently living' in question_text or 'currently reside' in question_text:
-                    answer = self.get_answer('residency')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'authorized' in question_text or 'authorised' in question_text:
-                    answer = self.get_answer('legallyAuthorized')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            # find some common words
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'citizenship' in question_text:
-                    answer = self.get_answer('legallyAuthorized')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'clearance' in question_text:
-                    answer = self.get_answer('clearance')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif any(keyword in question_text.lower() for keyword in
-                         [
-                             'aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
-                             'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
-                             'aborigine', 'ancestral', 'native peoples', 'original people',
-                             'first people', 'gender', 'race', 'disability', 'latino'
-                         ]):
-                    negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none']
-
-                    choice = ""
-                    choice = next((option for options in option.lower() if
-                               any(neg_keyword in option.lower() for neg_keyword in negative_keywords)), None)
-
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'email' in question_text:
-                    continue  # assume email address is filled in properly by default
-
-                elif 'experience' in question_text or 'understanding' in question_text or 'familiar' in question_text or 'comfortable' in question_text or 'able to' in question_text:
-                    answer = 'no'
-                    if self.experience_default > 0:
-                        answer = 'yes'
-                    else:
-                        for experience in self.experience:
-                            if experience.lower() in question_text and self.experience[experience] > 0:
-                                answer = 'yes'
-                                break
-                    if answer == 'no':
-                        # record unlisted experience as unprepared questions
-                        self.record_unprepared_question("dropdown", question_text)
-
-                    choice = ""
+            # Since no response can be determined, we use AI to identify the best response if available, falling back "yes" or the final response if the AI response is not available
+            def choose(ai_response):
+                choice = options[len(options) - 1]
+                if ai_response is not None:
+                    choice = options[ai_response]
+                else:
                     for option in options:
-                        if answer in option.lower():
+                        if 'yes' in option.lower():
                             choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
+                print(f"Selected option: {choice}")
+                return select_action(question, choice)
 
-                else:
-                    print(f"Unhandled dropdown question: {question_text}")
-                    self.record_unprepared_question("dropdown", question_text)
-
-                    # Since no response can be determined, we use AI to identify the best responseif available, falling back "yes" or the final response if the AI response is not available
-                    choice = options[len(options) - 1]
-                    choices = [(i, option) for i, option in enumerate(options)]
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="choice",
-                        options=choices
-                    )
-                    if ai_response is not None:
-                        choice = options[ai_response]
-                    else:
-                        choice = ""
-                        for option in options:
-                            if 'yes' in option.lower():
-                                choice = option
+            choices = [(i, option) for i, option in enumerate(options)]
+            return self.ask_ai(question, question_text, "choice", choose, options=choices)
 
-                    print(f"Selected option: {choice}")
-                    self.select_dropdown(dropdown_field, choice)
-                continue
-            except:
-                print("An exception occurred while filling up dropdown field")  # TODO: Put logging behind debug flag
+        print(f"Selected option: {choice}")
+        return select_action(question, choice)
 
-            # Checkbox check for agreeing to terms and service
-            try:
-                clickable_checkbox = question.find_element(By.TAG_NAME, 'label')
-                clickable_checkbox.click()
-            except:
-                print("An exception occurred while filling up checkbox field")  # TODO: Put logging behind debug flag
+    def plan_checkbox_answer(self, question):
+        options = question['options']
+        if len(options) == 1:
+            # Single checkbox for agreeing to terms and service
+            return None if options[0]['checked'] else click_action(options[0]['id'])
+        return self.plan_radio_answer(question)
 
     def unfollow(self):
         try:
             follow_checkbox = self.browser.find_element(By.XPATH,
                                                         "//label[contains(.,\'to stay up to date with their page.\')]").click()
             follow_checkbox.click()
-        except:
+        except Exception:
             pass
 
     def send_resume(self):
@@ -1205,7 +1526,7 @@ class LinkedinEasyApply:
                             upload_button.send_keys(self.cover_letter_dir)
                         elif 'required' in upload_type.text.lower():
                             upload_button.send_keys(self.resume_dir)
-        except:
+        except Exception:
             print("Failed to upload resume or cover letter!")
             pass
 
@@ -1260,13 +1581,14 @@ class LinkedinEasyApply:
                 elif 'contact info' in label:
                     self.contact_info(form)
                 elif 'resume' in label:
-                    self.send_resume()
+                    with self.metrics.span("upload"):
+                        self.send_resume()
                 else:
                     self.additional_questions(form)
             except Exception as e:
                 print("An exception occurred while filling up the form:")
                 print(e)
-        except:
+        except Exception:
             print("An exception occurred while searching for form in modal")
 
     def write_to_file(self, company, job_title, link, location, search_location, status="success", reason="", answers=None, ai_answers=None, time_taken_sec=None, error=None, screenshot=None):
@@ -1282,6 +1604,7 @@ class LinkedinEasyApply:
             "answers": answers or [],
             "ai_answers": ai_answers or [],
             "time_taken_sec": time_taken_sec,
+            "pacing_profile": self.pacing.profile,
             "error": error,
             "screenshot": screenshot
         }
@@ -1307,14 +1630,52 @@ class LinkedinEasyApply:
         self.logger.log_activity(entry)
         print(f'Logged unprepared question: {question_text}')
 
-    def scroll_slow(self, scrollable_element, start=0, end=3600, step=100, reverse=False):
-        if reverse:
-            start, end = end, start
-            step = -step
+    def log_ai_stats(self):
+        generator = self.ai_response_generator
+        if generator.calls == 0 and (generator.cache is None or generator.cache.hits == 0):
+            return
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "event": "ai_stats",
+            "calls": generator.calls,
+            "prompt_tokens_per_call": generator.prompt_tokens // generator.calls if generator.calls else None,
+            "cached_prompt_tokens": generator.cached_prompt_tokens,
+            "cache": generator.cache.stats() if generator.cache is not None else None
+        }
+        self.logger.log_activity(entry)
+        print(f"AI usage: {entry['calls']} calls, {entry['prompt_tokens_per_call']} prompt tokens per call, cache {entry['cache']}")
+
+    def log_navigation_stats(self):
+        stats = self.navigator.stats()
+        if not stats:
+            return
+        self.logger.log_activity({
+            "timestamp": datetime.utcnow().isoformat(),
+            "event": "navigation_stats",
+            "pages": stats
+        })
+        print("Page loads not waited for: " + ", ".join(
+            f"{page} {s['seconds']} s over {s['pages']} pages ({s['ms_per_page']} ms per page)" for page, s in stats.items()))
+
+    def scroll_until_loaded(self, scrollable_element, item_selector=None, idle_ms=250, timeout_ms=10000, pacing_action=None):
+        """
+        Scroll an element to the bottom and back, stopping as soon as its lazily loaded items stop appearing.
+
+        Args:
+            scrollable_element: The element to scroll
+            item_selector: CSS selector of the items whose count tells whether more content is loading
+            pacing_action: Pacing budget to spend on top of the time the scroll took, if any
 
-        for i in range(start, end, step):
-            self.browser.execute_script("arguments[0].scrollTo(0, {})".format(i), scrollable_element)
-            time.sleep(random.uniform(0.1, .6))
+        Returns:
+            A dict with the number of items found, the scroll steps taken and the elapsed milliseconds
+        """
+        result = self.browser.execute_async_script(
+            SCROLL_UNTIL_LOADED_JS, scrollable_element, item_selector, idle_ms, timeout_ms) or {}
+        if self.debug:
+            print(f"Scrolled in {result.get('steps')} steps and {result.get('elapsed_ms')} ms, {result.get('count')} items loaded")
+        if pacing_action:
+            self.pacing.pause(pacing_action, elapsed=result.get('elapsed_ms', 0) / 1000)
+        return result
 
     def avoid_lock(self):
         # In headless/cloud environments, avoid_lock does nothing
@@ -1371,7 +1732,11 @@ class LinkedinEasyApply:
         return extra_search_terms_str
 
     def next_job_page(self, position, location, job_page):
-        self.browser.get("https://www.linkedin.com/jobs/search/" + self.base_search_url +
-                         "&keywords=" + position + location + "&start=" + str(job_page * 25))
+        url = ("https://www.linkedin.com/jobs/search/" + self.base_search_url +
+               "&keywords=" + position + location + "&start=" + str(job_page * 25))
+        if self.navigator.open(self.browser, url, "search_results") == "login_wall":
+            print("The session is no longer valid, logging in again.")
+            self.load_login_page_and_login()
+            self.navigator.open(self.browser, url, "search_results")
 
         self.avoid_lock()
@@ -0,0 +1,80 @@
+import json
+import os
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _parse(lines):
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except Exception:
+            pass
+    return entries
+
+
+def tail(path, max_entries=1000, block_size=BLOCK_SIZE):
+    """
+    Read the newest entries of a JSONL file, seeking back from its end one block at a time.
+
+    Only the blocks holding the last max_entries lines are read, however long the file is. A last
+    line without its newline is still being written and is left for the next read.
+
+    Returns:
+        (entries, cursor): the entries oldest first, and the byte offset just past the last
+        complete line, to pass to read_since
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        newlines = 0
+        # One newline more than max_entries, so that the first line kept is known to be complete
+        while position > 0 and newlines <= max_entries:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            data = block + data
+    last_newline = data.rfind(b"\n")
+    if last_newline == -1:
+        return [], position
+    lines = data[:last_newline].split(b"\n")
+    if position > 0:
+        lines = lines[1:]  # Starts somewhere inside a line
+    return _parse(lines[-max_entries:] if max_entries else []), position + last_newline + 1
+
+
+def read_since(path, offset, max_entries=1000):
+    """
+    Read the entries appended to a JSONL file after offset, a cursor returned by tail or read_since.
+
+    Reading starts at offset, so the cost is that of the new lines only. At most max_entries are
+    returned; the rest come with the next call.
+
+    Returns:
+        {"entries": [...], "cursor": offset to pass next time, "reset": bool}. reset is true when
+        the cursor no longer fits the file (it was rotated or truncated); entries are then the
+        newest max_entries of the new file, as from tail
+    """
+    if not os.path.exists(path):
+        return {"entries": [], "cursor": 0, "reset": offset > 0}
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        valid = 0 <= offset <= size
+        if valid and offset > 0:
+            f.seek(offset - 1)
+            valid = f.read(1) == b"\n"  # A cursor always follows a newline
+        if not valid:
+            entries, cursor = tail(path, max_entries)
+            return {"entries": entries, "cursor": cursor, "reset": True}
+        f.seek(offset)
+        lines = []
+        for line in f:
+            if not line.endswith(b"\n") or len(lines) >= max_entries:
+                break  # Partially written, or beyond this call's share
+            lines.append(line)
+            offset += len(line)
+    return {"entries": _parse(lines), "cursor": offset, "reset": False}
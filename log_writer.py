@@ -0,0 +1,175 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+
+FSYNC_POLICIES = ("always", "interval", "never")
+# Longest wait of close() for the queued lines to be written out; app.stop_bot gives a stopping
+# bot longer than its closes take before killing it
+CLOSE_TIMEOUT = 10
+
+
+class LogWriter:
+    """
+    Background writer appending lines to log files for the bot's thread.
+
+    write() only puts the line on a bounded queue (it blocks if the disk falls that far behind).
+    A single thread takes the lines off in batches, flushed once batch_size lines are waiting or
+    flush_interval seconds after the first of them, and keeps the files open between batches.
+    After a flush the files are fsynced according to fsync: "always" after every batch,
+    "interval" at most every fsync_interval seconds, "never" leaves it to the OS.
+
+    A file is rotated, i.e. renamed with a time stamp (activity.log.20261017-093000.jsonl) and
+    started over, once it would grow past max_bytes or, with daily, on its first write of a new
+    day. Files registered with a header (CSV column names) get it written at the top of every new
+    file.
+
+    close() writes out everything queued; it is also registered with atexit. Lines written after
+    close() are appended directly.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=1.0, max_queue=10000, fsync="interval", fsync_interval=5.0,
+                 max_bytes=50 * 1024 * 1024, daily=False):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}, not {fsync!r}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.lines_written = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._headers = {}
+        self._files = {}  # path -> {"file", "size", "day" it was started}
+        self._last_fsync = time.monotonic()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def register(self, path, header=None):
+        """Declare a file, with the header line(s) every new copy of it starts with."""
+        self._headers[path] = header
+        if header and not os.path.exists(path):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                f.write(header)
+
+    def write(self, path, text):
+        """Queue text (one or more complete lines) to be appended to path; appended directly once closed."""
+        if self._closed.is_set():
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                f.write(text)
+            return
+        self._queue.put((path, text))
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                if self._closed.is_set():
+                    break
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._closed.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    # Short waits, so that close() is noticed without touching the queue from a signal handler
+                    batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+                except queue.Empty:
+                    continue
+            self._write_batch(batch)
+        self._drain()
+        for handle in self._files.values():
+            handle["file"].close()
+        self._files.clear()
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch, sync=self.fsync != "never")
+        elif self.fsync != "never":
+            self._sync()
+
+    def _write_batch(self, batch, sync=None):
+        try:
+            for path, text in batch:
+                size = len(text.encode('utf-8'))
+                handle = self._open(path, size)
+                handle["file"].write(text)
+                handle["size"] += size
+            for handle in self._files.values():
+                handle["file"].flush()
+            self.lines_written += len(batch)
+            self.batches += 1
+            if sync is None:
+                sync = self.fsync == "always" or (
+                    self.fsync == "interval" and time.monotonic() - self._last_fsync >= self.fsync_interval)
+            if sync:
+                self._sync()
+        except Exception as e:
+            print(f"Error writing logs: {e}")
+
+    def _sync(self):
+        for handle in self._files.values():
+            os.fsync(handle["file"].fileno())
+        self._last_fsync = time.monotonic()
+
+    def _open(self, path, incoming):
+        handle = self._files.get(path)
+        if handle is None:
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            day = date.fromtimestamp(os.path.getmtime(path)) if size else date.today()
+            handle = self._files[path] = {"file": None, "size": size, "day": day}
+        if self._rotation_due(path, handle, incoming):
+            self._rotate(path, handle)
+        if handle["file"] is None:
+            handle["file"] = open(path, 'a', newline='', encoding='utf-8')
+            header = self._headers.get(path)
+            if handle["size"] == 0 and header:
+                handle["file"].write(header)
+                handle["size"] += len(header.encode('utf-8'))
+        return handle
+
+    def _rotation_due(self, path, handle, incoming):
+        if handle["size"] <= len((self._headers.get(path) or "").encode('utf-8')):
+            return False  # Nothing written yet, a single oversized line does not rotate an empty file
+        too_big = self.max_bytes and handle["size"] + incoming > self.max_bytes
+        return bool(too_big or (self.daily and handle["day"] != date.today()))
+
+    def _rotate(self, path, handle):
+        if handle["file"] is not None:
+            handle["file"].flush()
+            if self.fsync != "never":
+                os.fsync(handle["file"].fileno())
+            handle["file"].close()
+            handle["file"] = None
+        root, extension = os.path.splitext(path)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        target = f"{root}.{stamp}{extension}"
+        number = 1
+        while os.path.exists(target):
+            target = f"{root}.{stamp}-{number}{extension}"
+            number += 1
+        os.replace(path, target)
+        handle["size"] = 0
+        handle["day"] = date.today()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Write out everything queued and close the files. Safe to call more than once."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join(timeout)
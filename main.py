@@ -1,9 +1,13 @@
 import yaml, os
+import signal
+import threading
+from functools import partial
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from validate_email import validate_email
 from linkedineasyapply import LinkedinEasyApply
+from browser_pool import BrowserPool, find_free_port
 import logging
 
 # Setup logging
@@ -11,8 +15,57 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("easyapply-bot")
 
-def init_browser():
+# What the lean profile keeps the browser from downloading: images, fonts, audio and video, ads
+# and analytics. The bot reads the DOM only, so none of it changes what it sees.
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg",
+    "*media.licdn.com/dms/image/*", "*media.licdn.com/playlist/*", "*dms.licdn.com/playlist/*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*linkedin.com/li/track*", "*linkedin.com/sensorCollect*",
+    "*doubleclick.net*", "*googletagmanager.com*", "*google-analytics.com*", "*googlesyndication.com*",
+    "*bat.bing.com*", "*facebook.net*", "*adservice.google.*",
+]
+
+LEAN_OPTIONS = [
+    '--blink-settings=imagesEnabled=false',
+    '--disable-remote-fonts',
+    '--mute-audio',
+    '--autoplay-policy=user-gesture-required',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+    '--no-first-run',
+]
+
+# Content settings, 2 = block
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.plugins': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+    'profile.default_content_setting_values.automatic_downloads': 2,
+}
+
+def init_browser(debugging_port=None, user_data_dir=None, lean=False, blocked_urls=None, page_load_strategy='normal'):
+    """
+    Launch Chrome and return its WebDriver.
+
+    Args:
+        debugging_port: Remote debugging port, a free one is picked when not given so that
+            several browsers can run side by side
+        user_data_dir: Profile directory, Chrome's temporary default when not given
+        lean: Don't load images, fonts, media, ads and analytics (LEAN_BLOCKED_URLS), and turn off
+            the browser features the bot doesn't use
+        blocked_urls: More URL patterns to block, with * wildcards
+        page_load_strategy: "normal" waits for the load event on navigation, "eager" for the DOM
+            only and "none" for nothing; the bot waits for its own readiness probes either way
+    """
     browser_options = Options()
+    browser_options.page_load_strategy = page_load_strategy
     # Recommended options for headless/cloud environments
     options = [
         '--disable-blink-features',
@@ -25,10 +78,16 @@ def init_browser():
         '--disable-dev-shm-usage',
         '--headless=new',  # Use new headless mode for Chrome 112+
         '--window-size=1920,1080',
-        '--remote-debugging-port=9222',
+        f'--remote-debugging-port={debugging_port or find_free_port()}',
     ]
+    if user_data_dir:
+        options.append(f'--user-data-dir={user_data_dir}')
+    if lean:
+        options.extend(LEAN_OPTIONS)
+        browser_options.add_experimental_option('prefs', LEAN_PREFS)
     for opt in options:
         browser_options.add_argument(opt)
+    blocked_urls = (LEAN_BLOCKED_URLS if lean else []) + list(blocked_urls or [])
 
     # Set Chrome binary location from environment variable if provided
     chrome_binary = os.environ.get('CHROME_BINARY')
@@ -42,6 +101,9 @@ def init_browser():
         service = Service("/usr/bin/chromedriver")
         driver = webdriver.Chrome(service=service, options=browser_options)
         driver.implicitly_wait(1)  # Wait time in seconds to allow loading of elements
+        if blocked_urls:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
         # driver.set_window_position(0, 0)
         # driver.maximize_window()
         return driver
@@ -165,24 +227,75 @@ def validate_yaml(config_path="config.yaml"):
 
     return parameters
 
-def run_bot(config_path="config.yaml"):
+def create_browser_pool(parameters):
+    """
+    Start a pool of warm browsers configured by the browserPool block of the configuration.
+
+    No spare is kept warm by default: each bot run (app.py starts a new main.py process) builds
+    its own pool, where a spare would sit idle for the whole run. Set warmSessions when one
+    long-lived process hands the same pool to several run_bot calls.
+    """
+    settings = parameters.get('browserPool') or {}
+    profile = parameters.get('browserProfile') or {}
+    launcher = partial(init_browser, lean=bool(profile.get('lean', False)), blocked_urls=profile.get('blockedUrls'),
+                       page_load_strategy=profile.get('pageLoadStrategy', 'normal'))
+    return BrowserPool(
+        launcher,
+        warm=int(settings.get('warmSessions', 0)),
+        max_jobs=int(settings.get('maxJobs', 100)),
+        max_rss_mb=float(settings.get('maxRssMb', 2048)),
+        profile_root=settings.get('profileDir', 'chrome_pool')
+    ).start()
+
+def exit_on_sigterm():
+    """
+    Turn SIGTERM (the web app's stop_bot sends it) into SystemExit, so that run_bot's cleanup runs:
+    the run is recorded, cookies are saved, the browsers are quit and the queued log lines are
+    written out before the process ends.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def handler(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)  # A second SIGTERM must not cut the cleanup short
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, handler)
+
+def run_bot(config_path="config.yaml", browser_pool=None):
     """
     Run the bot with the specified configuration
     
     Args:
         config_path: Path to the YAML configuration file
+        browser_pool: BrowserPool to take the browser from; a pool is started for this run
+            (and closed at its end) when not given
         
     Returns:
         The bot instance
     """
     logger.info("Starting LinkedIn EasyApply Bot")
     parameters = validate_yaml(config_path)
-    browser = init_browser()
+    exit_on_sigterm()
+    pool = browser_pool or create_browser_pool(parameters)
 
-    bot = LinkedinEasyApply(parameters, browser)
-    bot.login()
-    bot.security_check()
-    bot.start_applying()
+    session = None
+    bot = None
+    try:
+        session = pool.acquire()
+        bot = LinkedinEasyApply(parameters, session.driver, browser_session=session, browser_pool=pool)
+        bot.login()
+        bot.security_check()
+        bot.start_applying()
+    finally:
+        if bot is not None:
+            session = bot.browser_session
+        if session is not None:
+            pool.release(session)
+        if browser_pool is None:
+            pool.close()
+        if bot is not None:
+            bot.logger.close()
     
     return bot
 
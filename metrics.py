@@ -0,0 +1,312 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+# Upper bounds, in seconds, of the span duration histogram buckets
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class SpanRecorder:
+    """
+    Timing spans for the bot's hot path.
+
+    A span measures one named piece of work (a search page load, a modal step, an AI call...)
+    together with the WebDriver commands issued meanwhile and the time lost to implicit-wait
+    misses, i.e. find commands that found nothing. Finished spans are passed to sink, the
+    BotLogger's log_span, as "span" events; they go to a log of their own (spans.log.jsonl) so
+    the activity log stays readable, and app.py aggregates them into /api/metrics.
+
+    Commands and misses are counted per thread, and the stack of open spans is kept per thread
+    and per asyncio task, so spans opened by the fit evaluator's loop (several at once) neither
+    count the bot thread's commands nor become each other's parents.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.commands = 0
+        self.wait_miss_seconds = 0.0
+        self._local = threading.local()
+        self._stack = contextvars.ContextVar(f"span_stack_{id(self)}", default=())
+
+    def _thread_counts(self):
+        """[commands, wait_miss_seconds] of the current thread."""
+        counts = getattr(self._local, 'counts', None)
+        if counts is None:
+            counts = self._local.counts = [0, 0.0]
+        return counts
+
+    def attach(self, browser):
+        """Wrap browser.execute so that every WebDriver command is counted and misses are timed."""
+        from selenium.common.exceptions import NoSuchElementException
+
+        execute = browser.execute
+
+        def counting_execute(driver_command, params=None):
+            counts = self._thread_counts()
+            self.commands += 1
+            counts[0] += 1
+            if driver_command not in FIND_COMMANDS:
+                return execute(driver_command, params)
+            started = time.perf_counter()
+            try:
+                response = execute(driver_command, params)
+            except NoSuchElementException:
+                self._add_miss(counts, time.perf_counter() - started)
+                raise
+            if not response.get('value') and driver_command in ("findElements", "findChildElements"):
+                self._add_miss(counts, time.perf_counter() - started)
+            return response
+
+        browser.execute = counting_execute
+        return browser
+
+    def _add_miss(self, counts, seconds):
+        self.wait_miss_seconds += seconds
+        counts[1] += seconds
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Time the enclosed block and report it as a span.
+
+        Attributes (job_id, step...) are copied to the span; spans opened inside another span
+        record its name as parent.
+        """
+        stack = self._stack.get()
+        parent = stack[-1] if stack else None
+        token = self._stack.set(stack + (name,))
+        counts = self._thread_counts()
+        commands, wait_miss_seconds = counts
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield attributes
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self._stack.reset(token)
+            entry = {
+                "timestamp": datetime.utcnow().isoformat(),
+                "event": "span",
+                "name": name,
+                "parent": parent,
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "commands": counts[0] - commands,
+                "wait_miss_ms": round((counts[1] - wait_miss_seconds) * 1000, 1),
+            }
+            entry.update(attributes)
+            if self.sink is not None:
+                try:
+                    self.sink(entry)
+                except Exception as e:
+                    print(f"Could not record span {name}: {e}")
+
+
+class WebDriverProfiler:
+    """
+    Opt-in profiler of WebDriver round trips, attributed to the line of bot code that made them.
+
+    Every command is counted and timed per (call site, command, selector). Find commands that
+    came back empty are recorded as misses together with the time they burned, which with an
+    implicit wait is mostly waiting. write_report() ranks the call sites by total time.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.stats = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "misses": 0, "miss_seconds": 0.0})
+        self._lock = threading.Lock()
+        self._skip = (os.sep + "selenium" + os.sep, os.path.abspath(__file__))
+
+    def attach(self, browser):
+        from selenium.common.exceptions import NoSuchElementException
+
+        execute = browser.execute
+
+        def profiled_execute(driver_command, params=None):
+            site = self._call_site()
+            started = time.perf_counter()
+            missed = False
+            try:
+                response = execute(driver_command, params)
+                missed = driver_command in FIND_COMMANDS and not response.get('value')
+                return response
+            except NoSuchElementException:
+                missed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                selector = f"{params.get('using')}={params.get('value')}" if params and 'using' in params else ""
+                with self._lock:
+                    stat = self.stats[(site, driver_command, selector)]
+                    stat["calls"] += 1
+                    stat["seconds"] += elapsed
+                    if missed:
+                        stat["misses"] += 1
+                        stat["miss_seconds"] += elapsed
+
+        browser.execute = profiled_execute
+        return browser
+
+    def _call_site(self, depth=2):
+        """The innermost frames of bot code that led to the command, e.g. "waits.py:70 check < linkedineasyapply.py:1042 apply_to_job"."""
+        sites = []
+        frame = sys._getframe(2)
+        while frame is not None and len(sites) < depth:
+            filename = frame.f_code.co_filename
+            if not any(part in filename for part in self._skip):
+                sites.append(f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}")
+            frame = frame.f_back
+        return " < ".join(sites) or "unknown"
+
+    def report(self, applications=0, limit=30):
+        """Return the ranked report as text, most expensive call sites first."""
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda item: -item[1]["seconds"])
+            total_seconds = sum(stat["seconds"] for _, stat in rows)
+            total_calls = sum(stat["calls"] for _, stat in rows)
+            miss_seconds = sum(stat["miss_seconds"] for _, stat in rows)
+        lines = [
+            f"WebDriver profile of the run started {self.started_at.isoformat(timespec='seconds')}",
+            f"{total_calls} commands in {total_seconds:.1f} s, {miss_seconds:.1f} s of which in find misses"
+            + (f", {total_seconds / applications:.1f} s per application over {applications} applications" if applications else ""),
+            "",
+            f"{'rank':>4} {'total s':>8} {'calls':>6} {'avg ms':>7} {'misses':>6} {'miss s':>7}  command / call site / selector",
+        ]
+        for rank, ((site, command, selector), stat) in enumerate(rows[:limit], 1):
+            lines.append(f"{rank:>4} {stat['seconds']:>8.2f} {stat['calls']:>6} {stat['seconds'] / stat['calls'] * 1000:>7.1f} "
+                         f"{stat['misses']:>6} {stat['miss_seconds']:>7.2f}  {command} {site} {selector}".rstrip())
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, log_dir="logs", applications=0):
+        """Print the report and save it as logs/webdriver_profile_<start time>.txt."""
+        report = self.report(applications)
+        print(report)
+        path = os.path.join(log_dir, f"webdriver_profile_{self.started_at.strftime('%Y%m%d-%H%M%S')}.txt")
+        os.makedirs(log_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        return path
+
+
+class MetricsAggregator:
+    """
+    Prometheus counters and histograms built from the activity log and the spans log.
+
+    Only the lines appended since the last update are read, so serving /api/metrics stays cheap
+    however long the logs get. The totals start over if either log is truncated or rotated; a
+    rotated log is told apart by its identity (device, inode and, where the platform has it,
+    creation time), since it may have grown past the old offset by the time it is read.
+    """
+
+    def __init__(self, log_path, spans_path=None):
+        self.log_paths = [path for path in (log_path, spans_path) if path is not None]
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._offsets = {path: 0 for path in self.log_paths}
+        self._identities = {path: None for path in self.log_paths}
+        self._spans = defaultdict(lambda: {"count": 0, "errors": 0, "seconds": 0.0, "commands": 0,
+                                           "wait_miss_seconds": 0.0, "buckets": [0] * len(DURATION_BUCKETS)})
+        self._applications = defaultdict(int)
+        self._application_seconds = defaultdict(float)
+
+    @staticmethod
+    def _identity(stat):
+        # Not st_ctime: on POSIX it changes with every append
+        return stat.st_dev, stat.st_ino, getattr(stat, 'st_birthtime', None)
+
+    def update(self):
+        with self._lock:
+            stats = {}
+            for path in self.log_paths:
+                try:
+                    stats[path] = os.stat(path)
+                except OSError:
+                    stats[path] = None
+            if any(self._replaced(path, stats[path]) for path in self.log_paths):
+                self._reset()  # Both logs are read again, so no totals are counted twice
+            for path in self.log_paths:
+                if stats[path] is not None and stats[path].st_size > self._offsets[path]:
+                    self._read(path)
+
+    def _replaced(self, path, stat):
+        if stat is None:
+            return self._offsets[path] > 0
+        identity = self._identities[path]
+        return stat.st_size < self._offsets[path] or (identity is not None and identity != self._identity(stat))
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            self._identities[path] = self._identity(os.fstat(f.fileno()))
+            f.seek(self._offsets[path])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written line, read it next time
+                self._offsets[path] += len(line)
+                try:
+                    self._add(json.loads(line))
+                except Exception:
+                    pass
+
+    def _add(self, entry):
+        if entry.get("event") == "span":
+            span = self._spans[entry["name"]]
+            seconds = entry.get("duration_ms", 0) / 1000
+            span["count"] += 1
+            span["errors"] += entry.get("status") == "error"
+            span["seconds"] += seconds
+            span["commands"] += entry.get("commands", 0)
+            span["wait_miss_seconds"] += entry.get("wait_miss_ms", 0) / 1000
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    span["buckets"][i] += 1
+        elif not entry.get("event") and entry.get("status"):
+            self._applications[entry["status"]] += 1
+            if entry.get("time_taken_sec") is not None:
+                self._application_seconds[entry["status"]] += entry["time_taken_sec"]
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        self.update()
+        with self._lock:
+            lines = [
+                "# HELP easyapply_span_duration_seconds Duration of bot spans",
+                "# TYPE easyapply_span_duration_seconds histogram",
+            ]
+            for name, span in sorted(self._spans.items()):
+                for bound, count in zip(DURATION_BUCKETS, span["buckets"]):
+                    lines.append(f'easyapply_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {count}')
+                lines.append(f'easyapply_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {span["count"]}')
+                lines.append(f'easyapply_span_duration_seconds_sum{{span="{name}"}} {span["seconds"]:.3f}')
+                lines.append(f'easyapply_span_duration_seconds_count{{span="{name}"}} {span["count"]}')
+            for metric, key, help_text in (
+                    ("easyapply_span_errors_total", "errors", "Spans that ended with an exception"),
+                    ("easyapply_webdriver_commands_total", "commands", "WebDriver commands issued within spans"),
+                    ("easyapply_implicit_wait_miss_seconds_total", "wait_miss_seconds",
+                     "Time spent in find commands that found nothing")):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, span in sorted(self._spans.items()):
+                    value = span[key]
+                    lines.append(f'{metric}{{span="{name}"}} {value:.3f}' if isinstance(value, float)
+                                 else f'{metric}{{span="{name}"}} {value}')
+            lines.append("# HELP easyapply_applications_total Applications by status")
+            lines.append("# TYPE easyapply_applications_total counter")
+            for status, count in sorted(self._applications.items()):
+                lines.append(f'easyapply_applications_total{{status="{status}"}} {count}')
+            lines.append("# HELP easyapply_application_seconds_total Time spent on applications by status")
+            lines.append("# TYPE easyapply_application_seconds_total counter")
+            for status, seconds in sorted(self._application_seconds.items()):
+                lines.append(f'easyapply_application_seconds_total{{status="{status}"}} {seconds:.1f}')
+            return "\n".join(lines) + "\n"
@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Readiness probes for navigations under the "eager" or "none" page-load strategy. browser.get
+# then returns before images, fonts and late scripts are done, and the bot polls the probes of
+# the page kind it asked for until one passes. Each poll is a single script call.
+
+# arguments[0]: names of the probes to try, in order
+PAGE_READY_JS = """
+if (window.__easyApplyLeaving) {
+    return null;  // Still the page the bot navigated away from
+}
+const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const probes = {
+    results_list: () => !!document.querySelector('.scaffold-layout__list-item, [data-occludable-job-id]')
+                        && !!document.querySelector('.jobs-search-results-list__text'),
+    no_results: () => visible(document.querySelector('.jobs-search-two-pane__no-results-banner--expand, .jobs-search-no-results-banner'))
+                      || (!!document.body && document.readyState !== 'loading'
+                          && (document.body.textContent || '').toLowerCase().includes('unfortunately, things are')),
+    login_form: () => !!document.getElementById('username') && !!document.getElementById('password'),
+    feed: () => location.pathname.startsWith('/feed') && !!document.querySelector('main'),
+    login_wall: () => ['/authwall', '/login', '/uas/login', '/checkpoint/lg/'].some((path) => location.pathname.startsWith(path)),
+    dom_ready: () => document.readyState !== 'loading',
+};
+for (const name of arguments[0]) {
+    if (probes[name]()) {
+        return {probe: name, ready_at: performance.now()};
+    }
+}
+return null;
+"""
+
+# Run on the page about to be left: marks it for PAGE_READY_JS and reads when its load event
+# fired (0 if it has not yet), in milliseconds since the page's navigation started
+LEAVE_PAGE_JS = """
+window.__easyApplyLeaving = true;
+const entry = performance.getEntriesByType('navigation')[0];
+return {load_end: entry ? entry.loadEventEnd : 0, now: performance.now()};
+"""
+
+# The probes of each kind of page, tried in order
+PAGE_PROBES = {
+    "search_results": ("results_list", "no_results", "login_wall"),
+    "login": ("login_form", "feed"),
+    "feed": ("feed", "login_wall"),
+    "linkedin": ("dom_ready",),
+}
+
+
+class Navigator:
+    """
+    Page loads that return as soon as the page is usable rather than fully loaded.
+
+    When the bot leaves a page, the time between the probe passing and the page's load event (or
+    the moment it was left, if the load event had not fired by then) is recorded per page kind as
+    the time saved over the "normal" page-load strategy. With "normal" it comes out as zero.
+    """
+
+    def __init__(self, timeout=20, poll_frequency=0.05):
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.saved = defaultdict(lambda: {"pages": 0, "seconds": 0.0})
+        self._current = None
+
+    def open(self, browser, url, page, timeout=None):
+        """
+        Load url and wait for one of the readiness probes of page (a PAGE_PROBES key).
+
+        Returns:
+            The name of the probe that passed, or None if none did within timeout seconds, in which
+            case the caller carries on as it would after a plain browser.get
+        """
+        timeout = timeout or self.timeout
+        self.leave(browser)
+        browser.get(url)
+        try:
+            state = WebDriverWait(browser, timeout, poll_frequency=self.poll_frequency).until(
+                lambda driver: driver.execute_script(PAGE_READY_JS, list(PAGE_PROBES[page])))
+        except TimeoutException:
+            print(f"No readiness probe of the {page} page passed within {timeout} s, continuing anyway.")
+            return None
+        self._current = (browser, page, state["ready_at"])
+        return state["probe"]
+
+    def leave(self, browser):
+        """Mark the current page as left and record how much of its load the bot did not wait for."""
+        current, self._current = self._current, None
+        try:
+            timing = browser.execute_script(LEAVE_PAGE_JS)
+        except Exception:
+            return
+        if current is None or current[0] is not browser or not timing:
+            return
+        _, page, ready_at = current
+        load_end = timing["load_end"] or timing["now"]
+        stats = self.saved[page]
+        stats["pages"] += 1
+        stats["seconds"] += max(load_end - ready_at, 0) / 1000
+
+    def stats(self):
+        """Time saved per page kind: {page: {"pages", "seconds", "ms_per_page"}}."""
+        return {page: {"pages": stats["pages"], "seconds": round(stats["seconds"], 1),
+                       "ms_per_page": round(stats["seconds"] * 1000 / stats["pages"]) if stats["pages"] else 0}
+                for page, stats in self.saved.items()}
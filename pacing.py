@@ -0,0 +1,53 @@
+import random
+import time
+
+# Ranges of seconds the bot waits before each kind of action, per pacing profile.
+# "fast" only waits for the page to be ready; "human-like" adds pauses a person would take.
+PROFILES = {
+    "fast": {},
+    "human-like": {
+        "results_page": (1.0, 3.0),
+        "scroll_results": (2.0, 5.0),
+        "open_job": (0.5, 1.5),
+        "read_description": (1.0, 4.0),
+        "step": (0.5, 2.0),
+    },
+}
+
+
+class Pacing:
+    """
+    Human-like delays, kept apart from the waits that the page itself requires.
+
+    Each action has a budget: a range of seconds spent pausing for it in total, however many
+    steps the action takes. The profile is chosen with pacing.profile in the config, and single
+    actions can be overridden with pacing.delays, e.g. {"scroll_results": [1, 2]}.
+    """
+
+    def __init__(self, profile="fast", delays=None, metrics=None):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown pacing profile {profile!r}, expected one of {sorted(PROFILES)}")
+        self.profile = profile
+        self.delays = dict(PROFILES[profile])
+        for action, bounds in (delays or {}).items():
+            self.delays[action] = tuple(bounds)
+        self.paused_seconds = 0.0
+        self.metrics = metrics
+
+    def delay(self, action):
+        low, high = self.delays.get(action, (0, 0))
+        return random.uniform(low, high) if high > 0 else 0.0
+
+    def pause(self, action, elapsed=0.0):
+        """
+        Sleep for the budget of action, minus the elapsed seconds the action already took.
+        """
+        remaining = self.delay(action) - elapsed
+        if remaining > 0:
+            if self.metrics is not None:
+                with self.metrics.span("sleep", action=action):
+                    time.sleep(remaining)
+            else:
+                time.sleep(remaining)
+            self.paused_seconds += remaining
+        return max(remaining, 0.0)
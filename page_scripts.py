@@ -0,0 +1,106 @@
+# JavaScript snippets run in the page through execute_script. Each one replaces a series of
+# WebDriver round trips with a single call that returns plain JSON (plus WebElements where
+# the bot still needs to interact with a node).
+
+# arguments[0]: the <ul> holding the job tiles (optional, defaults to the whole document)
+# Returns a list of tile records, one per job card, in page order.
+EXTRACT_JOB_TILES_JS = """
+const root = arguments[0] || document;
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const records = [];
+root.querySelectorAll('.scaffold-layout__list-item').forEach((tile) => {
+    const titleLink = tile.querySelector('.job-card-list__title--link');
+    const card = tile.querySelector('[data-job-id]');
+    let poster = '';
+    for (const span of tile.querySelectorAll('span')) {
+        const spanText = text(span);
+        const index = spanText.indexOf(' is hiring for this');
+        if (index !== -1) {
+            poster = spanText.substring(0, index);
+            break;
+        }
+    }
+    let applied = false;
+    for (const item of tile.querySelectorAll('.job-card-container__footer-item, .job-card-container__footer-job-state')) {
+        if (/^applied\\b/i.test(text(item))) {
+            applied = true;
+            break;
+        }
+    }
+    const href = titleLink ? (titleLink.href || titleLink.getAttribute('href') || '') : '';
+    records.push({
+        job_id: tile.getAttribute('data-occludable-job-id') || (card ? card.getAttribute('data-job-id') : '') || '',
+        title: text(titleLink ? (titleLink.querySelector('strong') || titleLink) : null),
+        company: text(tile.querySelector('.artdeco-entity-lockup__subtitle')),
+        poster: poster,
+        location: text(tile.querySelector('.job-card-container__metadata-item')),
+        apply_method: text(tile.querySelector('.job-card-container__apply-method')),
+        link: href.split('?')[0],
+        applied: applied,
+        title_element: titleLink
+    });
+});
+return records;
+"""
+
+# arguments[0]: list of lowercase phrases to look for in the page text
+# Returns the status flags the bot needs about the current page (URL and which phrases are
+# present) instead of transferring the whole page source.
+PAGE_STATUS_JS = """
+const body = document.body ? (document.body.textContent || '').toLowerCase() : '';
+const phrases = {};
+for (const phrase of arguments[0]) {
+    phrases[phrase] = body.includes(phrase);
+}
+return {url: location.href, phrases: phrases};
+"""
+
+# Asynchronous (execute_async_script). arguments: [scrollable element, CSS selector of the loaded
+# items to count or null, idle time in ms, timeout in ms, callback]
+# Scrolls the element one viewport at a time, waiting after each scroll until the page stops
+# changing, and stops once the bottom is reached and no new item appeared for the idle time.
+# The element is scrolled back to the top before returning {count, steps, elapsed_ms}.
+SCROLL_UNTIL_LOADED_JS = """
+const [el, selector, idleMs, timeoutMs, done] = arguments;
+const started = performance.now();
+const count = () => selector ? el.querySelectorAll(selector).length : 0;
+let last = count();
+let steps = 0;
+let timer = null;
+let finished = false;
+const finish = () => {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    clearTimeout(timer);
+    observer.disconnect();
+    el.scrollTop = 0;
+    done({count: count(), steps: steps, elapsed_ms: Math.round(performance.now() - started)});
+};
+const step = () => {
+    const atBottom = el.scrollTop + el.clientHeight >= el.scrollHeight - 2;
+    if (atBottom || performance.now() - started > timeoutMs) {
+        finish();
+        return;
+    }
+    el.scrollTop += Math.max(el.clientHeight, 100);
+    steps++;
+    schedule();
+};
+const schedule = () => {
+    clearTimeout(timer);
+    timer = setTimeout(step, idleMs);
+};
+const observer = new MutationObserver(() => {
+    const current = count();
+    if (current !== last) {
+        // New items are still being rendered: wait for them to settle before the next step
+        last = current;
+        schedule();
+    }
+});
+observer.observe(el, {childList: true, subtree: true});
+setTimeout(finish, timeoutMs + idleMs);
+step();
+"""
@@ -0,0 +1,438 @@
+import functools
+import re
+
+# Declarative answer rules for Easy Apply questions.
+#
+# Each rule maps a set of substrings of the (normalised) question to an answer strategy.
+# Rules are shared between question kinds; RULE_ORDER lists, per kind, which rules apply and
+# in which priority order (the first rule in the list with any matching keyword wins).
+# The table is compiled once into a single regular expression covering every kind.
+#
+# Answer strategies:
+#   ("checkbox", key)     'yes'/'no' from the checkboxes section of the config
+#   ("fixed", answer)     always the given answer
+#   ("residency",)        'yes'/'no' from residentStatus
+#   ("degree",)           'yes' if a completed degree is named in the question
+#   ("experience",)       'yes' if experience is assumed or a listed skill is named in the question
+#   ("familiarity",)      like "experience", but only counts skills with more than 0 years
+#   ("decline",)          the option declining to answer (EEO questions)
+#   ("language",)         the configured level for the language named in the question
+#   ("personal", key)     a value from personalInfo
+#   ("full_name",)        first and last name
+#   ("above_18",)         the 'yes' option, or the first option
+#   ("citizenship",)      citizenship dropdown answer derived from legallyAuthorized
+#   ("skip",)             leave the field untouched
+#   ("years",)            years of experience for the skill named in the question
+#   ("gpa",)              universityGpa
+#   ("notice",)           noticePeriod
+#   ("salary",)           salaryMinimum
+
+EEO_KEYWORDS = [
+    'aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
+    'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
+    'aborigine', 'ancestral', 'native peoples', 'original people',
+    'first people', 'gender', 'race', 'disability', 'latino'
+]
+
+# Option texts that decline to answer, per question kind
+DECLINE_KEYWORDS = {
+    'radio': ['prefer', 'decline', 'don\'t', 'specified', 'none', 'no'],
+    'select': ['prefer', 'decline', 'don\'t', 'specified', 'none'],
+}
+
+QUESTION_RULES = [
+    # Choice questions (radio buttons and dropdowns)
+    {"name": "drivers_licence", "keywords": ['driver\'s licence', 'driver\'s license'],
+     "answer": ("checkbox", "driversLicence")},
+    {"name": "eeo", "keywords": EEO_KEYWORDS, "radio_keywords": ['torres', 'do you identify'],
+     "answer": ("decline",)},
+    {"name": "assessment", "keywords": ['assessment'],
+     "answer": ("checkbox", "assessment"), "select_default_last": False},
+    {"name": "clearance", "keywords": ['clearance'],
+     "answer": ("checkbox", "securityClearance"), "select_default_last": False},
+    {"name": "north_korea", "keywords": ['north korea'], "answer": ("fixed", "no")},
+    {"name": "previously_employed", "keywords": ['previously employed', 'previous employment'],
+     "radio_keywords": ['previously employ', 'previous employ'], "answer": ("fixed", "no")},
+    {"name": "authorized", "keywords": ['authorized', 'authorised'], "radio_keywords": ['legally'],
+     "answer": ("checkbox", "legallyAuthorized")},
+    {"name": "certified", "keywords": ['certified', 'certificate', 'cpa', 'chartered accountant', 'qualification'],
+     "answer": ("checkbox", "certifiedProfessional")},
+    {"name": "urgent", "keywords": ['urgent'], "answer": ("checkbox", "urgentFill")},
+    {"name": "commute", "keywords": ['commut', 'on-site', 'hybrid', 'onsite'],
+     "answer": ("checkbox", "commute"), "select_default_last": False},
+    {"name": "remote", "keywords": ['remote'], "answer": ("checkbox", "remote")},
+    {"name": "background_check", "keywords": ['background check'], "answer": ("checkbox", "backgroundCheck")},
+    {"name": "drug_test", "keywords": ['drug test'], "answer": ("checkbox", "drugTest")},
+    {"name": "residency", "keywords": ['currently living', 'currently reside'], "radio_keywords": ['right to live'],
+     "answer": ("residency",)},
+    {"name": "education", "keywords": ['level of education'], "answer": ("degree",)},
+    {"name": "experience", "keywords": ['experience'], "answer": ("experience",)},
+    {"name": "familiarity", "keywords": ['experience', 'understanding', 'familiar', 'comfortable', 'able to'],
+     "answer": ("familiarity",)},
+    {"name": "data_retention", "keywords": ['data retention'], "answer": ("fixed", "no")},
+    {"name": "sponsor", "keywords": ['sponsor'], "answer": ("checkbox", "requireVisa")},
+    {"name": "proficiency", "keywords": ['proficiency'], "answer": ("language",)},
+    {"name": "country_code", "keywords": ['country code'], "answer": ("personal", "Phone Country Code")},
+    {"name": "above_18", "keywords": ['above 18'], "answer": ("above_18",)},
+    {"name": "citizenship", "keywords": ['citizenship'], "answer": ("citizenship",)},
+    {"name": "email", "keywords": ['email'], "answer": ("skip",)},
+
+    # Text and numeric questions
+    {"name": "years", "keywords": ['experience', 'how many years in'], "answer": ("years",)},
+    {"name": "gpa", "keywords": ['grade point average'], "answer": ("gpa",)},
+    {"name": "first_name", "keywords": ['first name'], "answer": ("personal", "First Name")},
+    {"name": "last_name", "keywords": ['last name'], "answer": ("personal", "Last Name")},
+    {"name": "full_name", "keywords": ['name'], "answer": ("full_name",)},
+    {"name": "pronouns", "keywords": ['pronouns'], "answer": ("personal", "Pronouns")},
+    {"name": "phone", "keywords": ['phone'], "answer": ("personal", "Mobile Phone Number")},
+    {"name": "linkedin", "keywords": ['linkedin'], "answer": ("personal", "Linkedin")},
+    {"name": "message", "keywords": ['message to hiring', 'cover letter'], "answer": ("personal", "MessageToManager")},
+    {"name": "website", "keywords": ['website', 'github', 'portfolio'], "answer": ("personal", "Website")},
+    {"name": "notice", "keywords": ['notice', 'weeks'], "answer": ("notice",)},
+    {"name": "salary", "keywords": ['salary', 'expectation', 'compensation', 'ctc'], "answer": ("salary",)},
+]
+
+RULE_ORDER = {
+    'radio': ['drivers_licence', 'eeo', 'assessment', 'clearance', 'north_korea', 'previously_employed',
+              'authorized', 'certified', 'urgent', 'commute', 'remote', 'background_check', 'drug_test',
+              'residency', 'education', 'experience', 'data_retention', 'sponsor'],
+    'select': ['proficiency', 'clearance', 'assessment', 'commute', 'country_code', 'north_korea',
+               'previously_employed', 'sponsor', 'above_18', 'residency', 'authorized', 'citizenship',
+               'eeo', 'email', 'familiarity'],
+    'text': ['years', 'gpa', 'first_name', 'last_name', 'full_name', 'pronouns', 'phone', 'linkedin',
+             'message', 'website', 'notice', 'salary'],
+}
+
+def normalize_question(text):
+    """Lowercase a question and collapse runs of whitespace (labels often contain line breaks)."""
+    return ' '.join(text.lower().split())
+
+
+def compile_keywords(keywords):
+    """
+    Compile keywords into one alternation regex matching the longest keyword at a position.
+
+    The keywords are folded into a trie so the engine tests each character once per position
+    instead of once per keyword. The pattern starts with a plain alternation, so the engine skips
+    ahead to the possible first characters rather than trying every position; use
+    find_keywords to also get the matches that overlap an earlier one.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    return re.compile(build(trie))
+
+
+def find_keywords(pattern, text):
+    """
+    Every position's longest keyword match of a compile_keywords pattern, overlapping ones
+    included: each search resumes one character after the previous match started.
+    """
+    found = []
+    search = pattern.search
+    match = search(text)
+    while match is not None:
+        found.append(match.group())
+        match = search(text, match.start() + 1)
+    return found
+
+
+class RuleMatcher:
+    """
+    Finds the highest-priority rule among those whose keywords occur in a question.
+
+    Rules are listed in priority order. The question is scanned for keywords, which may cover
+    other rule sets too (QuestionRules scans once for every kind); each of them maps to the best
+    rule among the rule keywords it starts with, since those match at the same position whenever
+    it does.
+    """
+
+    def __init__(self, rules, keywords=None):
+        self.rules = rules
+        priority = {}
+        for index, rule in enumerate(rules):
+            for keyword in rule['keywords']:
+                priority.setdefault(keyword, index)
+        self._priority = {}
+        for keyword in (priority if keywords is None else keywords):
+            indexes = [index for other, index in priority.items() if keyword.startswith(other)]
+            if indexes:
+                self._priority[keyword] = min(indexes)
+        self._pattern = compile_keywords(priority) if priority else None
+
+    def best(self, keywords):
+        """
+        Returns:
+            The rule of highest priority among the found keywords, or None
+        """
+        best = None
+        for keyword in keywords:
+            index = self._priority.get(keyword)
+            if index is not None and (best is None or index < best):
+                best = index
+        return self.rules[best] if best is not None else None
+
+    def match(self, text):
+        if self._pattern is None:
+            return None
+        return self.best(find_keywords(self._pattern, text))
+
+
+class KeywordIndex:
+    """
+    Longest-match lookup of configured keys (skills, languages, degrees) inside a question.
+
+    Keys are lowercased once; the longest key occurring anywhere in the text wins, so
+    "sql server" is preferred over "sql" when both are configured.
+    """
+
+    def __init__(self, mapping):
+        self._values = {}
+        for key, value in mapping.items():
+            self._values.setdefault(str(key).lower(), (key, value))
+        self._pattern = compile_keywords(self._values) if self._values else None
+        self.lookup = functools.lru_cache(maxsize=4096)(self._lookup)
+
+    def _lookup(self, text):
+        """
+        Returns:
+            The (key, value) pair of the longest configured key found in the text, or None
+        """
+        if self._pattern is None:
+            return None
+        longest = ''
+        for keyword in find_keywords(self._pattern, text):
+            if len(keyword) > len(longest):
+                longest = keyword
+        return self._values[longest] if longest else None
+
+
+class QuestionRules:
+    """
+    Compiled rule table: one RuleMatcher per question kind ('radio', 'select', 'text').
+
+    A question is scanned once, for the keywords of every kind together, and the keywords found
+    are memoised because the same questions come back on application after application; each
+    kind then only picks its best rule among them.
+    """
+
+    def __init__(self, rules=QUESTION_RULES, order=RULE_ORDER):
+        by_name = {rule['name']: rule for rule in rules}
+        tables = {}
+        for kind, names in order.items():
+            tables[kind] = []
+            for name in names:
+                rule = dict(by_name[name])
+                rule['keywords'] = list(rule['keywords']) + list(rule.get(kind + '_keywords', []))
+                tables[kind].append(rule)
+        keywords = list(dict.fromkeys(keyword for table in tables.values() for rule in table
+                                      for keyword in rule['keywords']))
+        self._matchers = {kind: RuleMatcher(table, keywords) for kind, table in tables.items()}
+        self._pattern = compile_keywords(keywords) if keywords else None
+        self.keywords = functools.lru_cache(maxsize=4096)(self._keywords)
+
+    def _keywords(self, text):
+        """The keywords of any kind found in a normalised question."""
+        if self._pattern is None:
+            return ()
+        return tuple(find_keywords(self._pattern, text))
+
+    def match(self, kind, text):
+        """
+        Returns:
+            The rule dict for a normalised question of the given kind, or None if no rule applies
+        """
+        return self._matchers[kind].best(self.keywords(text))
+
+
+class QuestionAnswerer:
+    """
+    Answers Easy Apply questions from the candidate's configuration using the compiled rules.
+
+    Questions that need attention are reported through on_unprepared(answer_type, question_text);
+    questions no rule can answer are returned as None so the caller can fall back to AI.
+    """
+
+    def __init__(self, checkboxes, experience, languages, personal_info, residency, university_gpa,
+                 salary_minimum, notice_period, on_unprepared=None, rules=None):
+        self.checkboxes = checkboxes
+        self.experience = experience
+        self.experience_default = int(experience['default'])
+        self.languages = languages
+        self.personal_info = personal_info
+        self.residency = residency
+        self.university_gpa = university_gpa
+        self.salary_minimum = salary_minimum
+        self.notice_period = notice_period
+        self.on_unprepared = on_unprepared or (lambda answer_type, question_text: None)
+        self.rules = rules or QuestionRules()
+        self.skills = KeywordIndex(experience)
+        self.language_levels = KeywordIndex(languages)
+        self.degrees = KeywordIndex({degree: True for degree in checkboxes.get('degreeCompleted', [])})
+
+    def get_answer(self, question):
+        return 'yes' if self.checkboxes[question] else 'no'
+
+    def yes_no(self, rule, question_text):
+        strategy = rule['answer']
+        if strategy[0] == 'checkbox':
+            return self.get_answer(strategy[1])
+        elif strategy[0] == 'fixed':
+            return strategy[1]
+        elif strategy[0] == 'residency':
+            return 'yes' if self.residency else 'no'
+        elif strategy[0] == 'degree':
+            return 'yes' if self.degrees.lookup(question_text) else None
+        elif strategy[0] == 'experience':
+            if self.experience_default > 0 or self.skills.lookup(question_text):
+                return 'yes'
+            return None
+        elif strategy[0] == 'familiarity':
+            skill = self.skills.lookup(question_text)
+            if self.experience_default > 0 or (skill and skill[1] > 0):
+                return 'yes'
+            return 'no'
+        return None
+
+    def choose_radio_option(self, radio_text, radio_options):
+        """
+        Pick a radio option for a normalised question.
+
+        Args:
+            radio_text: The normalised question text
+            radio_options: List of (index, lowercased option text) tuples
+
+        Returns:
+            The index of the option to select, or None if no answer could be determined
+        """
+        rule = self.rules.match('radio', radio_text)
+        if rule is None:
+            return None
+        if rule['answer'][0] == 'decline':
+            return next((i for i, option in radio_options if
+                         any(keyword in option for keyword in DECLINE_KEYWORDS['radio'])), None)
+
+        answer = self.yes_no(rule, radio_text)
+        if answer is None:
+            return None
+        for i, option in radio_options:
+            if answer in option:
+                return i
+        return None
+
+    def is_skipped(self, kind, question_text):
+        rule = self.rules.match(kind, question_text)
+        return rule is not None and rule['answer'][0] == 'skip'
+
+    def choose_dropdown_option(self, question_text, options):
+        """
+        Pick a dropdown option for a normalised question.
+
+        Returns:
+            The visible text of the option to select, or None if no answer could be determined
+        """
+        rule = self.rules.match('select', question_text)
+        if rule is None:
+            return None
+        strategy = rule['answer'][0]
+
+        if strategy == 'language':
+            language = self.language_levels.lookup(question_text)
+            return language[1] if language else "None"
+        elif strategy == 'personal':
+            return self.personal_info[rule['answer'][1]]
+        elif strategy == 'above_18':
+            choice = ""
+            for option in options:
+                if 'yes' in option.lower():
+                    choice = option
+            return choice if choice != "" else options[0]  # Default to the first option if 'yes' is not found
+        elif strategy == 'citizenship':
+            choice = ""
+            if self.get_answer('legallyAuthorized') == 'yes':
+                for option in options:
+                    if 'no' in option.lower():
+                        choice = option
+            return choice if choice != "" else options[len(options) - 1]
+        elif strategy == 'decline':
+            return next((option for option in options if
+                         any(keyword in option.lower() for keyword in DECLINE_KEYWORDS['select'])), None)
+        elif strategy == 'familiarity':
+            answer = self.yes_no(rule, question_text)
+            if answer == 'no':
+                # record unlisted experience as unprepared questions
+                self.on_unprepared("dropdown", question_text)
+            choice = ""
+            for option in options:
+                if answer in option.lower():
+                    choice = option
+            return choice if choice != "" else options[len(options) - 1]
+
+        choice = self.yes_no_option(options, self.yes_no(rule, question_text),
+                                    default_last=rule.get('select_default_last', True))
+        if choice == "" and rule['name'] == 'clearance':
+            self.on_unprepared("dropdown", question_text)
+        return choice
+
+    def yes_no_option(self, options, answer, default_last=True):
+        """
+        Pick the option matching a yes/no answer: the last option for 'yes', the last option containing 'no' otherwise.
+        """
+        choice = ""
+        for option in options:
+            if answer == 'yes':
+                choice = option
+            elif 'no' in option.lower():
+                choice = option
+        if choice == "" and default_last:
+            choice = options[len(options) - 1]
+        return choice
+
+    def choose_text_answer(self, question_text, text_field_type):
+        """
+        Pick the value for a text or numeric field.
+
+        Returns:
+            The value to enter, or '' if no answer could be determined
+        """
+        rule = self.rules.match('text', question_text)
+        if rule is None:
+            return ''
+        strategy = rule['answer']
+
+        if strategy[0] == 'years':
+            skill = self.skills.lookup(question_text)
+            if skill is None:
+                self.on_unprepared(text_field_type, question_text)
+                # Use 4 as the default fallback for experience questions
+                return 4
+            return int(skill[1])
+        elif strategy[0] == 'gpa':
+            return self.university_gpa
+        elif strategy[0] == 'personal':
+            return self.personal_info[strategy[1]]
+        elif strategy[0] == 'full_name':
+            return self.personal_info['First Name'] + " " + self.personal_info['Last Name']
+        elif strategy[0] == 'notice':
+            if text_field_type == 'numeric':
+                return int(self.notice_period)
+            return str(self.notice_period)
+        elif strategy[0] == 'salary':
+            self.on_unprepared(text_field_type, question_text)
+            if text_field_type == 'numeric':
+                return int(self.salary_minimum)
+            return float(self.salary_minimum)
+        return ''
@@ -0,0 +1,84 @@
+import glob
+import hashlib
+import json
+import os
+
+from resume_index import chunk_resume
+
+
+class ResumeCache:
+    """
+    On-disk cache of extracted resume text and its chunks.
+
+    Entries are keyed by the file's absolute path, size, modification time and content hash, so
+    editing the resume or pointing uploads.resume / textResume to another file invalidates them.
+    A new entry replaces the older versions of the same file; entries of other files (another
+    resume, another configuration) are kept, up to max_entries, the least recently used going
+    first.
+    """
+
+    def __init__(self, cache_dir=os.path.join("logs", "cache"), max_chunk_chars=600, max_entries=8):
+        self.cache_dir = cache_dir
+        self.max_chunk_chars = max_chunk_chars
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, path):
+        path = os.path.abspath(os.path.expanduser(path))
+        stat = os.stat(path)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+        raw = json.dumps([path, stat.st_size, stat.st_mtime_ns, digest.hexdigest(), self.max_chunk_chars])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def load(self, path, extract):
+        """
+        Return the cached {"text", "chunks"} entry for path, calling extract(path) on a miss.
+
+        Raises whatever os.stat or extract raise when the file cannot be read.
+        """
+        key = self.key(path)
+        file_key = hashlib.sha256(os.path.abspath(os.path.expanduser(path)).encode('utf-8')).hexdigest()[:12]
+        cache_path = os.path.join(self.cache_dir, f"resume_{file_key}_{key[:32]}.json")
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(cache_path)  # Most recently used
+            return entry
+        except (OSError, ValueError):
+            pass
+
+        text = extract(path)
+        entry = {"path": path, "text": text, "chunks": chunk_resume(text, self.max_chunk_chars)}
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+        self._prune(file_key, cache_path)
+        return entry
+
+    def _prune(self, file_key, cache_path):
+        """Remove the older versions of this file's entry, then the least recently used entries."""
+        entries = []
+        for other in glob.glob(os.path.join(self.cache_dir, "resume_*.json")):
+            if other == cache_path:
+                continue
+            if os.path.basename(other).startswith(f"resume_{file_key}_"):
+                self._remove(other)  # An older version of the same resume, never read again
+                continue
+            try:
+                entries.append((os.path.getmtime(other), other))
+            except OSError:
+                pass
+        entries.sort(reverse=True)
+        for _, other in entries[max(self.max_entries - 1, 0):]:
+            self._remove(other)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
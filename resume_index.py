@@ -0,0 +1,109 @@
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+SECTION_BREAK = re.compile(r'\n\s*\n')
+
+# Rough size of an English/French token for the OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def chunk_resume(text, max_chars=600):
+    """
+    Split resume text into chunks of whole paragraphs of at most max_chars characters.
+
+    Short paragraphs (headings, single lines) are merged into the next one so each chunk
+    keeps enough context to be useful on its own. Paragraphs longer than max_chars are
+    split on line boundaries.
+    """
+    pieces = []
+    for paragraph in SECTION_BREAK.split(text or ''):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        current = ''
+        for line in paragraph.splitlines():
+            if current and len(current) + len(line) + 1 > max_chars:
+                pieces.append(current)
+                current = ''
+            current = f"{current}\n{line}" if current else line
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = ''
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ResumeIndex:
+    """
+    BM25 index over resume chunks, used to pick the parts of the resume relevant to a question.
+    """
+
+    def __init__(self, text, max_chunk_chars=600, k1=1.5, b=0.75, chunks=None):
+        # chunks, when given, are the result of chunk_resume(text) computed earlier (see ResumeCache)
+        self.chunks = chunks if chunks is not None else chunk_resume(text, max_chunk_chars)
+        self.k1 = k1
+        self.b = b
+        self._term_counts = [Counter(tokenize(chunk)) for chunk in self.chunks]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0
+        document_frequency = Counter()
+        for counts in self._term_counts:
+            document_frequency.update(counts.keys())
+        total = len(self.chunks)
+        self._idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    def scores(self, query):
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        scores = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term, 0)
+                if frequency:
+                    norm = self.k1 * (1 - self.b + self.b * length / (self._average_length or 1))
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def excerpt(self, query, token_budget):
+        """
+        Return the chunks most relevant to the query that fit in token_budget, in resume order.
+
+        The first chunk (usually the name, headline and summary) is always included when it fits.
+        """
+        if not self.chunks:
+            return ""
+        scores = self.scores(query)
+        ranked = sorted(range(len(self.chunks)), key=lambda i: (-scores[i], i))
+        ranked.remove(0)
+        ranked.insert(0, 0)
+        selected = []
+        used = 0
+        for index in ranked:
+            cost = estimate_tokens(self.chunks[index])
+            if used + cost > token_budget:
+                continue
+            selected.append(index)
+            used += cost
+        return "\n\n".join(self.chunks[index] for index in sorted(selected))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark page loads and browser memory with and without the lean browser profile.
+
+A local server serves scripts/fixtures/search_results.html weighed down the way LinkedIn pages
+are: images, web fonts, a video and ad/analytics scripts, each answered after --asset-latency-ms
+to stand in for CDN round trips. The third-party scripts are served under paths named after
+their hosts (/googletagmanager.com/gtm.js...) so that the lean profile's host patterns match them
+locally. Every asset is sent with Cache-Control: no-store, so each load pays for all of them.
+
+For the "normal" and "lean" profiles of main.init_browser, reports the time browser.get takes
+(the default page-load strategy waits for the load event), the requests and bytes the page
+pulled from the server, and the resident memory of Chrome's processes after the runs (needs
+psutil).
+
+Usage:
+    python scripts/bench_browser_profile.py [--runs 10] [--images 40] [--image-kb 60] [--asset-latency-ms 50]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from browser_pool import BrowserSession
+from main import init_browser
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+TRACKERS = ["/googletagmanager.com/gtm.js", "/snap.licdn.com/li.lms-analytics/insight.min.js",
+            "/px.ads.linkedin.com/collect.js", "/bat.bing.com/bat.js"]
+
+
+def heavy_page(args):
+    """The search results fixture with the assets a real results page loads appended."""
+    html = (FIXTURES_DIR / "search_results.html").read_text(encoding="utf-8")
+    assets = ["<style>"]
+    for i in range(args.fonts):
+        assets.append(f"@font-face {{ font-family: f{i}; src: url('/assets/font-{i}.woff2') format('woff2'); }}")
+    assets.append("body { font-family: " + ", ".join(f"f{i}" for i in range(args.fonts)) + ", sans-serif; }</style>")
+    assets.extend(f'<img src="/assets/image-{i}.jpg" width="64" height="64">' for i in range(args.images))
+    assets.append('<video src="/assets/clip.mp4" autoplay muted></video>')
+    assets.extend(f'<script src="{tracker}"></script>' for tracker in TRACKERS)
+    return html.replace("</body>", "\n".join(assets) + "\n</body>")
+
+
+def make_server(args):
+    page = heavy_page(args).encode("utf-8")
+    stats = {"requests": 0, "bytes": 0}
+    lock = threading.Lock()
+    sizes = {".jpg": args.image_kb, ".woff2": args.font_kb, ".mp4": args.video_kb, ".js": args.script_kb}
+    types = {".jpg": "image/jpeg", ".woff2": "font/woff2", ".mp4": "video/mp4", ".js": "text/javascript"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            extension = os.path.splitext(path)[1]
+            if path == "/search":
+                body, content_type = page, "text/html; charset=utf-8"
+            elif extension in sizes:
+                time.sleep(args.asset_latency_ms / 1000)
+                body = b"//" + b" " * (sizes[extension] * 1024) if extension == ".js" else os.urandom(sizes[extension] * 1024)
+                content_type = types[extension]
+            else:
+                self.send_error(404)
+                return
+            with lock:
+                stats["requests"] += 1
+                stats["bytes"] += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def bench_profile(name, lean, url, args, stats):
+    browser = init_browser(lean=lean)
+    try:
+        browser.set_page_load_timeout(120)
+        browser.get(url + "?warmup")
+        before = dict(stats)
+        durations = []
+        for run in range(args.runs):
+            started = time.perf_counter()
+            browser.get(f"{url}?run={run}")
+            durations.append(time.perf_counter() - started)
+        requests = (stats["requests"] - before["requests"]) / args.runs
+        transferred = (stats["bytes"] - before["bytes"]) / args.runs / 1024
+        rss_mb = BrowserSession(browser, None, None).rss_mb()
+        durations.sort()
+        print(f"{name:>6}: median {durations[len(durations) // 2] * 1000:.0f} ms, "
+              f"p95 {durations[max(int(len(durations) * 0.95) - 1, 0)] * 1000:.0f} ms per load, "
+              f"{requests:.0f} requests and {transferred:.0f} KB per load, "
+              + (f"Chrome RSS {rss_mb:.0f} MB" if rss_mb is not None else "Chrome RSS unknown (install psutil)"))
+    finally:
+        browser.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page loads with and without the lean browser profile")
+    parser.add_argument("--runs", type=int, default=10, help="Timed loads per profile")
+    parser.add_argument("--images", type=int, default=40, help="Images on the page")
+    parser.add_argument("--image-kb", type=int, default=60)
+    parser.add_argument("--fonts", type=int, default=4, help="Web fonts on the page")
+    parser.add_argument("--font-kb", type=int, default=40)
+    parser.add_argument("--video-kb", type=int, default=2000)
+    parser.add_argument("--script-kb", type=int, default=80, help="Size of each ad/analytics script")
+    parser.add_argument("--asset-latency-ms", type=float, default=50, help="Delay before each asset is served")
+    args = parser.parse_args()
+
+    server, stats = make_server(args)
+    url = f"http://127.0.0.1:{server.server_address[1]}/search"
+    try:
+        for name, lean in (("normal", False), ("lean", True)):
+            bench_profile(name, lean, url, args, stats)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark of the apply loop, offline, against scripts/fake_webdriver.py.
+
+"search" runs start_applying for one position and location: every result page goes through
+apply_jobs and every job through the whole Easy Apply flow, additional_questions included.
+"questions" times additional_questions alone on the screening questions step. The fake driver
+serves the fixtures in scripts/fixtures with the given latency per WebDriver command, page load
+time, implicit wait and render delay, so the numbers show how the bot's own round trips and
+waits add up without a browser or network. The AI is disabled (no API key): questions the rules
+cannot answer get the bot's fallback answers.
+
+Reports jobs/hour, WebDriver commands per job and the latency of every span (search page,
+modal step, confirmation...). The bot's state (logs/, seen jobs, caches) lives in a temporary
+directory, so each run starts from scratch and the real logs are left untouched.
+
+Usage:
+    python scripts/bench_end_to_end.py [--pages 2] [--latency-ms 2] [--page-load-ms 800] [--implicit-wait-ms 1000]
+                                       [--render-ms 150] [--pacing fast] [--config config.yaml] [--verbose]
+    python scripts/bench_end_to_end.py --scenario questions [--runs 100]
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from selenium.webdriver.common.by import By
+
+from fake_webdriver import FIXTURES_DIR, FakeWebDriver
+from linkedineasyapply import LinkedinEasyApply
+
+
+def load_parameters(config_path, pacing):
+    with open(config_path, 'r', encoding='utf-8') as f:
+        parameters = yaml.safe_load(f)
+    parameters.update({
+        'openaiApiKey': '',
+        'evaluateJobFit': False,
+        'profileWebDriver': False,
+        'positions': parameters['positions'][:1],
+        'locations': parameters['locations'][:1],
+        'outputFileDirectory': '.',
+        'textResume': '',
+        'pacing': dict(parameters.get('pacing') or {}, profile=pacing),
+    })
+    return parameters
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+
+class SpanCollector:
+    """SpanRecorder sink keeping the spans of the run in memory, by name."""
+
+    def __init__(self):
+        self.spans = defaultdict(list)
+
+    def __call__(self, entry):
+        self.spans[entry['name']].append(entry)
+
+    def report(self):
+        lines = [f"{'span':<18} {'count':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'cmds':>6} {'miss ms':>8}"]
+        for name, entries in sorted(self.spans.items(), key=lambda item: -sum(e['duration_ms'] for e in item[1])):
+            durations = [entry['duration_ms'] for entry in entries]
+            lines.append(f"{name:<18} {len(entries):>6} {sum(durations) / len(durations):>9.1f} "
+                         f"{percentile(durations, 0.5):>8.1f} {percentile(durations, 0.95):>8.1f} {max(durations):>8.1f} "
+                         f"{sum(e['commands'] for e in entries) / len(entries):>6.1f} "
+                         f"{sum(e['wait_miss_ms'] for e in entries) / len(entries):>8.1f}")
+        return "\n".join(lines)
+
+
+def make_browser(args):
+    browser = FakeWebDriver(fixtures_dir=args.fixtures, search_pages=args.pages, latency=args.latency_ms / 1000,
+                            latencies={"get": args.page_load_ms / 1000}, render_delay=args.render_ms / 1000)
+    browser.implicitly_wait(args.implicit_wait_ms / 1000)
+    return browser
+
+
+@contextlib.contextmanager
+def quiet(verbose):
+    """Hide the bot's output, tracebacks of failed applications included."""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def bench_search(args, parameters):
+    browser = make_browser(args)
+    collector = SpanCollector()
+    with quiet(args.verbose):
+        bot = LinkedinEasyApply(parameters, browser)
+        bot.metrics.sink = collector
+        commands = bot.metrics.commands
+        started = time.perf_counter()
+        bot.start_applying()
+        elapsed = time.perf_counter() - started
+    commands = bot.metrics.commands - commands
+
+    jobs = collector.spans.get('job', [])
+    applied = sum(1 for span in jobs if span.get('outcome') == 'success')
+    print(f"{len(jobs)} jobs attempted, {applied} applications sent ({browser.applications_submitted} submitted "
+          f"to the fake site, {browser.applications_discarded} discarded) in {elapsed:.1f} s")
+    print(f"Throughput: {applied / elapsed * 3600:.0f} jobs/hour")
+    if jobs:
+        print(f"WebDriver commands: {commands} in total, {commands / len(jobs):.1f} per job "
+              f"({sum(span['commands'] for span in jobs) / len(jobs):.1f} within the application itself)")
+    print()
+    print(collector.report())
+    print()
+    print("Most frequent commands: " + ", ".join(f"{name} {count}" for name, count in browser.command_counts.most_common(8)))
+    if browser.unsupported_scripts:
+        print(f"Scripts the fake driver does not emulate (returned None): {dict(browser.unsupported_scripts)}")
+
+
+def bench_questions(args, parameters):
+    browser = make_browser(args)
+    with quiet(args.verbose):
+        bot = LinkedinEasyApply(parameters, browser)
+    durations = []
+    commands = []
+    unanswered = []
+    for _ in range(args.runs):
+        browser.show_modal_step(args.step)
+        form = browser.find_element(By.CLASS_NAME, "jobs-easy-apply-modal__content").find_element(By.TAG_NAME, 'form')
+        before = bot.metrics.commands
+        started = time.perf_counter()
+        with quiet(args.verbose):
+            bot.additional_questions(form)
+        durations.append((time.perf_counter() - started) * 1000)
+        commands.append(bot.metrics.commands - before)
+        unanswered.append(len(browser.step_errors()))
+    print(f"additional_questions on step '{args.step}', {args.runs} runs: mean {sum(durations) / len(durations):.1f} ms, "
+          f"p50 {percentile(durations, 0.5):.1f} ms, p95 {percentile(durations, 0.95):.1f} ms, "
+          f"{sum(commands) / len(commands):.1f} WebDriver commands per call, "
+          f"{max(unanswered)} required fields left invalid")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the apply loop end to end against the fake WebDriver")
+    parser.add_argument("--scenario", choices=("search", "questions"), default="search")
+    parser.add_argument("--config", default=str(ROOT / "config.yaml"), help="Bot configuration to run with")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR),
+                        help="Directory with search_results.html and the Easy Apply steps in easy_apply/")
+    parser.add_argument("--pages", type=int, default=2, help="Result pages served per search")
+    parser.add_argument("--latency-ms", type=float, default=2, help="Latency of every WebDriver command")
+    parser.add_argument("--page-load-ms", type=float, default=800, help="Latency of a navigation")
+    parser.add_argument("--implicit-wait-ms", type=float, default=1000,
+                        help="Implicit wait, paid by every find that misses (main.init_browser uses 1 s)")
+    parser.add_argument("--render-ms", type=float, default=150, help="Delay before the page reacts to a click")
+    parser.add_argument("--pacing", default="fast", help="Pacing profile (fast or human-like)")
+    parser.add_argument("--runs", type=int, default=100, help="Runs of the questions scenario")
+    parser.add_argument("--step", default="additional_questions", help="Modal step fixture of the questions scenario")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's output")
+    args = parser.parse_args()
+
+    parameters = load_parameters(args.config, args.pacing)
+    args.fixtures = os.path.abspath(args.fixtures)
+    workdir = tempfile.mkdtemp(prefix="easyapply-bench-")
+    os.chdir(workdir)
+    if args.scenario == "search":
+        bench_search(args, parameters)
+    else:
+        bench_questions(args, parameters)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the page checks of the apply loop: full page_source scans against in-page probes.
+
+"legacy" fetches browser.page_source after each step and scans it for the form error messages,
+as apply_to_job used to; "probe" runs the modal state probe the bot polls after each step
+(waits.MODAL_STATE_JS) and the page status probe, which only return the modal's inline error
+texts and a few flags. The page source of a real LinkedIn job page is several megabytes, so
+pass a saved one with --page to see production sizes.
+
+Usage:
+    python scripts/bench_page_probes.py [--page scripts/fixtures/easy_apply_modal.html] [--runs 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import init_browser
+from form_engine import FORM_ERROR_MESSAGES, matching_errors
+from page_scripts import PAGE_STATUS_JS
+from waits import modal_state
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_check(browser):
+    page_source = browser.page_source
+    failed = any(error in page_source.lower() for error in FORM_ERROR_MESSAGES)
+    return failed, len(page_source.encode('utf-8'))
+
+
+def probe_check(browser):
+    """The bot's error check after a step plus the page status probe, keeping the results to measure their size."""
+    modal = modal_state(browser)
+    errors = matching_errors(modal['errors'])
+    status = browser.execute_script(PAGE_STATUS_JS, ['security check', 'quick verification'])
+    return bool(errors), len(json.dumps(modal).encode('utf-8')) + len(json.dumps(status).encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page_source scans against in-page probes")
+    parser.add_argument("--page", default=str(FIXTURES_DIR / "easy_apply_modal.html"), help="Saved page with an Easy Apply modal")
+    parser.add_argument("--runs", type=int, default=20, help="Number of timed runs per strategy")
+    args = parser.parse_args()
+
+    browser = init_browser()
+    try:
+        browser.get(Path(os.path.abspath(args.page)).as_uri())
+        for name, check in (("legacy", legacy_check), ("probe", probe_check)):
+            durations = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                failed, size = check(browser)
+                durations.append(time.perf_counter() - start)
+            median = sorted(durations)[len(durations) // 2]
+            print(f"{name:>6}: errors found: {failed}, median {median * 1000:.1f} ms/step, {size} bytes transferred/step")
+    finally:
+        browser.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Report prompt tokens per AI call before and after the token-budgeted candidate context.
+
+"Before" is the prompt generate_response used to build: the full resume and every configured
+skill in a single user message. "After" is what AIResponseGenerator sends now; the part of
+it that is the same for every call (and can be served from the provider's prompt cache) is
+reported separately. Token counts use tiktoken when it is installed and the ~4 characters
+per token estimate otherwise.
+
+Usage:
+    python scripts/bench_prompt_tokens.py [--config config.yaml] [--resume resume.txt] [--budget 1500]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from linkedineasyapply import AIResponseGenerator
+from resume_index import estimate_tokens
+
+try:
+    import tiktoken
+    ENCODING = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text):
+        return len(ENCODING.encode(text))
+except ImportError:
+    count_tokens = estimate_tokens
+
+INSTRUCTIONS = "You are a helpful assistant answering job application questions professionally and concisely. Use the candidate's background information and resume to personalize responses."
+
+
+def legacy_prompt(generator, question_text):
+    context = f"""
+        Personal Information:
+        - Name: {generator.personal_info['First Name']} {generator.personal_info['Last Name']}
+        - Current Role: {generator.experience.get('currentRole', '')}
+        - Skills: {', '.join(generator.experience.keys())}
+        - Languages: {', '.join(f'{lang}: {level}' for lang, level in generator.languages.items())}
+        - Professional Summary: {generator.personal_info.get('MessageToManager', '')}
+
+        Resume Content (Give the greatest weight to this information, if specified):
+        {generator.resume_content}
+        """
+    return INSTRUCTIONS + f"Using this candidate's background and resume:\n{context}\n\nPlease answer this job application question: {question_text}"
+
+
+def load_questions(limit):
+    questions = []
+    with open(ROOT / "logs" / "activity.log.jsonl", encoding='utf-8', errors='replace') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except Exception:
+                continue
+            if entry.get('question_text') and entry['question_text'] not in questions:
+                questions.append(entry['question_text'])
+    return questions[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare prompt tokens per AI call")
+    parser.add_argument("--config", default=str(ROOT / "config.yaml"), help="Bot configuration")
+    parser.add_argument("--resume", help="Resume to use instead of the configured one (text or PDF)")
+    parser.add_argument("--budget", type=int, help="Token budget for the resume (defaults to aiContextTokenBudget)")
+    parser.add_argument("--questions", type=int, default=25, help="Number of sample questions")
+    args = parser.parse_args()
+
+    with open(args.config, encoding='utf-8') as f:
+        parameters = yaml.safe_load(f)
+    resume = args.resume or parameters['uploads']['resume']
+    generator = AIResponseGenerator(
+        api_key=None,
+        personal_info=parameters['personalInfo'],
+        experience=parameters['experience'],
+        languages=parameters['languages'],
+        resume_path=resume,
+        text_resume_path=resume if resume.lower().endswith('.txt') else parameters.get('textResume'),
+        context_token_budget=args.budget or int(parameters.get('aiContextTokenBudget', 1500))
+    )
+
+    questions = load_questions(args.questions)
+    before, after, prefix = [], [], count_tokens(generator.candidate_context)
+    for question in questions:
+        before.append(count_tokens(legacy_prompt(generator, question)))
+        messages = generator._build_messages(INSTRUCTIONS, f"Please answer this job application question: {question}", question)
+        after.append(sum(count_tokens(message['content']) for message in messages))
+
+    print(f"Resume: {count_tokens(generator.resume_content)} tokens in {len(generator.resume_index.chunks)} chunks")
+    print(f"Questions: {len(questions)}")
+    print(f"  before: {sum(before) / len(before):.0f} prompt tokens per call")
+    print(f"  after:  {sum(after) / len(after):.0f} prompt tokens per call, "
+          f"of which {prefix} are a stable prefix shared by every call")
+
+
+if __name__ == "__main__":
+    main()
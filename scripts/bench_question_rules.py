@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled question rules against the baseline's if/elif chains.
+
+Every question of the corpus is classified as a radio, dropdown and numeric question by both
+implementations: the compiled rules, and the chains of the baseline's additional_questions
+copied verbatim (BaselineAnswerer). The script reports throughput for each, then the questions
+where the two differ, by question kind and by what the baseline did: it raised (the EEO
+branches and the residency lookup), asked the AI where a rule now applies (the 'CTC' test that
+never matched lowercased text), or chose another answer.
+
+The logged corpus is read from logs/unprepared_questions.csv, or from the question entries of
+logs/activity.log.jsonl when the CSV does not exist, and repeated up to --size questions. As
+repeats are answered from the memo, the matchers themselves are measured on --unique distinct
+questions, built from question templates seen on Easy Apply forms and a vocabulary of skills,
+tools and companies.
+
+Usage:
+    python scripts/bench_question_rules.py [--config config.yaml] [--size 5000] [--unique 10000] [--repeat 5] [--show 3]
+"""
+import argparse
+import csv
+import itertools
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from question_rules import QuestionAnswerer, normalize_question
+
+RADIO_OPTIONS = ['yes', 'no']
+DROPDOWN_OPTIONS = ['Select an option', 'Yes', 'No']
+
+QUESTION_TEMPLATES = [
+    "How many years of work experience do you have with {skill}?",
+    "How many years of {skill} experience do you currently have?",
+    "Do you have experience with {skill} in a production environment at {company}-sized companies?",
+    "Are you familiar with {skill} and {other}?",
+    "How comfortable are you working with {skill} on a daily basis?",
+    "Rate your proficiency in {language} for our {company} team",
+    "What is your level of proficiency in {language}?",
+    "Are you legally authorized to work in {country}?",
+    "Will you now or in the future require sponsorship for employment visa status in {country}?",
+    "Are you comfortable commuting to our {city} office for this hybrid role?",
+    "This is an on-site position in {city}. Are you able to relocate?",
+    "Are you currently living in {country} or within commuting distance of {city}?",
+    "Have you previously been employed by {company} or any of its subsidiaries?",
+    "Do you hold an active {clearance} security clearance?",
+    "Have you completed the following level of education: {degree}?",
+    "Do you have a valid driver's license for {country}?",
+    "Are you willing to undergo a background check and drug test as required by {company}?",
+    "What are your salary expectations for this {skill} role in {currency}?",
+    "What is your current CTC for this {skill} role, in {currency}?",
+    "Do you currently reside in {city}, where {company} is based?",
+    "What is your notice period in weeks before you could join {company}?",
+    "Please share your GitHub or portfolio website showing {skill} work",
+    "What is your LinkedIn profile URL? We use it to review your {skill} background",
+    "Are you above 18 years of age and eligible to work at {company}?",
+    "Which pronouns do you use? ({note})",
+    "Please enter your mobile phone number with country code for {country}",
+    "Do you identify as a member of a visible minority in {country}? ({note})",
+    "What is your gender? This helps {company} with reporting ({note})",
+    "Please write a short message to hiring manager at {company} about your {skill} experience",
+    "Are you a CPA or chartered accountant registered in {country}?",
+    "Can you start urgently on a {skill} contract with {company}?",
+    "Is remote work from {country} acceptable to you for this {skill} position?",
+    "Describe a project where you used {skill} to improve {other} performance",
+    "What is your cumulative grade point average from your {degree}?",
+    "Can you complete a {skill} assessment within {count} days?",
+]
+
+VOCABULARY = {
+    "skill": ["Python", "Java", "Kotlin", "Go", "Rust", "TypeScript", "React", "Angular", "Vue", "Django",
+              "Flask", "Spring Boot", "Kubernetes", "Docker", "Terraform", "AWS", "Azure", "GCP", "SQL",
+              "PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Airflow", "Snowflake", "dbt", "Tableau",
+              "Power BI", "Excel", "Salesforce", "SAP", "Jira", "Figma", "Linux", "Bash", "C++", "C#", ".NET",
+              "Node.js", "GraphQL", "REST APIs", "machine learning", "PyTorch", "TensorFlow", "NLP",
+              "computer vision", "CI/CD", "Jenkins", "GitHub Actions", "Selenium", "Cypress", "Agile",
+              "Scrum", "data modelling", "ETL pipelines", "microservices", "system design", "Swift"],
+    "language": ["English", "French", "German", "Spanish", "Mandarin", "Hindi", "Arabic", "Portuguese",
+                 "Japanese", "Dutch", "Italian", "Korean"],
+    "country": ["the United States", "Canada", "the United Kingdom", "Germany", "India", "Australia",
+                "the Netherlands", "Ireland", "Singapore", "France"],
+    "city": ["Toronto", "London", "Berlin", "New York", "San Francisco", "Bangalore", "Sydney", "Dublin",
+             "Amsterdam", "Austin", "Seattle", "Paris"],
+    "company": ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+                "Wonka", "Cyberdyne", "Soylent", "Tyrell", "Aperture"],
+    "clearance": ["Secret", "Top Secret", "NV1", "SC", "DV", "Baseline"],
+    "degree": ["Bachelor's Degree", "Master's Degree", "PhD", "Associate Degree", "MBA", "Diploma"],
+    "currency": ["USD", "CAD", "GBP", "EUR", "INR", "AUD"],
+    "note": ["optional", "voluntary", "you may decline", "confidential", "not shared with the hiring team"],
+    "count": ["2", "3", "5", "7", "10", "14"],
+}
+VOCABULARY["other"] = VOCABULARY["skill"]
+
+
+class Undetermined(Exception):
+    """Raised where the baseline handed the question to the AI (or its last-option fallback)."""
+
+
+class BaselineAnswerer:
+    """
+    The if/elif answer chains of the baseline's additional_questions, copied verbatim for
+    comparison, bugs included. Only the element plumbing is replaced: label and option texts are
+    passed in as strings, and the value the baseline would click, select or type is returned.
+    Code that raised in the baseline (the EEO branches, the residency lookup) raises here too.
+    """
+
+    def __init__(self, parameters):
+        self.checkboxes = parameters['checkboxes']
+        self.experience = parameters['experience']
+        self.experience_default = int(self.experience['default'])
+        self.languages = parameters['languages']
+        self.personal_info = parameters['personalInfo']
+        self.university_gpa = parameters['universityGpa']
+        self.salary_minimum = parameters['salaryMinimum']
+        self.notice_period = int(parameters['noticePeriod'])
+
+    def get_answer(self, question):
+        if self.checkboxes[question]:
+            return 'yes'
+        else:
+            return 'no'
+
+    def record_unprepared_question(self, answer_type, question_text):
+        pass
+
+    def choose_radio_option(self, radio_text, radio_labels):
+        radio_options = [(i, text.lower()) for i, text in enumerate(radio_labels)]
+
+        answer = None
+
+        # Try to determine answer using existing logic
+        if 'driver\'s licence' in radio_text or 'driver\'s license' in radio_text:
+            answer = self.get_answer('driversLicence')
+        elif any(keyword in radio_text.lower() for keyword in
+                 [
+                     'Aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
+                     'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
+                     'aborigine', 'ancestral', 'native peoples', 'original people',
+                     'first people', 'gender', 'race', 'disability', 'latino', 'torres',
+                     'do you identify'
+                 ]):
+            negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none', 'no']
+            answer = next((option for option in radio_options if
+                           any(neg_keyword in option[1].lower() for neg_keyword in negative_keywords)), None)
+
+        elif 'assessment' in radio_text:
+            answer = self.get_answer("assessment")
+
+        elif 'clearance' in radio_text:
+            answer = self.get_answer("securityClearance")
+
+        elif 'north korea' in radio_text:
+            answer = 'no'
+
+        elif 'previously employ' in radio_text or 'previous employ' in radio_text:
+            answer = 'no'
+
+        elif 'authorized' in radio_text or 'authorised' in radio_text or 'legally' in radio_text:
+            answer = self.get_answer('legallyAuthorized')
+
+        elif any(keyword in radio_text.lower() for keyword in
+                 ['certified', 'certificate', 'cpa', 'chartered accountant', 'qualification']):
+            answer = self.get_answer('certifiedProfessional')
+
+        elif 'urgent' in radio_text:
+            answer = self.get_answer('urgentFill')
+
+        elif 'commut' in radio_text or 'on-site' in radio_text or 'hybrid' in radio_text or 'onsite' in radio_text:
+            answer = self.get_answer('commute')
+
+        elif 'remote' in radio_text:
+            answer = self.get_answer('remote')
+
+        elif 'background check' in radio_text:
+            answer = self.get_answer('backgroundCheck')
+
+        elif 'drug test' in radio_text:
+            answer = self.get_answer('drugTest')
+
+        elif 'currently living' in radio_text or 'currently reside' in radio_text or 'right to live' in radio_text:
+            answer = self.get_answer('residency')
+
+        elif 'level of education' in radio_text:
+            for degree in self.checkboxes['degreeCompleted']:
+                if degree.lower() in radio_text:
+                    answer = "yes"
+                    break
+
+        elif 'experience' in radio_text:
+            if self.experience_default > 0:
+                answer = 'yes'
+            else:
+                for experience in self.experience:
+                    if experience.lower() in radio_text:
+                        answer = "yes"
+                        break
+
+        elif 'data retention' in radio_text:
+            answer = 'no'
+
+        elif 'sponsor' in radio_text:
+            answer = self.get_answer('requireVisa')
+
+        to_select = None
+        if answer is not None:
+            i = 0
+            for radio in radio_labels:
+                if answer in radio.lower():
+                    to_select = i
+                    break
+                i += 1
+
+        if to_select is None:
+            raise Undetermined()
+        return to_select
+
+    def choose_text_answer(self, question_text, text_field_type):
+        to_enter = ''
+        if 'experience' in question_text or 'how many years in' in question_text:
+            no_of_years = None
+            for experience in self.experience:
+                if experience.lower() in question_text:
+                    no_of_years = int(self.experience[experience])
+                    break
+            if no_of_years is None:
+                self.record_unprepared_question(text_field_type, question_text)
+                # Use 4 as the default fallback for experience questions
+                no_of_years = 4
+            to_enter = no_of_years
+
+        elif 'grade point average' in question_text:
+            to_enter = self.university_gpa
+
+        elif 'first name' in question_text:
+            to_enter = self.personal_info['First Name']
+
+        elif 'last name' in question_text:
+            to_enter = self.personal_info['Last Name']
+
+        elif 'name' in question_text:
+            to_enter = self.personal_info['First Name'] + " " + self.personal_info['Last Name']
+
+        elif 'pronouns' in question_text:
+            to_enter = self.personal_info['Pronouns']
+
+        elif 'phone' in question_text:
+            to_enter = self.personal_info['Mobile Phone Number']
+
+        elif 'linkedin' in question_text:
+            to_enter = self.personal_info['Linkedin']
+
+        elif 'message to hiring' in question_text or 'cover letter' in question_text:
+            to_enter = self.personal_info['MessageToManager']
+
+        elif 'website' in question_text or 'github' in question_text or 'portfolio' in question_text:
+            to_enter = self.personal_info['Website']
+
+        elif 'notice' in question_text or 'weeks' in question_text:
+            if text_field_type == 'numeric':
+                to_enter = int(self.notice_period)
+            else:
+                to_enter = str(self.notice_period)
+
+        elif 'salary' in question_text or 'expectation' in question_text or 'compensation' in question_text or 'CTC' in question_text:
+            if text_field_type == 'numeric':
+                to_enter = int(self.salary_minimum)
+            else:
+                to_enter = float(self.salary_minimum)
+            self.record_unprepared_question(text_field_type, question_text)
+
+        # Since no response can be determined, we use AI to generate a response if available, falling back to 0 or empty string if the AI response is not available
+        if text_field_type == 'numeric':
+            if not isinstance(to_enter, (int, float)):
+                raise Undetermined()
+        elif to_enter == '':
+            raise Undetermined()
+        return to_enter
+
+    def choose_dropdown_option(self, question_text, options):
+        if 'proficiency' in question_text:
+            proficiency = "None"
+            for language in self.languages:
+                if language.lower() in question_text:
+                    proficiency = self.languages[language]
+                    break
+            return proficiency
+
+        elif 'clearance' in question_text:
+            answer = self.get_answer('securityClearance')
+
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                self.record_unprepared_question(text_field_type, question_text)
+            return choice
+
+        elif 'assessment' in question_text:
+            answer = self.get_answer('assessment')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            # if choice == "":
+            #    choice = options[len(options) - 1]
+            return choice
+
+        elif 'commut' in question_text or 'on-site' in question_text or 'hybrid' in question_text or 'onsite' in question_text:
+            answer = self.get_answer('commute')
+
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            # if choice == "":
+            #    choice = options[len(options) - 1]
+            return choice
+
+        elif 'country code' in question_text:
+            return self.personal_info['Phone Country Code']
+
+        elif 'north korea' in question_text:
+            choice = ""
+            for option in options:
+                if 'no' in option.lower():
+                    choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'previously employed' in question_text or 'previous employment' in question_text:
+            choice = ""
+            for option in options:
+                if 'no' in option.lower():
+                    choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'sponsor' in question_text:
+            answer = self.get_answer('requireVisa')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'above 18' in question_text.lower():  # Check for "above 18" in the question text
+            choice = ""
+            for option in options:
+                if 'yes' in option.lower():  # Select 'yes' option
+                    choice = option
+            if choice == "":
+                choice = options[0]  # Default to the first option if 'yes' is not found
+            return choice
+
+        elif 'currently living' in question_text or 'currently reside' in question_text:
+            answer = self.get_answer('residency')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'authorized' in question_text or 'authorised' in question_text:
+            answer = self.get_answer('legallyAuthorized')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    # find some common words
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'citizenship' in question_text:
+            answer = self.get_answer('legallyAuthorized')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif 'clearance' in question_text:
+            answer = self.get_answer('clearance')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    choice = option
+                else:
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+
+            return choice
+
+        elif any(keyword in question_text.lower() for keyword in
+                 [
+                     'aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
+                     'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
+                     'aborigine', 'ancestral', 'native peoples', 'original people',
+                     'first people', 'gender', 'race', 'disability', 'latino'
+                 ]):
+            negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none']
+
+            choice = ""
+            choice = next((option for options in option.lower() if
+                       any(neg_keyword in option.lower() for neg_keyword in negative_keywords)), None)
+
+            return choice
+
+        elif 'email' in question_text:
+            return 'skip'  # assume email address is filled in properly by default
+
+        elif 'experience' in question_text or 'understanding' in question_text or 'familiar' in question_text or 'comfortable' in question_text or 'able to' in question_text:
+            answer = 'no'
+            if self.experience_default > 0:
+                answer = 'yes'
+            else:
+                for experience in self.experience:
+                    if experience.lower() in question_text and self.experience[experience] > 0:
+                        answer = 'yes'
+                        break
+            if answer == 'no':
+                # record unlisted experience as unprepared questions
+                self.record_unprepared_question("dropdown", question_text)
+
+            choice = ""
+            for option in options:
+                if answer in option.lower():
+                    choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        else:
+            raise Undetermined()
+
+
+def load_corpus(size):
+    logs_dir = ROOT / "logs"
+    questions = []
+    csv_path = logs_dir / "unprepared_questions.csv"
+    if csv_path.exists():
+        with open(csv_path, newline='', encoding='utf-8', errors='replace') as f:
+            questions = [row['question_text'] for row in csv.DictReader(f) if row.get('question_text')]
+    else:
+        with open(logs_dir / "activity.log.jsonl", encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    continue
+                if entry.get('question_text'):
+                    questions.append(entry['question_text'])
+    if not questions:
+        raise SystemExit("No questions found to benchmark")
+    unique = len(set(questions))
+    while len(questions) < size:
+        questions += questions[:size - len(questions)]
+    return questions, unique
+
+
+def unique_questions(count, seed=0):
+    """Up to count distinct questions, filling QUESTION_TEMPLATES from VOCABULARY."""
+    rng = random.Random(seed)
+    questions = set()
+    for attempt in itertools.count():
+        if len(questions) >= count or attempt >= count * 20:
+            break
+        template = rng.choice(QUESTION_TEMPLATES)
+        questions.add(template.format(**{slot: rng.choice(words) for slot, words in VOCABULARY.items()}))
+    return sorted(questions)
+
+
+def outcome(choose, *args, undetermined=None):
+    """
+    What the baseline did with a question: the value it chose, undetermined (the compiled rules'
+    value for "no rule applies") where it asked the AI, or "error" where its code raised.
+    """
+    try:
+        return choose(*args)
+    except Undetermined:
+        return undetermined
+    except Exception:
+        return "error"
+
+
+def run_baseline(answerer, questions):
+    answers = []
+    for question in questions:
+        text = question.lower()
+        answers.append((
+            outcome(answerer.choose_radio_option, text, RADIO_OPTIONS),
+            outcome(answerer.choose_dropdown_option, text, DROPDOWN_OPTIONS),
+            outcome(answerer.choose_text_answer, text, 'numeric', undetermined=''),
+        ))
+    return answers
+
+
+def run_compiled(answerer, questions):
+    answers = []
+    for question in questions:
+        text = normalize_question(question)
+        answers.append((
+            answerer.choose_radio_option(text, list(enumerate(RADIO_OPTIONS))),
+            'skip' if answerer.is_skipped('select', text) else answerer.choose_dropdown_option(text, DROPDOWN_OPTIONS),
+            numeric_answer(answerer.choose_text_answer(text, 'numeric')),
+        ))
+    return answers
+
+
+def numeric_answer(value):
+    """A numeric field's value as plan_answer keeps it: anything but a number goes to the AI."""
+    return value if isinstance(value, (int, float)) else ''
+
+
+def timed(function, *args, repeat=1):
+    """The result of function(*args) and its fastest time over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question classification")
+    parser.add_argument("--config", default=str(ROOT / "config.yaml"), help="Bot configuration")
+    parser.add_argument("--size", type=int, default=5000, help="Number of logged questions to classify")
+    parser.add_argument("--unique", type=int, default=10000, help="Number of distinct questions to classify")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, the fastest is reported")
+    parser.add_argument("--show", type=int, default=3, help="Questions listed for each kind of difference")
+    args = parser.parse_args()
+
+    with open(args.config, encoding='utf-8') as f:
+        parameters = yaml.safe_load(f)
+    questions, unique = load_corpus(args.size)
+
+    baseline = BaselineAnswerer(parameters)
+
+    def compiled_answerer():
+        return QuestionAnswerer(
+            checkboxes=parameters['checkboxes'],
+            experience=parameters['experience'],
+            languages=parameters['languages'],
+            personal_info=parameters['personalInfo'],
+            residency=parameters.get('residentStatus', []),
+            university_gpa=parameters['universityGpa'],
+            salary_minimum=parameters['salaryMinimum'],
+            notice_period=int(parameters['noticePeriod'])
+        )
+
+    distinct = unique_questions(args.unique)
+    baseline_answers, baseline_time = timed(run_baseline, baseline, questions, repeat=args.repeat)
+    compiled_answers, compiled_time = timed(run_compiled, compiled_answerer(), questions, repeat=args.repeat)
+    baseline_unique, baseline_cold = timed(run_baseline, baseline, distinct, repeat=args.repeat)
+    # A new answerer per run, so that no question is ever answered from the memo
+    compiled_unique, compiled_cold = timed(lambda: run_compiled(compiled_answerer(), distinct), repeat=args.repeat)
+
+    print(f"Logged corpus: {len(questions)} questions ({unique} unique); generated: {len(distinct)} distinct questions")
+    print("Each question is classified as radio, dropdown and numeric")
+    print(f"  baseline chains: {len(questions) / baseline_time:,.0f} questions/s on the logged corpus, "
+          f"{len(distinct) / baseline_cold:,.0f} questions/s on distinct questions")
+    print(f"  compiled rules:  {len(questions) / compiled_time:,.0f} questions/s on the logged corpus, "
+          f"{len(distinct) / compiled_cold:,.0f} questions/s on distinct questions (no cache hits)")
+
+    # Differences by question kind and by what the baseline did, with a few questions of each
+    differences = defaultdict(list)
+    seen = set()
+    for question, old, new in zip(questions + distinct, baseline_answers + baseline_unique,
+                                  compiled_answers + compiled_unique):
+        if question in seen:
+            continue
+        seen.add(question)
+        for kind, before, after in zip(("radio", "dropdown", "numeric"), old, new):
+            if before != after:
+                differences[kind, "baseline raised" if before == "error" else
+                            "baseline asked the AI" if before in (None, '') else
+                            "compiled finds no rule" if after in (None, '') else "different answer"].append(
+                    (question, before, after))
+    print(f"Questions answered identically as all three kinds: "
+          f"{len(seen) - len({q for cases in differences.values() for q, _, _ in cases})}/{len(seen)} distinct")
+    for (kind, reason), cases in sorted(differences.items()):
+        print(f"  {kind}, {reason}: {len(cases)} questions")
+        for question, before, after in cases[:args.show]:
+            print(f"    {question!r}: baseline={before!r} compiled={after!r}")
+
+if __name__ == "__main__":
+    main()
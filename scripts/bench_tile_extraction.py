@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark job tile extraction on a saved results page.
+
+Compares the legacy per-tile find_element extraction with the single execute_script call
+used by LinkedinEasyApply.extract_job_tiles. Both run with the bot's implicit wait, so
+missing elements cost what they cost in production.
+
+Usage:
+    python scripts/bench_tile_extraction.py [--page scripts/fixtures/search_results.html] [--runs 5]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.common.by import By
+from main import init_browser
+from page_scripts import EXTRACT_JOB_TILES_JS
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_extract(browser, job_tiles):
+    """The extraction loop apply_jobs used before tiles were read in one script call."""
+    records = []
+    for job_tile in job_tiles:
+        job_title, company, poster, job_location, apply_method, link = "", "", "", "", "", ""
+        try:
+            job_title_element = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link')
+            job_title = job_title_element.find_element(By.TAG_NAME, 'strong').text
+            link = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link').get_attribute('href').split('?')[0]
+        except Exception:
+            pass
+        try:
+            company = job_tile.find_element(By.CLASS_NAME, 'artdeco-entity-lockup__subtitle').text
+        except Exception:
+            pass
+        try:
+            hiring_line = job_tile.find_element(By.XPATH, '//span[contains(.,\' is hiring for this\')]')
+            hiring_line_text = hiring_line.text
+            name_terminating_index = hiring_line_text.find(' is hiring for this')
+            if name_terminating_index != -1:
+                poster = hiring_line_text[:name_terminating_index]
+        except Exception:
+            pass
+        try:
+            job_location = job_tile.find_element(By.CLASS_NAME, 'job-card-container__metadata-item').text
+        except Exception:
+            pass
+        try:
+            apply_method = job_tile.find_element(By.CLASS_NAME, 'job-card-container__apply-method').text
+        except Exception:
+            pass
+        records.append((job_title, company, poster, job_location, apply_method, link))
+    return records
+
+
+def count_commands(browser):
+    """Wrap browser.execute so every WebDriver round trip is counted."""
+    counter = {"commands": 0}
+    execute = browser.execute
+
+    def counting_execute(driver_command, params=None):
+        counter["commands"] += 1
+        return execute(driver_command, params)
+
+    browser.execute = counting_execute
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job tile extraction")
+    parser.add_argument("--page", default=str(FIXTURES_DIR / "search_results.html"), help="Saved results page")
+    parser.add_argument("--runs", type=int, default=5, help="Number of timed runs per strategy")
+    args = parser.parse_args()
+
+    browser = init_browser()
+    counter = count_commands(browser)
+    try:
+        browser.get(Path(os.path.abspath(args.page)).as_uri())
+        ul_element = browser.find_element(By.CSS_SELECTOR, "ul:has(> .scaffold-layout__list-item)")
+
+        results = {}
+        for name in ("legacy", "script"):
+            durations, commands = [], []
+            for _ in range(args.runs):
+                counter["commands"] = 0
+                start = time.perf_counter()
+                if name == "legacy":
+                    tiles = ul_element.find_elements(By.CLASS_NAME, 'scaffold-layout__list-item')
+                    records = legacy_extract(browser, tiles)
+                else:
+                    records = browser.execute_script(EXTRACT_JOB_TILES_JS, ul_element)
+                durations.append(time.perf_counter() - start)
+                commands.append(counter["commands"])
+            results[name] = (len(records), sorted(durations)[len(durations) // 2], max(commands))
+
+        for name, (tiles, median, commands) in results.items():
+            print(f"{name:>7}: {tiles} tiles, median {median * 1000:.1f} ms/page, {commands} WebDriver calls/page")
+        speedup = results["legacy"][1] / max(results["script"][1], 1e-9)
+        print(f"Single-call extraction is {speedup:.1f}x faster per page")
+    finally:
+        browser.quit()
+
+
+if __name__ == "__main__":
+    main()
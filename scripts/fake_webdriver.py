@@ -0,0 +1,1319 @@
+"""
+In-process fake of the part of the WebDriver API the bot uses, serving saved HTML fixtures.
+
+FakeWebDriver parses the fixtures with html.parser into a small DOM and answers find_element(s),
+element commands and the bot's page scripts (page_scripts, form_engine, waits) from it, with a
+Python port of each script. It also plays LinkedIn's part: search URLs load
+fixtures/search_results.html (one copy per result page, with distinct job ids, then a "No
+matching jobs found" page), clicking a job fills the details pane, the Easy Apply button opens
+the modal steps in fixtures/easy_apply/ in file name order, the primary button validates the
+step's required fields and moves on, and submitting shows the post-apply dialog.
+
+Every command goes through execute(), like a real driver, so SpanRecorder and
+WebDriverProfiler hooks work unchanged. Each command sleeps for a configurable latency and page
+changes triggered by clicks only show up after render_delay, so waits poll as they do against a
+real browser. Find misses honour implicitly_wait.
+
+Usage:
+    browser = FakeWebDriver(search_pages=2, latency=0.002, latencies={"get": 0.5}, render_delay=0.1)
+    browser.implicitly_wait(1)
+    bot = LinkedinEasyApply(parameters, browser)
+"""
+import html
+import re
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlunparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.common.exceptions import (ElementNotInteractableException, InvalidSelectorException,
+                                        NoSuchElementException, StaleElementReferenceException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+
+from form_engine import APPLY_FORM_ACTIONS_JS, SNAPSHOT_FORM_JS
+from page_scripts import EXTRACT_JOB_TILES_JS, PAGE_STATUS_JS, SCROLL_UNTIL_LOADED_JS
+from navigation import LEAVE_PAGE_JS, PAGE_READY_JS
+from waits import JOB_DETAILS_READY_JS, MODAL_STATE_JS
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HIDDEN_TAGS = {"head", "script", "style", "template", "title", "meta", "link"}
+ERROR_SELECTOR = ('.artdeco-inline-feedback--error, .fb-dash-form-element-error, '
+                  '[data-test-form-element-error-messages], [role="alert"]')
+SUGGESTION_SELECTOR = '[role="listbox"] [role="option"], .basic-typeahead__selectable, .search-typeahead-v2__hit'
+
+BLANK_PAGE = '<html><head><title>LinkedIn</title></head><body><div class="application-outlet"></div></body></html>'
+
+NO_RESULTS_PAGE = """<html><head><title>Jobs | LinkedIn</title></head><body>
+<div class="application-outlet"><main class="scaffold-layout__list-detail">
+<div class="jobs-search-two-pane__no-results-banner--expand"><h1>No matching jobs found.</h1></div>
+</main></div></body></html>"""
+
+JOB_DETAILS_HTML = """
+<div class="jobs-unified-top-card">
+  <h1 class="t-24 t-bold">{title}</h1>
+  <div class="jobs-unified-top-card__company-name">{company}</div>
+  <button class="jobs-apply-button artdeco-button" aria-label="Easy Apply to {title} at {company}"><span>Easy Apply</span></button>
+</div>
+<div id="job-details">
+  <h2>About the job</h2>
+  <p>{company} is looking for a {title} to join its data team. You will build and maintain Python and SQL
+  pipelines, design dashboards and reports, and work with product and business teams on analyses.</p>
+  <p>Requirements: 3+ years of experience with Python, SQL and a BI tool such as Power BI, good communication
+  skills in English and French.</p>
+</div>
+"""
+
+POST_APPLY_DIALOG_HTML = """
+<div class="artdeco-modal-overlay">
+  <div class="artdeco-modal" role="dialog">
+    <button class="artdeco-modal__dismiss" aria-label="Dismiss">×</button>
+    <h2>Application sent</h2>
+    <p>Your application was sent to {company}.</p>
+  </div>
+</div>
+"""
+
+DISCARD_DIALOG_HTML = """
+<div class="artdeco-modal-overlay artdeco-modal-overlay--layer-confirmation">
+  <div class="artdeco-modal artdeco-modal--layer-confirmation" role="alertdialog">
+    <h2>Save this application?</h2>
+    <button class="artdeco-modal__confirm-dialog-btn artdeco-button artdeco-button--secondary"><span>Discard</span></button>
+    <button class="artdeco-modal__confirm-dialog-btn artdeco-button artdeco-button--primary"><span>Save</span></button>
+  </div>
+</div>
+"""
+
+ERROR_HTML = ('<div class="artdeco-inline-feedback artdeco-inline-feedback--error" role="alert">'
+              '<span class="artdeco-inline-feedback__message">{message}</span></div>')
+
+
+# DOM
+
+class Node:
+    __slots__ = ("tag", "attrs", "parent", "children", "data", "props", "element_id")
+
+    def __init__(self, tag, attrs=None, parent=None, data=None):
+        self.tag = tag  # None for text nodes
+        self.attrs = attrs if attrs is not None else {}
+        self.parent = parent
+        self.children = []
+        self.data = data
+        self.props = {}  # Live form state: value, checked, selectedIndex
+        self.element_id = None
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def iter(self):
+        """Descendant elements in document order, excluding self."""
+        stack = [child for child in reversed(self.children) if child.tag is not None]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if child.tag is not None)
+
+    def append(self, node):
+        node.parent = self
+        self.children.append(node)
+
+    def remove(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    def __repr__(self):
+        return f"<{self.tag} {self.attrs}>" if self.tag else repr(self.data)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value if value is not None else "" for name, value in attrs})
+        self.stack[-1].append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                break
+
+    def handle_data(self, data):
+        self.stack[-1].append(Node(None, data=data))
+
+
+def parse_html(markup):
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+def parse_fragment(markup):
+    return [node for node in parse_html(markup).children if node.tag is not None]
+
+
+def text_content(node):
+    if node.tag is None:
+        return node.data
+    return "".join(text_content(child) for child in node.children)
+
+
+def inner_text(node):
+    """Rendered text, approximated as the text of the non-hidden descendants with whitespace collapsed."""
+    if node is None:
+        return ""
+    parts = []
+
+    def walk(current):
+        if current.tag is None:
+            parts.append(current.data)
+        elif not _hidden(current):
+            for child in current.children:
+                walk(child)
+            if current.tag in ("p", "div", "li", "h1", "h2", "h3", "label", "br"):
+                parts.append(" ")
+
+    walk(node)
+    return " ".join("".join(parts).split())
+
+
+def _hidden(node):
+    if node.tag in HIDDEN_TAGS or "hidden" in node.attrs or (node.tag == "input" and node.attrs.get("type") == "hidden"):
+        return True
+    style = node.attrs.get("style", "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def closest(node, predicate):
+    while node is not None and node.tag != "#document":
+        if predicate(node):
+            return node
+        node = node.parent
+    return None
+
+
+def document_of(node):
+    while node.parent is not None:
+        node = node.parent
+    return node
+
+
+def outer_html(node):
+    if node.tag is None:
+        return html.escape(node.data, quote=False)
+    inner = "".join(outer_html(child) for child in node.children)
+    if node.tag == "#document":
+        return inner
+    attrs = "".join(f' {name}="{html.escape(value)}"' for name, value in node.attrs.items())
+    if node.tag in VOID_TAGS:
+        return f"<{node.tag}{attrs}>"
+    return f"<{node.tag}{attrs}>{inner}</{node.tag}>"
+
+
+# CSS selectors: tag, #id, .class, [attr], [attr=value] (also *=, ^=, $=, ~=), descendant and child
+# combinators and selector lists. Enough for the selectors the bot and its scripts use.
+
+_ATTRIBUTE = re.compile(r"""\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\]\s]*)))?\s*\]""")
+_COMPOUND_PART = re.compile(r"""#[\w-]+|\.[\w-]+|\[[^\]]*\]|[\w-]+|\*""")
+
+
+@lru_cache(maxsize=512)
+def parse_selector(selector):
+    groups = []
+    for part in selector.split(","):
+        steps = []
+        combinator = " "
+        for token in re.findall(r"""(?:[^\s>\[]|\[[^\]]*\])+|>""", part.strip()):
+            if token == ">":
+                combinator = ">"
+                continue
+            steps.append((combinator, _parse_compound(token)))
+            combinator = " "
+        if not steps:
+            raise InvalidSelectorException(f"Invalid CSS selector: {selector!r}")
+        groups.append(tuple(steps))
+    return tuple(groups)
+
+
+def _parse_compound(token):
+    tag, ids, classes, attributes = None, [], [], []
+    position = 0
+    for match in _COMPOUND_PART.finditer(token):
+        if match.start() != position:
+            raise InvalidSelectorException(f"Unsupported CSS selector: {token!r}")
+        position = match.end()
+        part = match.group()
+        if part.startswith("#"):
+            ids.append(part[1:])
+        elif part.startswith("."):
+            classes.append(part[1:])
+        elif part.startswith("["):
+            attribute = _ATTRIBUTE.fullmatch(part)
+            if attribute is None:
+                raise InvalidSelectorException(f"Unsupported CSS selector: {token!r}")
+            name, operator, *values = attribute.groups()
+            value = next((v for v in values if v is not None), None)
+            attributes.append((name, operator, value))
+        elif part != "*":
+            tag = part.lower()
+    if position != len(token):
+        raise InvalidSelectorException(f"Unsupported CSS selector: {token!r}")
+    return tag, tuple(ids), tuple(classes), tuple(attributes)
+
+
+def _match_compound(node, compound):
+    tag, ids, classes, attributes = compound
+    if node.tag is None or node.tag == "#document":
+        return False
+    if tag is not None and node.tag != tag:
+        return False
+    if any(node.attrs.get("id") != value for value in ids):
+        return False
+    if classes:
+        node_classes = node.classes
+        if any(name not in node_classes for name in classes):
+            return False
+    for name, operator, value in attributes:
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if operator == "=" and actual != value:
+            return False
+        if operator == "*=" and value not in actual:
+            return False
+        if operator == "^=" and not actual.startswith(value):
+            return False
+        if operator == "$=" and not actual.endswith(value):
+            return False
+        if operator == "~=" and value not in actual.split():
+            return False
+    return True
+
+
+def _match_steps(node, steps, i):
+    combinator, compound = steps[i]
+    if not _match_compound(node, compound):
+        return False
+    if i == 0:
+        return True
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and _match_steps(parent, steps, i - 1)
+    while parent is not None:
+        if _match_steps(parent, steps, i - 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+def matches(node, selector):
+    return any(_match_steps(node, steps, len(steps) - 1) for steps in parse_selector(selector))
+
+
+def select(root, selector):
+    groups = parse_selector(selector)
+    return [node for node in root.iter() if any(_match_steps(node, steps, len(steps) - 1) for steps in groups)]
+
+
+def select_one(root, selector):
+    groups = parse_selector(selector)
+    return next((node for node in root.iter() if any(_match_steps(node, steps, len(steps) - 1) for steps in groups)), None)
+
+
+# XPath: location paths with the child, descendant (//), parent (..), self (.), ancestor and sibling
+# axes, and [n], [contains(x, 'text')], [normalize-space(.) = 'text'], [@attr = 'text'] predicates.
+
+_LITERAL = r"""(?:"[^"]*"|'[^']*')"""
+_XPATH_STEP = re.compile(r"^(?:([\w-]+)::)?(\*|\.\.|\.|[\w-]+)(.*)$", re.S)
+_CONTAINS = re.compile(r"contains\(\s*(\.|text\(\)|@[\w-]+)\s*,\s*(" + _LITERAL + r")\s*\)")
+_EQUALS = re.compile(r"(normalize-space\(\s*\.?\s*\)|\.|text\(\)|@[\w-]+)\s*=\s*(" + _LITERAL + r")")
+
+
+def _split_outside(expression, separator):
+    """Split on separator characters that are outside brackets and quotes."""
+    parts, current, depth, quote = [], "", 0, None
+    for char in expression:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _predicates(text):
+    predicates = []
+    while text:
+        if not text.startswith("["):
+            raise InvalidSelectorException(f"Unsupported XPath step: {text!r}")
+        depth, quote = 0, None
+        for i, char in enumerate(text):
+            if quote:
+                quote = None if char == quote else quote
+            elif char in "\"'":
+                quote = char
+            elif char == "[":
+                depth += 1
+            elif char == "]":
+                depth -= 1
+                if depth == 0:
+                    predicates.append(text[1:i].strip())
+                    text = text[i + 1:].strip()
+                    break
+        else:
+            raise InvalidSelectorException(f"Unbalanced XPath predicate: {text!r}")
+    return predicates
+
+
+def _xpath_value(node, expression):
+    if expression == ".":
+        return text_content(node)
+    if expression == "text()":
+        return "".join(child.data for child in node.children if child.tag is None)
+    if expression.startswith("@"):
+        return node.attrs.get(expression[1:], "")
+    return " ".join(text_content(node).split())  # normalize-space(.)
+
+
+def _test_predicate(node, position, predicate):
+    if predicate.isdigit():
+        return position == int(predicate)
+    if predicate.startswith("last()"):
+        raise InvalidSelectorException("last() is not supported by the fake driver")
+    clauses = re.split(r"\s+and\s+", predicate)
+    for clause in clauses:
+        contains = _CONTAINS.fullmatch(clause)
+        equals = _EQUALS.fullmatch(clause)
+        if contains:
+            if contains.group(2)[1:-1] not in _xpath_value(node, contains.group(1)):
+                return False
+        elif equals:
+            if _xpath_value(node, equals.group(1)) != equals.group(2)[1:-1]:
+                return False
+        elif re.fullmatch(r"@[\w-]+", clause):
+            if clause[1:] not in node.attrs:
+                return False
+        else:
+            raise InvalidSelectorException(f"Unsupported XPath predicate: [{predicate}]")
+    return True
+
+
+def _axis(node, axis):
+    if axis == "child":
+        return [child for child in node.children if child.tag is not None]
+    if axis == "parent":
+        return [node.parent] if node.parent is not None else []
+    if axis == "self":
+        return [node]
+    if axis == "ancestor":
+        ancestors = []
+        while node.parent is not None:
+            node = node.parent
+            ancestors.append(node)
+        return ancestors
+    if axis in ("preceding-sibling", "following-sibling"):
+        if node.parent is None:
+            return []
+        siblings = [child for child in node.parent.children if child.tag is not None]
+        index = siblings.index(node)
+        # Proximity order, as positional predicates count on these axes
+        return list(reversed(siblings[:index])) if axis == "preceding-sibling" else siblings[index + 1:]
+    if axis in ("descendant", "descendant-or-self"):
+        return ([node] if axis == "descendant-or-self" else []) + list(node.iter())
+    raise InvalidSelectorException(f"Unsupported XPath axis: {axis}")
+
+
+def xpath(context, expression):
+    """Evaluate a location path from context, returning the matched elements in document order."""
+    segments = _split_outside(expression.strip(), "/")
+    if segments[0] == "":
+        nodes = [document_of(context)]
+        segments = segments[1:]
+    else:
+        nodes = [context]
+    descendant = False
+    for segment in segments:
+        segment = segment.strip()
+        if segment == "":
+            descendant = True
+            continue
+        step = _XPATH_STEP.match(segment)
+        if step is None:
+            raise InvalidSelectorException(f"Unsupported XPath step: {segment!r}")
+        axis, test, rest = step.groups()
+        predicates = _predicates(rest.strip())
+        if descendant:
+            nodes = [candidate for node in nodes for candidate in _axis(node, "descendant-or-self")]
+            descendant = False
+        if test == ".":
+            axis, test = "self", "*"
+        elif test == "..":
+            axis, test = "parent", "*"
+        found = []
+        for node in nodes:
+            candidates = [candidate for candidate in _axis(node, axis or "child")
+                          if candidate.tag not in (None, "#document") and (test == "*" or candidate.tag == test.lower())]
+            for predicate in predicates:
+                candidates = [candidate for position, candidate in enumerate(candidates, 1)
+                              if _test_predicate(candidate, position, predicate)]
+            found.extend(candidates)
+        nodes = found
+    if descendant:
+        raise InvalidSelectorException(f"XPath cannot end with '/': {expression!r}")
+    unique = list({id(node): node for node in nodes}.values())
+    if len(unique) > 1:
+        order = {id(node): index for index, node in enumerate(document_of(context).iter())}
+        unique.sort(key=lambda node: order.get(id(node), -1))
+    return unique
+
+
+# Driver
+
+class FakeElement:
+    """WebElement stand-in: every method is a command sent through the driver's execute()."""
+
+    def __init__(self, parent, id_):
+        self._parent = parent
+        self._id = id_
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def parent(self):
+        return self._parent
+
+    def _execute(self, command, params=None):
+        return self._parent.execute(command, dict(params or {}, id=self._id))["value"]
+
+    @property
+    def tag_name(self):
+        return self._execute("getElementTagName")
+
+    @property
+    def text(self):
+        return self._execute("getElementText")
+
+    def click(self):
+        self._execute("clickElement")
+
+    def clear(self):
+        self._execute("clearElement")
+
+    def send_keys(self, *value):
+        text = "".join(str(part) for part in value)
+        self._execute("sendKeysToElement", {"text": text, "value": list(text)})
+
+    def get_attribute(self, name):
+        return self._execute("getElementAttribute", {"name": name})
+
+    def get_dom_attribute(self, name):
+        return self._execute("getElementAttribute", {"name": name, "dom": True})
+
+    def get_property(self, name):
+        return self._execute("getElementProperty", {"name": name})
+
+    def value_of_css_property(self, property_name):
+        return self._execute("getElementValueOfCssProperty", {"propertyName": property_name})
+
+    def is_displayed(self):
+        return self._execute("isElementDisplayed")
+
+    def is_enabled(self):
+        return self._execute("isElementEnabled")
+
+    def is_selected(self):
+        return self._execute("isElementSelected")
+
+    def find_element(self, by=By.ID, value=None):
+        return self._execute("findChildElement", {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._execute("findChildElements", {"using": by, "value": value})
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and self._id == other._id
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __repr__(self):
+        return f'<FakeElement (session="fake", element="{self._id}")>'
+
+
+class FakeWebDriver:
+    """
+    WebDriver stand-in over the saved LinkedIn fixtures.
+
+    Args:
+        fixtures_dir: Directory holding search_results.html and easy_apply/*.html
+        search_pages: Number of result pages served for each search before "No matching jobs found"
+        latency: Seconds every command takes
+        latencies: Per-command overrides of latency, e.g. {"get": 0.5}
+        render_delay: Seconds before the page reacts to a click (details pane, modal steps, dialogs)
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, search_pages=1, latency=0.0, latencies=None, render_delay=0.0):
+        fixtures_dir = Path(fixtures_dir)
+        self.search_page_html = (fixtures_dir / "search_results.html").read_text(encoding="utf-8")
+        self.steps = [(path.stem, path.read_text(encoding="utf-8"))
+                      for path in sorted((fixtures_dir / "easy_apply").glob("*.html"))]
+        self.search_pages = search_pages
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.render_delay = render_delay
+        self.implicit_wait = 0.0
+        self.page_load_timeout = 300.0
+        self.script_timeout = 30.0
+        self.session_id = "fake"
+        self.command_counts = Counter()
+        self.unsupported_scripts = Counter()
+        self.applications_submitted = 0
+        self.applications_discarded = 0
+        self.cookies = []
+        self._elements = {}
+        self._element_counter = 0
+        self._ea_counter = 0
+        self._pending = []
+        self._step = None
+        self._job = None
+        self._scripts = {
+            EXTRACT_JOB_TILES_JS: self._extract_job_tiles,
+            PAGE_STATUS_JS: self._page_status,
+            SCROLL_UNTIL_LOADED_JS: self._scroll_until_loaded,
+            SNAPSHOT_FORM_JS: self._snapshot_form,
+            APPLY_FORM_ACTIONS_JS: self._apply_form_actions,
+            MODAL_STATE_JS: self._modal_state,
+            JOB_DETAILS_READY_JS: self._job_details_ready,
+            PAGE_READY_JS: self._page_ready,
+            LEAVE_PAGE_JS: self._leave_page,
+        }
+        self._handlers = {
+            "get": self._get,
+            "getCurrentUrl": lambda params: self.url,
+            "getTitle": lambda params: inner_text(select_one(self.document, "title")),
+            "getPageSource": lambda params: outer_html(self.document),
+            "refresh": lambda params: self._get({"url": self.url}),
+            "findElement": lambda params: self._find(params),
+            "findElements": lambda params: self._find(params, many=True),
+            "findChildElement": lambda params: self._find(params, self._node(params)),
+            "findChildElements": lambda params: self._find(params, self._node(params), many=True),
+            "w3cExecuteScript": self._execute_script,
+            "w3cExecuteScriptAsync": self._execute_script,
+            "getElementTagName": lambda params: self._node(params).tag,
+            "getElementText": lambda params: inner_text(self._node(params)) if self._visible(self._node(params)) else "",
+            "getElementAttribute": self._get_attribute,
+            "getElementProperty": self._get_property,
+            "getElementValueOfCssProperty": self._css_property,
+            "isElementDisplayed": lambda params: self._visible(self._node(params)),
+            "isElementEnabled": lambda params: "disabled" not in self._node(params).attrs,
+            "isElementSelected": lambda params: self._selected(self._node(params)),
+            "clickElement": self._click_element,
+            "clearElement": lambda params: self._set_value(self._node(params), ""),
+            "sendKeysToElement": self._send_keys,
+            "setTimeouts": self._set_timeouts,
+            "addCookie": lambda params: self.cookies.append(dict(params["cookie"])),
+            "getCookies": lambda params: [dict(cookie) for cookie in self.cookies],
+            "deleteAllCookies": lambda params: self.cookies.clear(),
+            "executeCdpCommand": self._cdp_command,
+            "quit": lambda params: None,
+        }
+        self._load("about:blank", BLANK_PAGE)
+
+    # WebDriver API
+
+    def execute(self, driver_command, params=None):
+        self.command_counts[driver_command] += 1
+        delay = self.latencies.get(driver_command, self.latency)
+        if delay:
+            time.sleep(delay)
+        self._render()
+        handler = self._handlers.get(driver_command)
+        if handler is None:
+            raise WebDriverException(f"The fake driver does not implement {driver_command}")
+        return {"value": handler(params or {})}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    @property
+    def current_url(self):
+        return self.execute("getCurrentUrl")["value"]
+
+    @property
+    def title(self):
+        return self.execute("getTitle")["value"]
+
+    @property
+    def page_source(self):
+        return self.execute("getPageSource")["value"]
+
+    def refresh(self):
+        self.execute("refresh")
+
+    def find_element(self, by=By.ID, value=None):
+        return self.execute("findElement", {"using": by, "value": value})["value"]
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+    def execute_async_script(self, script, *args):
+        return self.execute("w3cExecuteScriptAsync", {"script": script, "args": list(args)})["value"]
+
+    def implicitly_wait(self, time_to_wait):
+        self.execute("setTimeouts", {"implicit": int(float(time_to_wait) * 1000)})
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.execute("setTimeouts", {"pageLoad": int(float(time_to_wait) * 1000)})
+
+    def set_script_timeout(self, time_to_wait):
+        self.execute("setTimeouts", {"script": int(float(time_to_wait) * 1000)})
+
+    def add_cookie(self, cookie_dict):
+        self.execute("addCookie", {"cookie": cookie_dict})
+
+    def get_cookies(self):
+        return self.execute("getCookies")["value"]
+
+    def delete_all_cookies(self):
+        self.execute("deleteAllCookies")
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        self.execute("quit")
+
+    # Simulation helpers, not part of the WebDriver API
+
+    def show_modal_step(self, name):
+        """Open the Easy Apply modal directly on the first step whose fixture name contains name."""
+        index = next(i for i, (stem, _) in enumerate(self.steps) if name in stem)
+        self._close_modals()
+        self._job = {"title": "Data Analyst", "company": "Example Corp"}
+        self._show_step(index)
+
+    def step_errors(self):
+        """Validation messages the current modal step would show if its primary button were clicked now."""
+        modal = select_one(self.document, ".jobs-easy-apply-modal")
+        return [message for _, message in self._validate(modal)] if modal is not None else []
+
+    # Pages
+
+    def _load(self, url, markup):
+        self.url = url
+        self.document = parse_html(markup)
+        self._loaded_at = time.perf_counter()
+        self._leaving = False
+        self._pending = []
+        self._step = None
+
+    def _get(self, params):
+        url = params["url"]
+        parsed = urlparse(url)
+        if "/jobs/search" in parsed.path:
+            start = int((parse_qs(parsed.query).get("start") or ["0"])[0] or 0)
+            page = start // 25
+            self._load(url, self._search_page(page) if page < self.search_pages else NO_RESULTS_PAGE)
+        else:
+            self._load(url, BLANK_PAGE)
+
+    def _search_page(self, page):
+        if page == 0:
+            return self.search_page_html
+        # Prefix the job ids so that every page lists new jobs
+        return re.sub(r"(?<=\D)(\d{10})(?=\D)", lambda match: f"{page}{match.group(1)}", self.search_page_html)
+
+    def _later(self, change):
+        """Apply a page change after render_delay, as the page would after a click."""
+        if self.render_delay <= 0:
+            change()
+        else:
+            self._pending.append((time.monotonic() + self.render_delay, change))
+
+    def _render(self):
+        now = time.monotonic()
+        while self._pending and self._pending[0][0] <= now:
+            _, change = self._pending.pop(0)
+            change()
+
+    def _body(self):
+        return select_one(self.document, "body") or self.document
+
+    # Elements
+
+    def _wrap(self, node):
+        if node.element_id is None:
+            self._element_counter += 1
+            node.element_id = f"fake-{self._element_counter}"
+            self._elements[node.element_id] = node
+        return FakeElement(self, node.element_id)
+
+    def _node(self, params):
+        node = self._elements.get(params["id"])
+        if node is None or not self._attached(node):
+            raise StaleElementReferenceException(f"Element {params['id']} is no longer attached to the DOM")
+        return node
+
+    def _attached(self, node):
+        return document_of(node) is self.document
+
+    def _visible(self, node):
+        if node is None or not self._attached(node):
+            return False
+        return closest(node, _hidden) is None
+
+    def _locate(self, using, value, root):
+        if using == By.ID:
+            return [node for node in root.iter() if node.attrs.get("id") == value]
+        if using == By.CLASS_NAME:
+            return [node for node in root.iter() if value in node.classes]
+        if using == By.TAG_NAME:
+            return [node for node in root.iter() if node.tag == value.lower()]
+        if using == By.NAME:
+            return [node for node in root.iter() if node.attrs.get("name") == value]
+        if using == By.CSS_SELECTOR:
+            return select(root, value)
+        if using == By.XPATH:
+            return xpath(root, value)
+        if using in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            return [node for node in root.iter() if node.tag == "a" and
+                    (inner_text(node) == value if using == By.LINK_TEXT else value in inner_text(node))]
+        raise InvalidSelectorException(f"Unsupported locator strategy: {using}")
+
+    def _find(self, params, root=None, many=False):
+        deadline = time.monotonic() + self.implicit_wait
+        while True:
+            nodes = self._locate(params["using"], params["value"], root if root is not None else self.document)
+            remaining = deadline - time.monotonic()
+            if nodes or remaining <= 0:
+                break
+            time.sleep(min(0.05, remaining))
+            self._render()
+        if many:
+            return [self._wrap(node) for node in nodes]
+        if not nodes:
+            raise NoSuchElementException(
+                f'no such element: Unable to locate element: {{"method":"{params["using"]}","selector":"{params["value"]}"}}')
+        return self._wrap(nodes[0])
+
+    def _set_timeouts(self, params):
+        if "implicit" in params:
+            self.implicit_wait = params["implicit"] / 1000
+        if "pageLoad" in params:
+            self.page_load_timeout = params["pageLoad"] / 1000
+        if "script" in params:
+            self.script_timeout = params["script"] / 1000
+
+    def _cdp_command(self, params):
+        """The DevTools cookie commands; the fake keeps a single jar, whatever the URLs asked for."""
+        if params["cmd"] == "Network.setCookies":
+            names = {cookie["name"] for cookie in params["params"]["cookies"]}
+            self.cookies = [cookie for cookie in self.cookies if cookie["name"] not in names]
+            self.cookies.extend(dict(cookie) for cookie in params["params"]["cookies"])
+            return {}
+        if params["cmd"] in ("Network.getCookies", "Network.getAllCookies"):
+            return {"cookies": [dict(cookie) for cookie in self.cookies]}
+        raise WebDriverException(f"The fake driver does not implement {params['cmd']}")
+
+    def _get_attribute(self, params):
+        node = self._node(params)
+        name = params["name"]
+        if params.get("dom"):
+            return node.attrs.get(name)
+        if name == "value":
+            return self._value(node)
+        if name in ("checked", "selected"):
+            return "true" if self._selected(node) else None
+        if name == "href" and "href" in node.attrs:
+            return urljoin(self.url, node.attrs["href"])
+        if name == "index" and node.tag == "option":
+            select_node = closest(node, lambda n: n.tag == "select")
+            return str(self._options(select_node).index(node)) if select_node is not None else "0"
+        return node.attrs.get(name)
+
+    def _get_property(self, params):
+        node = self._node(params)
+        name = params["name"]
+        if name == "value":
+            return self._value(node)
+        if name in ("checked", "selected"):
+            return self._selected(node)
+        if name == "selectedIndex":
+            return self._selected_index(node)
+        if name in ("innerText", "textContent"):
+            return inner_text(node) if name == "innerText" else text_content(node)
+        return node.attrs.get(name)
+
+    def _css_property(self, params):
+        visible = self._visible(self._node(params))
+        return {"display": "block" if visible else "none", "visibility": "visible" if visible else "hidden",
+                "opacity": "1"}.get(params["propertyName"], "")
+
+    def _click_element(self, params):
+        node = self._node(params)
+        if not self._visible(node):
+            raise ElementNotInteractableException("element not interactable")
+        self._click(node)
+
+    def _send_keys(self, params):
+        node = self._node(params)
+        # Selenium's Keys are private use characters; only the printable ones end up in the field
+        typed = "".join(char for char in params["text"] if not "\ue000" <= char <= "\uf8ff")
+        if node.tag not in ("input", "textarea"):
+            raise ElementNotInteractableException("element not interactable")
+        if node.attrs.get("type") == "file":
+            self._set_value(node, typed)
+        else:
+            self._set_value(node, self._value(node) + typed)
+
+    # Form state
+
+    def _value(self, node):
+        if node.tag == "select":
+            options = self._options(node)
+            index = self._selected_index(node)
+            if index < 0:
+                return ""
+            return options[index].attrs.get("value", inner_text(options[index]))
+        if "value" in node.props:
+            return node.props["value"]
+        if node.tag == "textarea":
+            return text_content(node)
+        return node.attrs.get("value", "")
+
+    def _options(self, select_node):
+        return [node for node in select_node.iter() if node.tag == "option"]
+
+    def _selected_index(self, select_node):
+        if "selectedIndex" in select_node.props:
+            return select_node.props["selectedIndex"]
+        options = self._options(select_node)
+        return next((i for i, option in enumerate(options) if "selected" in option.attrs), 0 if options else -1)
+
+    def _selected(self, node):
+        if node.tag == "option":
+            select_node = closest(node, lambda n: n.tag == "select")
+            return select_node is not None and self._options(select_node).index(node) == self._selected_index(select_node)
+        return node.props.get("checked", "checked" in node.attrs)
+
+    def _set_value(self, node, value):
+        if node.tag == "select":
+            values = [option.attrs.get("value", inner_text(option)) for option in self._options(node)]
+            node.props["selectedIndex"] = values.index(value) if value in values else -1
+        else:
+            node.props["value"] = value
+        self._changed(node)
+
+    def _changed(self, node):
+        """LinkedIn clears a question's validation error as soon as it is answered."""
+        container = closest(node, lambda n: "fb-dash-form-element" in n.classes)
+        if container is not None:
+            for error in select(container, ERROR_SELECTOR):
+                error.remove()
+
+    def _click(self, node):
+        target = closest(node, lambda n: n.tag in ("a", "button", "label", "input", "option"))
+        if target is None:
+            return
+        if target.tag == "label":
+            control = self._label_control(target)
+            if control is not None:
+                self._click(control)
+        elif target.tag == "input" and target.attrs.get("type") in ("radio", "checkbox"):
+            if target.attrs["type"] == "radio":
+                form = closest(target, lambda n: n.tag == "form") or self.document
+                for other in select(form, "input[type=radio]"):
+                    if other.attrs.get("name") == target.attrs.get("name"):
+                        other.props["checked"] = False
+                target.props["checked"] = True
+            else:
+                target.props["checked"] = not self._selected(target)
+            self._changed(target)
+        elif target.tag == "option":
+            select_node = closest(target, lambda n: n.tag == "select")
+            if select_node is not None:
+                select_node.props["selectedIndex"] = self._options(select_node).index(target)
+                self._changed(select_node)
+        elif target.tag in ("a", "button") and "disabled" not in target.attrs:
+            self._activate(target)
+
+    def _label_control(self, label):
+        if label.attrs.get("for"):
+            return next((node for node in self.document.iter() if node.attrs.get("id") == label.attrs["for"]), None)
+        return next((node for node in label.iter() if node.tag in ("input", "select", "textarea")), None)
+
+    # Site behaviour
+
+    def _activate(self, button):
+        classes = button.classes
+        modal = closest(button, lambda n: "artdeco-modal" in n.classes)
+        if "job-card-list__title--link" in classes:
+            tile = closest(button, lambda n: "scaffold-layout__list-item" in n.classes)
+            self._later(lambda: self._show_job(tile))
+        elif "jobs-apply-button" in classes:
+            self._later(lambda: self._show_step(0))
+        elif "artdeco-modal__confirm-dialog-btn" in classes:
+            self.applications_discarded += 1
+            self._later(self._close_modals)
+        elif "artdeco-modal__dismiss" in classes and modal is not None:
+            if "jobs-easy-apply-modal" in modal.classes:
+                self._later(lambda: self._append_overlay(DISCARD_DIALOG_HTML))
+            else:
+                self._later(lambda: self._remove_overlay(modal))
+        elif "artdeco-toast-item__dismiss" in classes:
+            toast = closest(button, lambda n: "artdeco-toast-item" in n.classes)
+            if toast is not None:
+                self._later(toast.remove)
+        elif "artdeco-button--primary" in classes and modal is not None and "jobs-easy-apply-modal" in modal.classes:
+            self._next_step(modal)
+
+    def _show_job(self, tile):
+        if tile is None or not self._attached(tile):
+            return
+        job_id = tile.attrs.get("data-occludable-job-id", "")
+        self._job = {"title": inner_text(select_one(tile, ".job-card-list__title--link strong")),
+                     "company": inner_text(select_one(tile, ".artdeco-entity-lockup__subtitle"))}
+        parsed = urlparse(self.url)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        query["currentJobId"] = job_id
+        self.url = urlunparse(parsed._replace(query=urlencode(query)))
+        pane = select_one(self.document, ".scaffold-layout__detail")
+        if pane is None:
+            return
+        for child in list(pane.children):
+            child.remove()
+        markup = JOB_DETAILS_HTML.format(title=html.escape(self._job["title"]), company=html.escape(self._job["company"]))
+        for node in parse_fragment(markup):
+            pane.append(node)
+
+    def _append_overlay(self, markup):
+        for node in parse_fragment(markup):
+            self._body().append(node)
+
+    def _remove_overlay(self, modal):
+        overlay = closest(modal, lambda n: "artdeco-modal-overlay" in n.classes) or modal
+        overlay.remove()
+
+    def _close_modals(self):
+        for overlay in select(self.document, ".artdeco-modal-overlay"):
+            overlay.remove()
+        self._step = None
+
+    def _show_step(self, index):
+        current = select_one(self.document, ".jobs-easy-apply-modal")
+        if current is not None:
+            self._remove_overlay(current)
+        self._step = index
+        company = html.escape((self._job or {}).get("company") or "Example Corp")
+        self._append_overlay('<div class="artdeco-modal-overlay">'
+                             + self.steps[index][1].replace("Example Corp", company) + "</div>")
+
+    def _next_step(self, modal):
+        invalid = self._validate(modal)
+        if invalid:
+            self._later(lambda: self._show_errors(invalid))
+        elif self._step is not None and self._step + 1 < len(self.steps):
+            self._later(lambda: self._show_step(self._step + 1))
+        else:
+            self._later(self._submit)
+
+    def _submit(self):
+        self.applications_submitted += 1
+        self._close_modals()
+        company = html.escape((self._job or {}).get("company") or "Example Corp")
+        self._append_overlay(POST_APPLY_DIALOG_HTML.format(company=company))
+
+    def _validate(self, modal):
+        """Return (container, message) for every required field of the step left unanswered or invalid."""
+        invalid = []
+        seen = set()
+        form = select_one(modal, "form") or modal
+        for field in form.iter():
+            if field.tag not in ("input", "select", "textarea"):
+                continue
+            if "required" not in field.attrs and field.attrs.get("aria-required") != "true":
+                continue
+            container = closest(field, lambda n: "fb-dash-form-element" in n.classes) or field.parent
+            if id(container) in seen:
+                continue
+            kind = field.attrs.get("type", "text") if field.tag == "input" else field.tag
+            value = self._value(field).strip()
+            message = None
+            if kind in ("radio", "checkbox"):
+                group = [node for node in select(container, f"input[type={kind}]")]
+                if not any(self._selected(node) for node in group):
+                    message = "Please make a selection" if kind == "radio" else "Select checkbox to proceed"
+            elif kind == "file":
+                if not value:
+                    message = "A file is required"
+            elif kind == "select":
+                index = self._selected_index(field)
+                if index <= 0 and inner_text(self._options(field)[max(index, 0)]).lower().startswith("select an option"):
+                    message = "Please make a selection"
+            elif not value:
+                message = "Please enter a valid answer"
+            elif "numeric" in field.attrs.get("id", "") and not re.fullmatch(r"\d+(\.\d+)?", value):
+                message = "Enter a whole number between 0 and 99"
+            if message:
+                seen.add(id(container))
+                invalid.append((container, message))
+        return invalid
+
+    def _show_errors(self, invalid):
+        for container, message in invalid:
+            if select_one(container, ERROR_SELECTOR) is None:
+                for node in parse_fragment(ERROR_HTML.format(message=html.escape(message))):
+                    container.append(node)
+
+    # Page scripts
+
+    def _execute_script(self, params):
+        script = params["script"]
+        handler = self._scripts.get(script)
+        if handler is None:
+            if script.strip().startswith("return document.documentElement.outerHTML"):
+                size = re.search(r"slice\(\s*0\s*,\s*(\d+)\s*\)", script)
+                source = outer_html(self.document)
+                return source[:int(size.group(1))] if size else source
+            self.unsupported_scripts[" ".join(script.split())[:80]] += 1
+            return None
+        return self._to_json(handler(*(self._from_json(arg) for arg in params["args"])))
+
+    def _from_json(self, value):
+        if isinstance(value, FakeElement):
+            return self._node({"id": value.id})
+        if isinstance(value, (list, tuple)):
+            return [self._from_json(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._from_json(item) for key, item in value.items()}
+        return value
+
+    def _to_json(self, value):
+        if isinstance(value, Node):
+            return self._wrap(value)
+        if isinstance(value, list):
+            return [self._to_json(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._to_json(item) for key, item in value.items()}
+        return value
+
+    def _extract_job_tiles(self, root=None):
+        root = root if root is not None else self.document
+        records = []
+        for tile in select(root, ".scaffold-layout__list-item"):
+            title_link = select_one(tile, ".job-card-list__title--link")
+            card = select_one(tile, "[data-job-id]")
+            poster = ""
+            for span in select(tile, "span"):
+                index = inner_text(span).find(" is hiring for this")
+                if index != -1:
+                    poster = inner_text(span)[:index]
+                    break
+            applied = any(re.match(r"applied\b", inner_text(item), re.I) for item in
+                          select(tile, ".job-card-container__footer-item, .job-card-container__footer-job-state"))
+            href = urljoin(self.url, title_link.attrs.get("href", "")) if title_link is not None else ""
+            records.append({
+                "job_id": tile.attrs.get("data-occludable-job-id") or (card.attrs.get("data-job-id") if card is not None else "") or "",
+                "title": inner_text((select_one(title_link, "strong") or title_link) if title_link is not None else None),
+                "company": inner_text(select_one(tile, ".artdeco-entity-lockup__subtitle")),
+                "poster": poster,
+                "location": inner_text(select_one(tile, ".job-card-container__metadata-item")),
+                "apply_method": inner_text(select_one(tile, ".job-card-container__apply-method")),
+                "link": href.split("?")[0],
+                "applied": applied,
+                "title_element": title_link,
+            })
+        return records
+
+    def _page_status(self, phrases):
+        body = select_one(self.document, "body")
+        text = text_content(body).lower() if body is not None else ""
+        return {"url": self.url, "phrases": {phrase: phrase in text for phrase in phrases}}
+
+    def _page_ready(self, probes):
+        # Fixture pages have no subresources: they are ready, and loaded, as soon as they are parsed
+        if self._leaving:
+            return None
+        path = urlparse(self.url).path
+        checks = {
+            "results_list": lambda: bool(select(self.document, ".scaffold-layout__list-item, [data-occludable-job-id]"))
+                                    and select_one(self.document, ".jobs-search-results-list__text") is not None,
+            "no_results": lambda: self._visible(select_one(self.document, ".jobs-search-two-pane__no-results-banner--expand, "
+                                                                                ".jobs-search-no-results-banner"))
+                                  or "unfortunately, things are" in text_content(self.document).lower(),
+            "login_form": lambda: select_one(self.document, "#username") is not None and select_one(self.document, "#password") is not None,
+            "feed": lambda: path.startswith("/feed") and select_one(self.document, "main") is not None,
+            "login_wall": lambda: any(path.startswith(prefix) for prefix in ("/authwall", "/login", "/uas/login", "/checkpoint/lg/")),
+            "dom_ready": lambda: True,
+        }
+        for name in probes:
+            if checks[name]():
+                return {"probe": name, "ready_at": (time.perf_counter() - self._loaded_at) * 1000}
+        return None
+
+    def _leave_page(self):
+        self._leaving = True
+        return {"load_end": 0.001, "now": (time.perf_counter() - self._loaded_at) * 1000}
+
+    def _scroll_until_loaded(self, element, selector, idle_ms, timeout_ms):
+        # Fixture pages are fully loaded: one step to the bottom, nothing new to wait for
+        return {"count": len(select(element, selector)) if selector else 0, "steps": 1, "elapsed_ms": 0}
+
+    def _snapshot_form(self, form):
+        def tag(node):
+            if "data-ea-id" not in node.attrs:
+                self._ea_counter += 1
+                node.attrs["data-ea-id"] = f"ea-{self._ea_counter}"
+            return node.attrs["data-ea-id"]
+
+        def required(node):
+            return node is not None and ("required" in node.attrs or node.attrs.get("aria-required") == "true")
+
+        def label_for(node):
+            if node.attrs.get("id"):
+                label = next((label for label in select(form, "label") if label.attrs.get("for") == node.attrs["id"]), None)
+                if label is not None:
+                    return label
+            return closest(node, lambda n: n.tag == "label")
+
+        questions = []
+        for index, container in enumerate(select(form, ".fb-dash-form-element")):
+            record = {"index": index, "kind": None, "label": "", "options": [], "id": None, "required": False,
+                      "input_type": None, "value": "", "element": None}
+            inputs = [node for node in container.iter() if node.tag == "input"]
+            radios = [node for node in inputs if node.attrs.get("type") == "radio"]
+            checkboxes = [node for node in inputs if node.attrs.get("type") == "checkbox"]
+            date_picker = select_one(container, ".artdeco-datepicker__input")
+            select_node = select_one(container, "select")
+            field = next((node for node in container.iter() if node.tag == "textarea" or (
+                node.tag == "input" and node.attrs.get("type", "text") not in ("radio", "checkbox", "hidden"))), None)
+            choices = radios or checkboxes
+            if choices:
+                legend = select_one(container, ".fb-dash-form-element__label")
+                record["kind"] = "radio" if radios else "checkbox"
+                record["label"] = inner_text((select_one(legend, "span") or legend) if legend is not None else label_for(choices[0]))
+                for node in choices:
+                    label = label_for(node) or node
+                    record["options"].append({"id": tag(label), "text": inner_text(label), "checked": self._selected(node)})
+                    record["required"] = record["required"] or required(node)
+            elif date_picker is not None:
+                record.update(kind="date", label=inner_text(select_one(container, "label")), id=tag(date_picker),
+                              required=required(date_picker), value=self._value(date_picker), element=date_picker)
+            elif select_node is not None:
+                options = self._options(select_node)
+                index_selected = self._selected_index(select_node)
+                record.update(kind="select", label=inner_text(select_one(container, "label")), id=tag(select_node),
+                              required=required(select_node),
+                              value=inner_text(options[index_selected]) if index_selected >= 0 else "")
+                record["options"] = [{"text": inner_text(option)} for option in options]
+            elif field is not None:
+                record.update(kind="text", label=inner_text(select_one(container, "label")), id=tag(field),
+                              required=required(field), value=self._value(field))
+                if re.search("numeric", field.attrs.get("id", ""), re.I):
+                    record["input_type"] = "numeric"
+                elif field.tag == "textarea" or re.search("text", field.attrs.get("type", "text"), re.I):
+                    record["input_type"] = "text"
+                if field.attrs.get("role") == "combobox" or field.attrs.get("aria-autocomplete"):
+                    record["element"] = field
+            else:
+                continue
+            questions.append(record)
+        return questions
+
+    def _apply_form_actions(self, actions):
+        tagged = {node.attrs["data-ea-id"]: node for node in self.document.iter() if "data-ea-id" in node.attrs}
+        failed = []
+        for action in actions:
+            node = tagged.get(action["id"])
+            if node is None:
+                failed.append(action["id"])
+                continue
+            if action["op"] == "click":
+                self._click(node)
+            elif action["op"] == "set" and node.tag in ("input", "textarea", "select"):
+                self._set_value(node, _js_string(action["value"]))
+            elif action["op"] == "select" and node.tag == "select":
+                wanted = _js_string(action["value"]).strip()
+                options = self._options(node)
+                texts = [inner_text(option).strip() for option in options]
+                index = next((i for i, text in enumerate(texts) if text == wanted),
+                             next((i for i, text in enumerate(texts) if text.lower() == wanted.lower()), None))
+                if index is None:
+                    failed.append(action["id"])
+                    continue
+                node.props["selectedIndex"] = index
+                self._changed(node)
+            else:
+                failed.append(action["id"])
+        return failed
+
+    def _modal_state(self, input_field=None):
+        modal = select_one(self.document, ".jobs-easy-apply-modal")
+        dialog = next((node for node in select(self.document, ".artdeco-modal")
+                       if "jobs-easy-apply-modal" not in node.classes), None)
+        state = {"open": self._visible(modal), "step": "", "primary_text": "", "primary_enabled": False, "errors": [],
+                 "toast": self._visible(select_one(self.document, ".artdeco-toast-item")),
+                 "dialog": self._visible(dialog), "suggestions": 0}
+        if modal is not None:
+            primary = select_one(modal, ".artdeco-button--primary")
+            progress = select_one(modal, 'progress, [role="progressbar"]')
+            state["primary_text"] = inner_text(primary)
+            state["primary_enabled"] = (self._visible(primary) and "disabled" not in primary.attrs
+                                        and primary.attrs.get("aria-disabled") != "true")
+            progress_value = ""
+            if progress is not None:
+                progress_value = progress.attrs.get("value", "")
+                if progress_value in ("", "0"):
+                    progress_value = progress.attrs.get("aria-valuenow", "")
+            state["step"] = "|".join([inner_text(select_one(modal, "h3")), progress_value, state["primary_text"]])
+            for node in select(modal, ERROR_SELECTOR):
+                value = inner_text(node)
+                if value and value not in state["errors"]:
+                    state["errors"].append(value)
+        if input_field is not None:
+            state["suggestions"] = sum(1 for node in select(self.document, SUGGESTION_SELECTOR) if self._visible(node))
+        return state
+
+    def _job_details_ready(self, job_id):
+        details = next((node for node in self.document.iter() if node.attrs.get("id") == "job-details"), None)
+        return details is not None and job_id in self.url and len(inner_text(details)) > 0
+
+
+def _js_string(value):
+    """String(value) as JavaScript would write it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if value is None:
+        return "null"
+    return str(value)
@@ -2,6 +2,14 @@
 let configEditor = null;
 let statusFilter = 'all';
 let logs = [];
+let logCounts = {};
+let nextCursor = null;
+let sortKey = 'timestamp';
+let sortOrder = 'desc';
+let searchTimer = null;
+let activityCursor = null;
+let eventSource = null;
+let reloadTimer = null;
 let expandedRows = new Set();
 let dark = localStorage.getItem('darkMode') === 'true';
 let refreshInterval = null;
@@ -149,12 +157,27 @@ function initDashboard() {
                 b.classList.remove('ring-2', 'ring-blue-500');
             });
             this.classList.add('ring-2', 'ring-blue-500');
-            renderTable();
+            loadLogs();
+        });
+    });
+    
+    // Set up search functionality, queried once typing pauses
+    document.getElementById('searchInput').addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(loadLogs, 300);
+    });
+    
+    // Sort by a column, clicking it again reverses the order
+    document.querySelectorAll('.sortable').forEach(th => {
+        th.addEventListener('click', function() {
+            const key = this.getAttribute('data-sort');
+            sortOrder = key === sortKey && sortOrder === 'desc' ? 'asc' : 'desc';
+            sortKey = key;
+            loadLogs();
         });
     });
     
-    // Set up search functionality
-    document.getElementById('searchInput').addEventListener('input', renderTable);
+    document.getElementById('loadMore').addEventListener('click', loadMoreLogs);
     
     // Set up auto-refresh toggle
     document.getElementById('autoRefresh').addEventListener('change', function() {
@@ -187,15 +210,17 @@ function setDarkMode(isDark) {
     }
 }
 
-// Start auto-refresh
+// Start auto-refresh: live updates pushed by the server, or polling where EventSource is missing
 function startAutoRefresh() {
-    if (refreshInterval) {
-        clearInterval(refreshInterval);
+    stopAutoRefresh();
+    if (window.EventSource) {
+        openEventStream();
+        return;
     }
     refreshInterval = setInterval(() => {
         const activeTab = document.querySelector('.tab-content.active').id;
         if (activeTab === 'dashboard-tab') {
-            loadLogs();
+            checkNewActivity();
         } else if (activeTab === 'control-tab') {
             checkBotStatus();
         }
@@ -208,14 +233,93 @@ function stopAutoRefresh() {
         clearInterval(refreshInterval);
         refreshInterval = null;
     }
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+}
+
+// Follow /api/stream. On reconnect the browser sends the id of the last event received and only
+// the missed events come back; a snapshot means everything must be reloaded.
+function openEventStream() {
+    eventSource = new EventSource('/api/stream');
+    eventSource.addEventListener('snapshot', event => {
+        updateBotStatus(JSON.parse(event.data));
+        loadLogs(true);
+    });
+    eventSource.addEventListener('status', event => {
+        const data = JSON.parse(event.data);
+        if (data.status === 'starting') {
+            renderOutput([]);
+        }
+        setStatusIndicator(data);
+    });
+    eventSource.addEventListener('output', event => {
+        appendOutput(JSON.parse(event.data).line);
+    });
+    eventSource.addEventListener('activity', event => {
+        addActivity(JSON.parse(event.data));
+    });
+}
+
+// Add a job event from the stream to the table and counts, as the server would have filtered it
+function addActivity(entry) {
+    if (entry.event || !entry.status) return;
+    const search = document.getElementById('searchInput').value.trim().toLowerCase();
+    const fields = [entry.job_title, entry.company, entry.status, entry.reason, entry.error];
+    if (search && !fields.some(value => (value || '').toLowerCase().includes(search))) return;
+    
+    logCounts[entry.status] = (logCounts[entry.status] || 0) + 1;
+    renderStats();
+    if (statusFilter !== 'all' && entry.status !== statusFilter) return;
+    if (sortKey === 'timestamp' && sortOrder === 'desc') {
+        logs.unshift(entry);
+        renderTable();
+        document.getElementById('lastUpdated').textContent = 'Last updated: ' + new Date().toLocaleTimeString();
+    } else {
+        // Its place depends on the sort order, let the server work it out once events settle
+        clearTimeout(reloadTimer);
+        reloadTimer = setTimeout(() => loadLogs(true), 1000);
+    }
 }
 
-// Load logs from API
-function loadLogs() {
-    fetch('/api/logs')
+// Read only what was appended to the activity log since the last poll, and reload the table
+// when it holds job events
+function checkNewActivity() {
+    const params = activityCursor === null ? 'limit=0' : `since=${activityCursor}&limit=1000`;
+    fetch('/api/activity?' + params)
         .then(response => response.json())
         .then(data => {
-            logs = data;
+            const first = activityCursor === null;
+            activityCursor = data.cursor;
+            if (first || data.reset || data.entries.some(entry => !entry.event && entry.status)) {
+                loadLogs(true);
+            }
+        })
+        .catch(error => {
+            console.error('Error checking activity:', error);
+        });
+}
+
+// Query string of /api/logs for the current filters and sort order
+function logQuery(limit, cursor) {
+    const params = new URLSearchParams({sort: sortKey, order: sortOrder, limit: limit});
+    const search = document.getElementById('searchInput').value.trim();
+    if (statusFilter !== 'all') params.set('status', statusFilter);
+    if (search) params.set('q', search);
+    if (cursor) params.set('cursor', cursor);
+    return '/api/logs?' + params.toString();
+}
+
+// Load the first page of logs from the API; keepRows reloads as many rows as are shown already
+function loadLogs(keepRows = false) {
+    const limit = keepRows ? Math.min(Math.max(logs.length, 100), 1000) : 100;
+    fetch(logQuery(limit))
+        .then(response => response.json())
+        .then(data => {
+            logs = data.entries;
+            logCounts = data.counts;
+            nextCursor = data.next_cursor;
             renderStats();
             renderTable();
             document.getElementById('lastUpdated').textContent = 'Last updated: ' + new Date().toLocaleTimeString();
@@ -226,16 +330,30 @@ function loadLogs() {
         });
 }
 
+// Append the next page of logs
+function loadMoreLogs() {
+    if (!nextCursor) return;
+    fetch(logQuery(100, nextCursor))
+        .then(response => response.json())
+        .then(data => {
+            logs = logs.concat(data.entries);
+            nextCursor = data.next_cursor;
+            renderTable();
+        })
+        .catch(error => console.error('Error loading more logs:', error));
+}
+
 // Render statistics
 function renderStats() {
+    // Counts come from the server and cover every matching entry, not only the loaded pages
     const stats = {success: 0, failed: 0, timeout: 0, skipped: 0};
-    logs.forEach(l => { 
-        if (l.status && stats.hasOwnProperty(l.status.toLowerCase())) {
-            stats[l.status.toLowerCase()]++;
+    Object.entries(logCounts).forEach(([status, count]) => {
+        if (stats.hasOwnProperty(status.toLowerCase())) {
+            stats[status.toLowerCase()] += count;
         }
     });
     
-    const total = logs.length;
+    const total = Object.values(logCounts).reduce((sum, count) => sum + count, 0);
     const successRate = total ? Math.round((stats.success/total)*100) : 0;
     
     document.getElementById('stats').innerHTML = `
@@ -264,26 +382,17 @@ function renderStats() {
 
 // Render log table
 function renderTable() {
-    const search = document.getElementById('searchInput').value.toLowerCase();
     const table = document.getElementById('logTable');
     table.innerHTML = '';
     
-    let filtered = logs.filter(l => {
-        if (statusFilter !== 'all' && (!l.status || l.status.toLowerCase() !== statusFilter)) {
-            return false;
-        }
-        
-        return !search || 
-            (l.job_title || '').toLowerCase().includes(search) ||
-            (l.company || '').toLowerCase().includes(search) ||
-            (l.status || '').toLowerCase().includes(search) ||
-            (l.reason || '').toLowerCase().includes(search) ||
-            (l.error || '').toLowerCase().includes(search);
+    // Filtered and sorted by the server
+    const filtered = logs;
+    document.getElementById('loadMore').classList.toggle('hidden', !nextCursor);
+    document.querySelectorAll('.sortable').forEach(th => {
+        const arrow = th.getAttribute('data-sort') === sortKey ? (sortOrder === 'desc' ? ' ▼' : ' ▲') : '';
+        th.textContent = th.textContent.replace(/ [▼▲]$/, '') + arrow;
     });
     
-    // Sort by timestamp, newest first
-    filtered.sort((a, b) => new Date(b.timestamp || 0) - new Date(a.timestamp || 0));
-    
     if (filtered.length === 0) {
         table.innerHTML = `
             <tr>
@@ -508,10 +617,15 @@ function checkBotStatus() {
 
 // Update bot status UI
 function updateBotStatus(data) {
+    setStatusIndicator(data);
+    renderOutput(data.output);
+}
+
+// Update the status indicator and the start/stop buttons
+function setStatusIndicator(data) {
     const statusText = document.getElementById('botStatusText');
     const statusDot = document.getElementById('botStatusDot');
     const statusIndicator = document.getElementById('botStatusIndicator');
-    const outputContainer = document.getElementById('output-container');
     
     statusText.textContent = data.status;
     
@@ -530,11 +644,14 @@ function updateBotStatus(data) {
         document.getElementById('stopBot').disabled = true;
         document.getElementById('stopBot').classList.add('opacity-50', 'cursor-not-allowed');
     }
-    
-    // Update output
+}
+
+// Replace the bot output
+function renderOutput(output) {
+    const outputContainer = document.getElementById('output-container');
     outputContainer.innerHTML = '';
-    if (data.output && data.output.length > 0) {
-        data.output.forEach(line => {
+    if (output && output.length > 0) {
+        output.forEach(line => {
             const div = document.createElement('div');
             div.textContent = line;
             outputContainer.appendChild(div);
@@ -546,6 +663,24 @@ function updateBotStatus(data) {
     }
 }
 
+// Append a line of bot output, following it if the output was scrolled to the bottom
+function appendOutput(line) {
+    const outputContainer = document.getElementById('output-container');
+    if (!outputContainer.querySelector('div')) {
+        outputContainer.textContent = '';
+    }
+    const atBottom = outputContainer.scrollTop + outputContainer.clientHeight >= outputContainer.scrollHeight - 5;
+    const div = document.createElement('div');
+    div.textContent = line;
+    outputContainer.appendChild(div);
+    while (outputContainer.childElementCount > 1000) {
+        outputContainer.firstElementChild.remove();
+    }
+    if (atBottom) {
+        outputContainer.scrollTop = outputContainer.scrollHeight;
+    }
+}
+
 // Show message
 function showMessage(message, type = 'info') {
     const colors = {
@@ -569,21 +704,21 @@ function showMessage(message, type = 'info') {
     }, 3000);
 }
 
-// Export logs
-function exportLogs(format) {
-    const search = document.getElementById('searchInput').value.toLowerCase();
-    let filtered = logs.filter(l => {
-        if (statusFilter !== 'all' && (!l.status || l.status.toLowerCase() !== statusFilter)) {
-            return false;
-        }
-        
-        return !search || 
-            (l.job_title || '').toLowerCase().includes(search) ||
-            (l.company || '').toLowerCase().includes(search) ||
-            (l.status || '').toLowerCase().includes(search) ||
-            (l.reason || '').toLowerCase().includes(search) ||
-            (l.error || '').toLowerCase().includes(search);
-    });
+// Export every log matching the current filters, fetched page by page
+async function exportLogs(format) {
+    let filtered = [];
+    let cursor = null;
+    try {
+        do {
+            const data = await fetch(logQuery(1000, cursor)).then(response => response.json());
+            filtered = filtered.concat(data.entries);
+            cursor = data.next_cursor;
+        } while (cursor);
+    } catch (error) {
+        console.error('Error exporting logs:', error);
+        showMessage('Error exporting logs: ' + error.message, 'error');
+        return;
+    }
     
     if (filtered.length === 0) {
         showMessage('No logs to export.', 'warning');
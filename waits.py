@@ -0,0 +1,98 @@
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Explicit readiness conditions for the Easy Apply flow. Every poll is a single script call that
+# returns the state of the modal; the conditions below are plain predicates over that state, so
+# the bot moves on as soon as the page is ready instead of sleeping for a fixed time.
+
+# arguments[0]: an input element whose autocomplete suggestions should be counted, or null
+MODAL_STATE_JS = """
+const input = arguments[0];
+const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const modal = document.querySelector('.jobs-easy-apply-modal');
+const state = {open: visible(modal), step: '', primary_text: '', primary_enabled: false, errors: [],
+               toast: visible(document.querySelector('.artdeco-toast-item')),
+               dialog: visible(document.querySelector('.artdeco-modal:not(.jobs-easy-apply-modal)')),
+               suggestions: 0};
+if (modal) {
+    const primary = modal.querySelector('.artdeco-button--primary');
+    const progress = modal.querySelector('progress, [role="progressbar"]');
+    state.primary_text = text(primary);
+    state.primary_enabled = visible(primary) && !primary.disabled && primary.getAttribute('aria-disabled') !== 'true';
+    state.step = [text(modal.querySelector('h3')),
+                  progress ? String(progress.value || progress.getAttribute('aria-valuenow') || '') : '',
+                  state.primary_text].join('|');
+    modal.querySelectorAll('.artdeco-inline-feedback--error, .fb-dash-form-element-error, ' +
+                           '[data-test-form-element-error-messages], [role="alert"]').forEach((el) => {
+        const value = text(el);
+        if (value && !state.errors.includes(value)) {
+            state.errors.push(value);
+        }
+    });
+}
+if (input) {
+    state.suggestions = Array.from(document.querySelectorAll(
+        '[role="listbox"] [role="option"], .basic-typeahead__selectable, .search-typeahead-v2__hit'))
+        .filter(visible).length;
+}
+return state;
+"""
+
+# arguments[0]: the job id whose details should be shown
+JOB_DETAILS_READY_JS = """
+const details = document.getElementById('job-details');
+return !!details && location.href.includes(arguments[0]) && (details.innerText || '').trim().length > 0;
+"""
+
+
+def modal_state(browser, input_field=None):
+    return browser.execute_script(MODAL_STATE_JS, input_field)
+
+
+def wait_for(browser, condition, timeout=10, input_field=None, poll_frequency=0.05):
+    """
+    Poll the modal state until condition(state) is true.
+
+    Returns:
+        The state that satisfied the condition
+
+    Raises:
+        TimeoutException if the condition is not met within timeout seconds
+    """
+    def check(driver):
+        state = modal_state(driver, input_field)
+        return state if condition(state) else False
+
+    return WebDriverWait(browser, timeout, poll_frequency=poll_frequency).until(check)
+
+
+def wait_for_job_details(browser, job_id, timeout=5, poll_frequency=0.05):
+    """Wait until the details pane shows the job that was just clicked."""
+    return WebDriverWait(browser, timeout, poll_frequency=poll_frequency).until(
+        lambda driver: driver.execute_script(JOB_DETAILS_READY_JS, str(job_id)))
+
+
+def modal_ready(state):
+    return state['open'] and state['primary_enabled']
+
+
+def primary_enabled(state):
+    return state['primary_enabled']
+
+
+def step_changed(previous):
+    """
+    The modal moved on from the previous state's step, closed, or is showing an error that was not
+    in the previous state (an alert already on the page, such as a toast, does not count).
+    """
+    known = set(previous['errors'])
+    return lambda state: (not state['open'] or state['step'] != previous['step']
+                          or any(error not in known for error in state['errors']))
+
+
+def suggestions_visible(state):
+    return state['suggestions'] > 0
+
+
+def confirmation_shown(state):
+    return state['toast'] or (state['dialog'] and not state['open'])